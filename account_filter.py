@@ -0,0 +1,144 @@
+# Copyright (C) 2026 Dawn M. Foster
+# Licensed under GNU General Public License (GPL), version 3 or later: http://www.gnu.org/licenses/gpl.txt
+
+"""
+Filter used to keep aliases, teams and bots out of the datasets.
+
+The ban list, prefixes and bot accounts from account_filters.yaml are
+compiled into a single regular expression shaped like a trie, so checking
+a username costs about the same no matter how long the lists get. An
+allow list keeps real users that happen to match one of the other lists.
+"""
+
+import re
+
+# Filter loaded from account_filters.yaml by get_account_filter
+_default_filter = None
+
+def trie_regex(words):
+    """Builds a regular expression that matches any of the words, with the
+    alternatives nested by shared prefix so the regex engine never tries
+    more than one branch per character.
+
+    Parameters
+    ----------
+    words : list
+
+    Returns
+    -------
+    pattern : str
+    """
+    trie = {}
+    for word in words:
+        node = trie
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[''] = {}
+
+    def to_regex(node):
+        if list(node) == ['']:
+            return ''
+        optional = '' in node
+        branches = [re.escape(ch) + to_regex(child) for ch, child in sorted(node.items()) if ch != '']
+        if len(branches) == 1 and not optional:
+            return branches[0]
+        pattern = '(?:' + '|'.join(branches) + ')'
+        if optional:
+            pattern += '?'
+        return pattern
+
+    return to_regex(trie)
+
+class AccountFilter:
+    """Compiled matcher for accounts that should be left out.
+
+    Parameters
+    ----------
+    ban : list
+        Usernames containing any of these strings are left out
+    prefixes : list
+        Usernames starting with any of these strings are left out
+    bots : list
+        Exact bot account names that are left out
+    allow : list
+        Usernames that are always kept
+    """
+
+    def __init__(self, ban=(), prefixes=(), bots=(), allow=()):
+        parts = []
+        if ban:
+            parts.append(trie_regex([b.lower() for b in ban]))
+        if prefixes:
+            parts.append('^' + trie_regex([p.lower() for p in prefixes]))
+        if bots:
+            parts.append('^' + trie_regex([b.lower() for b in bots]) + '$')
+
+        self.pattern = re.compile('|'.join(parts)) if parts else None
+        self.allow = frozenset(a.lower() for a in allow)
+
+    @classmethod
+    def from_file(cls, file_name='account_filters.yaml'):
+        """Loads the lists from a yaml file in this directory.
+
+        Parameters
+        ----------
+        file_name : str
+
+        Returns
+        -------
+        account_filter : AccountFilter
+        """
+        from os.path import dirname, join
+        from common_functions import load_yaml
+
+        with open(join(dirname(__file__), file_name), 'r') as f:
+            config = load_yaml(f) or {}
+
+        return cls(config.get('ban') or [], config.get('prefixes') or [], config.get('bots') or [], config.get('allow') or [])
+
+    def keep(self, username):
+        """Returns True if username looks like a real person.
+
+        Parameters
+        ----------
+        username : str
+
+        Returns
+        -------
+        keep : bool
+        """
+        username = username.lower()
+        if self.pattern is None or username in self.allow:
+            return True
+        return self.pattern.search(username) is None
+
+    def mask(self, usernames):
+        """Vectorized version of keep for a whole pandas column.
+
+        Parameters
+        ----------
+        usernames : pandas Series
+
+        Returns
+        -------
+        mask : pandas Series of bool
+            True for the rows to keep
+        """
+        lowered = usernames.astype(str).str.lower()
+        if self.pattern is None:
+            return lowered.notna()
+        return ~lowered.str.contains(self.pattern) | lowered.isin(self.allow)
+
+def get_account_filter():
+    """Returns the filter from account_filters.yaml, loading it once.
+
+    Returns
+    -------
+    account_filter : AccountFilter
+    """
+    global _default_filter
+
+    if _default_filter is None:
+        _default_filter = AccountFilter.from_file()
+
+    return _default_filter
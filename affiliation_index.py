@@ -0,0 +1,198 @@
+# Copyright (C) 2026 Dawn M. Foster
+# Licensed under GNU General Public License (GPL), version 3 or later: http://www.gnu.org/licenses/gpl.txt
+
+"""
+On-disk index of the CNCF devstats github_users.json affiliation data.
+
+The json file is hundreds of MB, so instead of loading all of it with
+json.load, it is parsed one user at a time and only the login and current
+affiliation are saved to an sqlite table keyed by lower case login. The
+index records the content hash of the json file it was built from and is
+only rebuilt when the downloaded file changes.
+"""
+
+import threading
+from collections.abc import Mapping
+
+def iter_json_array(json_file, chunk_size=1024 * 1024):
+    """Incrementally parses a file containing a json array and yields one
+    element at a time, so only a small part of the file is in memory.
+
+    Parameters
+    ----------
+    json_file : file object
+        Opened in text mode
+    chunk_size : int
+        Number of characters read from the file at a time
+
+    Returns
+    -------
+    generator of the decoded array elements
+    """
+    import json
+
+    decoder = json.JSONDecoder()
+    buf = ''
+    pos = 0
+    in_array = False
+    eof = False
+
+    while True:
+        # Skip whitespace and the commas between array elements
+        while pos < len(buf) and buf[pos] in ' \t\r\n,':
+            pos += 1
+
+        if pos == len(buf):
+            if eof:
+                if in_array:
+                    raise ValueError("Unexpected end of json array")
+                return
+            buf = json_file.read(chunk_size)
+            pos = 0
+            eof = buf == ''
+            continue
+
+        if not in_array:
+            if buf[pos] != '[':
+                raise ValueError("Expected a json array")
+            in_array = True
+            pos += 1
+            continue
+
+        if buf[pos] == ']':
+            return
+
+        try:
+            item, pos = decoder.raw_decode(buf, pos)
+        except json.JSONDecodeError:
+            # The element continues in the next chunk
+            if eof:
+                raise
+            more = json_file.read(chunk_size)
+            eof = more == ''
+            buf = buf[pos:] + more
+            pos = 0
+            continue
+
+        yield item
+
+def current_affiliation(affiliation):
+    """Returns only the current affiliation from a devstats affiliation
+    string, or None for robot accounts.
+
+    Parameters
+    ----------
+    affiliation : str
+
+    Returns
+    -------
+    affiliation : str
+    """
+    if '(Robots)' in affiliation:
+        return None
+    if ',' in affiliation: # get only current affiliation
+        return affiliation.rsplit(',', 1)[1].strip()
+    return affiliation
+
+def build_affiliation_index(json_file, db_path, source_sha256):
+    """Builds the sqlite affiliation index from an open github_users.json
+    file. The index is written to a temporary file first and then moved
+    into place, so a failed build never leaves a partial index behind.
+
+    Parameters
+    ----------
+    json_file : file object
+        Opened in text mode
+    db_path : str
+    source_sha256 : str
+        Content hash of the json file, saved to detect upstream changes
+    """
+    import os
+    import sqlite3
+
+    tmp_path = db_path + '.tmp'
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+
+    def affiliation_rows():
+        for item in iter_json_array(json_file):
+            try:
+                affiliation = current_affiliation(item['affiliation'])
+            except:
+                continue
+            if affiliation is not None:
+                # Force username to lower case for consistent affiliation checks
+                yield item['login'].lower(), affiliation
+
+    db = sqlite3.connect(tmp_path)
+    db.execute("CREATE TABLE affiliations (login TEXT PRIMARY KEY, affiliation TEXT NOT NULL) WITHOUT ROWID")
+    db.execute("CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+    db.executemany("INSERT OR REPLACE INTO affiliations VALUES (?, ?)", affiliation_rows())
+    db.execute("INSERT INTO meta VALUES ('source_sha256', ?)", (source_sha256,))
+    db.commit()
+    db.close()
+
+    os.replace(tmp_path, db_path)
+
+def index_source_sha256(db_path):
+    """Returns the content hash of the json file the index at db_path was
+    built from, or None if there is no usable index.
+
+    Parameters
+    ----------
+    db_path : str
+
+    Returns
+    -------
+    source_sha256 : str
+    """
+    import os
+    import sqlite3
+
+    if not os.path.exists(db_path):
+        return None
+    try:
+        db = sqlite3.connect(db_path)
+        row = db.execute("SELECT value FROM meta WHERE key = 'source_sha256'").fetchone()
+        db.close()
+    except sqlite3.Error:
+        return None
+
+    return row[0] if row else None
+
+class AffiliationIndex(Mapping):
+    """Read-only mapping of lower case GitHub login to current affiliation
+    backed by the sqlite index. Can be used anywhere the affiliation
+    dictionary was used before and is safe to share between threads.
+
+    Parameters
+    ----------
+    db_path : str
+    """
+
+    def __init__(self, db_path):
+        import sqlite3
+
+        self._db = sqlite3.connect('file:' + db_path + '?mode=ro', uri=True, check_same_thread=False)
+        self._lock = threading.Lock()
+
+    def __getitem__(self, username):
+        with self._lock:
+            row = self._db.execute("SELECT affiliation FROM affiliations WHERE login = ?", (username,)).fetchone()
+        if row is None:
+            raise KeyError(username)
+        return row[0]
+
+    def __contains__(self, username):
+        with self._lock:
+            row = self._db.execute("SELECT 1 FROM affiliations WHERE login = ?", (username,)).fetchone()
+        return row is not None
+
+    def __len__(self):
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM affiliations").fetchone()[0]
+
+    def __iter__(self):
+        with self._lock:
+            logins = [row[0] for row in self._db.execute("SELECT login FROM affiliations")]
+        return iter(logins)
@@ -0,0 +1,247 @@
+#!/usr/local/bin/python3
+
+# Copyright (C) 2026 Dawn M. Foster
+# Licensed under GNU General Public License (GPL), version 3 or later: http://www.gnu.org/licenses/gpl.txt
+
+"""
+Calculates bus factors (people) and elephant factors (organizations) from
+contribution counts, in the same format as the devstats exports in
+datasets/bus-elephant_cncf.
+
+The bus or elephant factor (BF) of a project is the smallest number of
+people or organizations that together account for at least half of the
+contributions. The output also includes the share of the top 10 and the
+number and share of everyone else.
+
+All projects are calculated at once: the contributions are sorted by
+project and count with NumPy, and the running totals for every project
+come from a single cumulative sum.
+
+As input, this script needs a csv file with one row per contribution
+count and the columns project, name and contributions, plus an optional
+date column (YYYY-MM-DD) used to limit the counts to a time window.
+
+The output is saved as a csv of the format:
+output/bus_factor_YYYY-MM-DD.csv or output/elephant_factor_YYYY-MM-DD.csv
+
+Parameters
+----------
+file_name : str
+    csv file with the contribution counts
+--kind : str
+    users (default) for bus factors or orgs for elephant factors
+--since : str
+    Only count contributions on or after this date
+--until : str
+    Only count contributions before this date
+--levels
+    Add the CNCF maturity level of each project from the devstats
+    projects.yaml file
+"""
+
+import numpy as np
+
+# Name columns used by the devstats exports
+NAME_COLUMNS = {'users': ('Bus/Elephant Factor Users', 'Top Users'),
+                'orgs': ('Bus/Elephant Factor Organizations', 'Top Organizations')}
+
+def factor_arrays(project_codes, name_codes, counts, threshold=0.5, top=10):
+    """Calculates the factors for every project from flat arrays.
+
+    Parameters
+    ----------
+    project_codes : numpy array of int
+        Project of each row, numbered from 0
+    name_codes : numpy array of int
+        Rank of each name in alphabetical order, used to break ties
+    counts : numpy array
+        Contributions for each row. Each (project, name) should appear once.
+    threshold : float
+        Share of the contributions the factor has to reach
+    top : int
+        Number of top contributors to include in the top share
+
+    Returns
+    -------
+    order : numpy array of int
+        Rows sorted by project, then by most contributions
+    starts : numpy array of int
+        Position in order where each project starts
+    sizes : numpy array of int
+        Number of contributors in each project
+    bf : numpy array of int
+        Bus or elephant factor of each project
+    bf_share : numpy array of float
+        Share of the contributions from the factor contributors
+    top_share : numpy array of float
+        Share of the contributions from the top contributors
+
+    All of the arrays are empty when there are no rows.
+    """
+    # Without any rows there are no projects, and the running totals below
+    # would index past the end of the empty arrays
+    if len(counts) == 0:
+        empty = np.zeros(0, dtype=np.intp)
+        return empty, empty, empty, empty, np.zeros(0), np.zeros(0)
+
+    # lexsort uses the last key first: project, then most contributions,
+    # then name
+    order = np.lexsort((name_codes, -counts, project_codes))
+    sorted_projects = project_codes[order]
+    sorted_counts = counts[order].astype(np.float64)
+
+    starts = np.flatnonzero(np.r_[True, sorted_projects[1:] != sorted_projects[:-1]])
+    sizes = np.diff(np.r_[starts, len(order)])
+
+    # Running total within each project from one cumulative sum
+    cumsum = np.cumsum(sorted_counts)
+    offsets = np.r_[0.0, cumsum[starts[1:] - 1]]
+    running = cumsum - np.repeat(offsets, sizes)
+    totals = running[starts + sizes - 1]
+
+    # Position of each row within its project
+    rank = np.arange(len(order)) - np.repeat(starts, sizes)
+
+    # The factor is one more than the first rank that reaches the threshold
+    reached = running >= threshold * np.repeat(totals, sizes)
+    bf = np.minimum.reduceat(np.where(reached, rank, len(order)), starts) + 1
+    bf = np.minimum(bf, sizes)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        bf_share = np.where(totals > 0, running[starts + bf - 1] / totals, 0.0)
+        top_share = np.where(totals > 0, running[starts + np.minimum(top, sizes) - 1] / totals, 0.0)
+
+    return order, starts, sizes, bf, bf_share, top_share
+
+def calculate_factors(df, kind='users', threshold=0.5, top=10):
+    """Calculates the bus or elephant factor of every project.
+
+    Parameters
+    ----------
+    df : dataframe
+        Columns project, name and contributions
+    kind : str
+        'users' or 'orgs', used to name the columns like devstats does
+    threshold : float
+    top : int
+
+    Returns
+    -------
+    factors_df : dataframe
+        One row per project with the devstats columns
+    """
+    import pandas as pd
+
+    # One row per project and name
+    df = df.groupby(['project', 'name'], as_index=False, sort=False)['contributions'].sum()
+    df = df[df['contributions'] > 0]
+
+    project_codes, project_names = pd.factorize(df['project'])
+    name_codes, names = pd.factorize(df['name'], sort=True)
+    counts = df['contributions'].to_numpy()
+
+    order, starts, sizes, bf, bf_share, top_share = factor_arrays(project_codes, name_codes, counts, threshold, top)
+
+    sorted_names = names.to_numpy()[name_codes[order]]
+    projects = project_names.to_numpy()[project_codes[order][starts]]
+    top_count = np.minimum(top, sizes)
+
+    factor_column, top_column = NAME_COLUMNS[kind]
+    factors_df = pd.DataFrame({
+        'Project/Repository Group': projects,
+        'BF': bf,
+        'BF%': np.round(bf_share * 100, 2),
+        # devstats lists at most the first 10 names
+        factor_column: [", ".join(sorted_names[start:start + min(n, top)]) for start, n in zip(starts, bf)],
+        'Oth. #': sizes - bf,
+        'Oth. %': np.round(100 - bf_share * 100, 2),
+        'Top 10 %': np.round(top_share * 100, 2),
+        top_column: [", ".join(sorted_names[start:start + n]) for start, n in zip(starts, top_count)],
+        'Rem. #': sizes - top_count,
+        'Rem. %': np.round(100 - top_share * 100, 2),
+    })
+
+    return factors_df.sort_values('Project/Repository Group', key=lambda x: x.astype(str).str.lower()).reset_index(drop=True)
+
+def read_contributions(file_name, since=None, until=None):
+    """Reads contribution counts from a csv file, keeping only the rows
+    within the time window when there is a date column.
+
+    Parameters
+    ----------
+    file_name : str
+    since : str
+        YYYY-MM-DD, inclusive
+    until : str
+        YYYY-MM-DD, exclusive
+
+    Returns
+    -------
+    df : dataframe
+    """
+    import pandas as pd
+
+    df = pd.read_csv(file_name, dtype={'project': str, 'name': str})
+
+    if since or until:
+        if 'date' not in df.columns:
+            raise ValueError("--since and --until need a date column in " + file_name)
+        dates = pd.to_datetime(df['date'])
+        if since:
+            df = df[dates >= pd.Timestamp(since)]
+        if until:
+            df = df[dates < pd.Timestamp(until)]
+
+    return df
+
+def project_levels():
+    """Returns the CNCF maturity level of each project from the devstats
+    projects.yaml file.
+
+    Returns
+    -------
+    levels_dict : dict
+        Maps project name to level, like Graduated
+    """
+    from common_functions import download_file, load_yaml
+
+    projects = load_yaml(download_file('https://raw.githubusercontent.com/cncf/devstats/master/projects.yaml'))
+
+    return {x['name']: x['status'] for x in projects['projects'].values()}
+
+def read_args():
+    """Reads the input file and options from the command line.
+
+    Returns
+    -------
+    args : argparse.Namespace
+    """
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Calculate bus and elephant factors from contribution counts.')
+    parser.add_argument('file_name', help='csv file with project, name and contributions columns')
+    parser.add_argument('--kind', choices=['users', 'orgs'], default='users', help='users for bus factors, orgs for elephant factors')
+    parser.add_argument('--since', default=None, help='Only count contributions on or after this date (YYYY-MM-DD)')
+    parser.add_argument('--until', default=None, help='Only count contributions before this date (YYYY-MM-DD)')
+    parser.add_argument('--levels', action='store_true', help='Add the CNCF maturity level of each project')
+
+    return parser.parse_args()
+
+if __name__ == '__main__':
+    from datetime import datetime
+
+    args = read_args()
+
+    factors_df = calculate_factors(read_contributions(args.file_name, args.since, args.until), args.kind)
+    if factors_df.empty:
+        print("No contributions found in", args.file_name, "for the time window")
+    if args.levels:
+        factors_df['level'] = factors_df['Project/Repository Group'].map(project_levels())
+
+    today = datetime.today().strftime('%Y-%m-%d')
+    prefix = 'bus_factor_' if args.kind == 'users' else 'elephant_factor_'
+    outfile_name = 'output/' + prefix + today + '.csv'
+    factors_df.to_csv(outfile_name, index=False)
+
+    print("Calculated factors for", len(factors_df), "projects")
+    print("Output:", outfile_name)
@@ -0,0 +1,138 @@
+# Copyright (C) 2026 Dawn M. Foster
+# Licensed under GNU General Public License (GPL), version 3 or later: http://www.gnu.org/licenses/gpl.txt
+
+"""
+Append-only journal used to checkpoint long-running scripts so that an
+interrupted run can be resumed with --resume instead of starting over.
+
+Each record is written as one line of json. Records are flushed to disk
+with fsync in batches, either after sync_every records or after
+sync_seconds, whichever comes first. A partial last line left behind by
+a crash is ignored when the journal is read.
+"""
+
+import threading
+
+class Journal:
+    """Append-only json lines journal with batched fsync. Safe to append
+    from several threads.
+
+    Parameters
+    ----------
+    path : str
+    resume : bool
+        Keep the existing records and append to them, otherwise the
+        journal starts out empty
+    sync_every : int
+        Number of records written between calls to fsync
+    sync_seconds : float
+        Maximum number of seconds between calls to fsync
+    """
+
+    def __init__(self, path, resume=False, sync_every=50, sync_seconds=5.0):
+        import time
+
+        self.path = path
+        if resume:
+            _drop_partial_line(path)
+        self._file = open(path, 'a' if resume else 'w')
+        self._lock = threading.Lock()
+        self._sync_every = sync_every
+        self._sync_seconds = sync_seconds
+        self._pending = 0
+        self._last_sync = time.monotonic()
+
+    def append(self, record):
+        """Adds a record to the journal.
+
+        Parameters
+        ----------
+        record : dict
+            Must be serializable as json
+        """
+        import json
+        import time
+
+        line = json.dumps(record) + '\n'
+        with self._lock:
+            self._file.write(line)
+            self._pending += 1
+            if self._pending >= self._sync_every or time.monotonic() - self._last_sync >= self._sync_seconds:
+                self._sync()
+
+    def _sync(self):
+        # Must be called with _lock held
+        import os
+        import time
+
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._pending = 0
+        self._last_sync = time.monotonic()
+
+    def close(self):
+        """Writes any pending records to disk and closes the journal."""
+
+        with self._lock:
+            self._sync()
+            self._file.close()
+
+    def remove(self):
+        """Closes and deletes the journal after a run has finished."""
+        import os
+
+        self.close()
+        os.remove(self.path)
+
+def _drop_partial_line(path):
+    # Cuts off a partial last line left by an interrupted write, so that
+    # records appended when resuming don't continue it
+    import os
+
+    try:
+        with open(path, 'r+b') as f:
+            size = f.seek(0, os.SEEK_END)
+            if size == 0:
+                return
+            f.seek(max(0, size - 65536))
+            tail = f.read()
+            if tail.endswith(b'\n'):
+                return
+            end = tail.rfind(b'\n')
+            if end == -1 and size > len(tail):
+                # The partial line is longer than the tail, read it all
+                f.seek(0)
+                tail = f.read()
+                end = tail.rfind(b'\n')
+                size = len(tail)
+            f.truncate(size - len(tail) + end + 1)
+    except FileNotFoundError:
+        pass
+
+def read_journal(path):
+    """Reads the records from a journal written by Journal.
+
+    Parameters
+    ----------
+    path : str
+
+    Returns
+    -------
+    records : list
+        Empty if the journal doesn't exist
+    """
+    import json
+
+    records = []
+    try:
+        with open(path, 'r') as f:
+            for line in f:
+                try:
+                    records.append(json.loads(line))
+                except ValueError:
+                    # Partial line from an interrupted write
+                    break
+    except FileNotFoundError:
+        pass
+
+    return records
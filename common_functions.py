@@ -1,86 +1,226 @@
 # Copyright (C) 2019-2022 Dawn M. Foster
 # Licensed under GNU General Public License (GPL), version 3 or later: http://www.gnu.org/licenses/gpl.txt
 
+import threading
+
+# Per-thread storage used by get_session() to reuse HTTP connections
+_thread_local = threading.local()
+
+# Memo cache used by resolve_companies: lower case username -> (company, expiry time)
+_company_cache = {}
+_company_cache_lock = threading.Lock()
+
+# Expanded OWNERS_ALIASES files used by get_alias_map: url -> alias map
+_alias_maps = {}
+_alias_maps_lock = threading.Lock()
+# One lock per OWNERS_ALIASES url, so each file is only downloaded once
+# even when several workers need it at the same time
+_alias_url_locks = {}
+
 def read_cncf_affiliations():
     """    
-    Download the contents of the CNCF json file and create an affiliation dictionary indexed
+    Download the contents of the CNCF json file and create an affiliation index keyed
     by GitHub username to make finding affilions faster for later functions.
     Includes only current affiliation and excludes robot accounts.
+
+    The json file is parsed incrementally into an sqlite index on disk
+    (see affiliation_index.py), which is only rebuilt when the downloaded
+    file has changed since the last run.
     
     Returns
     -------
-    affil_dict : dict
-        Contains a mapping of github username to affiliation
+    affil_dict : AffiliationIndex
+        Dict-like mapping of github username to affiliation
     """
-    import json
-    from common_functions import download_file
-    
-    filename = download_file('https://github.com/cncf/devstats/blob/master/github_users.json?raw=true')
-    affil_file = json.load(filename)
-    
-    affil_dict = {}
+    from os.path import join
+    from http_cache import open_cached, cache_dir
+    from affiliation_index import AffiliationIndex, build_affiliation_index, index_source_sha256
     
-    for item in affil_file:
-        # Force username to lower case for consistent affiliation checks
-        username = item['login'].lower()
-        
-        try:
-            affiliation = item['affiliation']
-        
-            if '(Robots)' not in affiliation:
-                if ',' in affiliation: # get only current affiliation
-                    affil_dict[username] = affiliation.rsplit(',', 1)[1].strip()
-                else:
-                    affil_dict[username] = affiliation
-                
-        except:
-            affiliation = 'N/A'
+    entry, json_file = open_cached('https://github.com/cncf/devstats/blob/master/github_users.json?raw=true', encoding='utf-8')
+    db_path = join(cache_dir(), 'affiliations.sqlite')
+
+    with json_file:
+        if index_source_sha256(db_path) != entry.sha256:
+            print("Building CNCF affiliation index")
+            build_affiliation_index(json_file, db_path, entry.sha256)
+
+    affil_dict = AffiliationIndex(db_path)
             
     return affil_dict
 
+def run_graphql(query, api_token, variables=None):
+    """Runs a query against the GitHub GraphQL API using the session for
+    the current thread and the shared token pool, which sends it with the
+    token that has the most GraphQL budget left.
+
+    Parameters
+    ----------
+    query : str
+    api_token : str or list
+        GitHub API token(s), added to the shared token pool
+    variables : dict
+
+    Returns
+    -------
+    json_data : dict
+        The full json response, including 'data' and any 'errors'
+    """
+    from github_client import github_request, get_pool
+
+    url = 'https://api.github.com/graphql'
+    get_pool().add(api_token)
+
+    r = github_request('POST', url, 'graphql', json={'query': query, 'variables': variables or {}})
+    r.raise_for_status()
+    json_data = r.json()
+
+    if json_data.get('data') is None:
+        raise RuntimeError("GraphQL query failed: " + str(json_data.get('errors')))
+
+    return json_data
+
+def query_github_users(usernames, fields, api_token, batch_size=100, workers=1):
+    """Looks up the same fields for many GitHub users using one GraphQL
+    request per batch of up to 100 users, with an aliased user(login:)
+    field for each user in the batch. With more than one worker, batches
+    are sent in parallel and the shared rate limit governor keeps them
+    within the GraphQL budget.
+
+    Parameters
+    ----------
+    usernames : list
+    fields : str
+        GraphQL fields to get for each user, like 'login company'
+    api_token : str or list
+        GitHub API token(s), added to the shared token pool
+    batch_size : int
+    workers : int
+        Number of batches sent at the same time
+
+    Returns
+    -------
+    users : dict
+        Maps each username to a dict with the requested fields, or to None
+        if the user doesn't exist
+    """
+    import json
+    from concurrent.futures import ThreadPoolExecutor
+
+    def query_batch(batch):
+        # json.dumps quotes and escapes the login as a GraphQL string
+        user_fields = ["u%d: user(login: %s) { %s }" % (n, json.dumps(username), fields) for n, username in enumerate(batch)]
+        query = "query {\n" + "\n".join(user_fields) + "\n}"
+
+        json_data = run_graphql(query, api_token)
+
+        return {username: json_data['data'].get('u%d' % n) for n, username in enumerate(batch)}
+
+    batches = [usernames[i:i + batch_size] for i in range(0, len(usernames), batch_size)]
+
+    users = {}
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for batch_users in executor.map(query_batch, batches):
+            users.update(batch_users)
+
+    return users
+
+def resolve_companies(usernames, api_token, ttl=24 * 60 * 60):
+    """Gets the company from the GitHub profile for a list of users. Each
+    username is only looked up once and results are kept in a memo cache
+    for ttl seconds, so users on several teams don't cause extra API calls.
+    Lookups are batched using query_github_users.
+
+    Parameters
+    ----------
+    usernames : list
+    api_token : str or list
+        GitHub API token(s), added to the shared token pool
+    ttl : int
+        Number of seconds a company stays in the memo cache
+
+    Returns
+    -------
+    companies : dict
+        Maps each lower case username to the company, or None if the user
+        doesn't exist or has no company in their profile
+    """
+    import time
+
+    now = time.time()
+    companies = {}
+    missing = []
+
+    with _company_cache_lock:
+        for username in dict.fromkeys(u.lower() for u in usernames):
+            cached = _company_cache.get(username)
+            if cached is not None and cached[1] > now:
+                companies[username] = cached[0]
+            else:
+                missing.append(username)
+
+    if missing:
+        users = query_github_users(missing, 'company', api_token)
+        expires = time.time() + ttl
+        with _company_cache_lock:
+            for username, user in users.items():
+                company = user['company'] if user else None
+                _company_cache[username] = (company, expires)
+                companies[username] = company
+
+    return companies
+
 def get_affil(affil_dict, username, api_token):
     """Get the company affiliation for a username starting with the 
     GitHub API, since that's likely the most up to date source. The CNCF gitdm
     data is used a secondary source of this data.
+
+    GitHub companies come from resolve_companies, so calling it first with
+    every username that will be needed fetches them in a few batched
+    requests instead of one request per user.
+
     Parameters
     ----------
     affil_dict : dict
        generated by the read_cncf_affiliations function
     username : str
-    api_token : str
-        string containing a GitHub API token
+    api_token : str or list
+        GitHub API token(s), added to the shared token pool
 
     Returns
     -------
     affil : str
     """
-    from github import Github
-
-    g = Github(api_token)
+    # If affiliation is listed on GH, use that instead as more
+    # likely up to date
+    try:
+        affil = resolve_companies([username], api_token)[username.lower()]
+    except:
+        affil = None
 
-    affil = 'NotFound'
-    if username in affil_dict:
-        # If affiliation is listed on GH, use that instead as more
-        # likely up to date
-        try:
-            affil = g.get_user(username).company
-            if affil == None:
-                affil = affil_dict[username]
-        except:
-            pass
-    if affil == '?':
-        affil = 'NotFound'
-    if affil == 'NotFound':
-        try:
-            affil = g.get_user(username).company
-        except:
-            affil = 'NotFound'
     if affil == None:
+        affil = affil_dict.get(username.lower(), 'NotFound')
+    if affil == '?':
         affil = 'NotFound'
-    # remove any commas from the company name
-    affil = affil.replace(",","")
+    # Commas are removed from the company name when the csv file is
+    # written, so the full name is kept for the columnar files
     return affil
 
+def get_session():
+    """Returns a requests Session for the current thread. Each worker thread
+    keeps its own session so that connections to the same host are reused
+    across downloads instead of opening a new connection for every file.
+
+    Returns
+    -------
+    session : requests.Session
+    """
+    import requests
+
+    if not hasattr(_thread_local, 'session'):
+        _thread_local.session = requests.Session()
+
+    return _thread_local.session
+
 def download_file(url):
 
     # Takes a URL and downloads the contents of the file into a var to be used by other functions
@@ -88,28 +228,150 @@ def download_file(url):
     # NOTE: Make sure you pass in a raw yaml file, not html.
     # Example: sig_file = download_file('https://raw.githubusercontent.com/kubernetes/community/master/sigs.yaml')
 
-    import urllib.request
-    
-    sig_file = urllib.request.urlopen(url)
+    # Files are kept in a local cache (see http_cache.py) and revalidated
+    # with a conditional request, so unchanged files aren't downloaded again.
+    # The contents are returned in memory, so there is no file to close.
+    import io
+    from http_cache import read_bytes
+
+    sig_file = io.BytesIO(read_bytes(url))
 
     return sig_file
 
-def read_sig_yaml(sig_file):
+def load_yaml(stream):
+    """Parses yaml with the libyaml-backed CSafeLoader when PyYAML was built
+    with it, which is much faster than the pure Python SafeLoader.
+
+    Parameters
+    ----------
+    stream : str, bytes or file object
+
+    Returns
+    -------
+    The parsed yaml contents
+    """
     import yaml
 
+    try:
+        loader = yaml.CSafeLoader
+    except AttributeError:
+        loader = yaml.SafeLoader
+
+    return yaml.load(stream, Loader=loader)
+
+def read_sig_yaml(sig_file):
+
     #stream = open(sig_file, 'r')
-    sigs_wgs = yaml.safe_load(sig_file)
+    sigs_wgs = load_yaml(sig_file)
 
     return sigs_wgs
 
 def process_sig_yaml():
 
-    sig_file = download_file('https://raw.githubusercontent.com/kubernetes/community/master/sigs.yaml')
+    # sigs.yaml is parsed once and shared through SigsModel (see sigs_model.py)
+    from sigs_model import SigsModel
 
-    sigs_wgs = read_sig_yaml(sig_file)
+    sigs_wgs = SigsModel.load().data
 
     return sigs_wgs
 
+# Role suffixes found at the end of OWNERS_ALIASES names, like
+# sig-auth-audit-approvers, and the role each one maps to
+ALIAS_ROLE_SUFFIXES = [('approvers', 'approver'),
+                       ('reviewers', 'reviewer'),
+                       ('maintainers', 'maintainer'),
+                       ('maintainer', 'maintainer')]
+
+def build_sig_index(sig_dirs):
+    """Builds a prefix trie from the SIG names in the dir format sig-name
+    so that the SIG for an alias can be found in a single pass over the
+    alias name, no matter how many SIGs there are.
+
+    Parameters
+    ----------
+    sig_dirs : list
+        SIG names like sig-node, from sigs.yaml
+
+    Returns
+    -------
+    sig_index : dict
+        Nested dicts keyed by character. The None key marks the end of
+        a SIG name and holds the name.
+    """
+    sig_index = {}
+    for sig_dir in sig_dirs:
+        node = sig_index
+        for ch in sig_dir:
+            node = node.setdefault(ch, {})
+        node[None] = sig_dir
+
+    return sig_index
+
+def match_sig(sig_index, name):
+    """Finds the longest SIG name that name starts with, where the SIG name
+    is followed by a '-' or the end of name.
+
+    Parameters
+    ----------
+    sig_index : dict
+        generated by the build_sig_index function
+    name : str
+
+    Returns
+    -------
+    sig_name : str
+        'NA' if no SIG matches
+    """
+    sig_name = 'NA'
+    node = sig_index
+    for i, ch in enumerate(name):
+        if None in node and ch == '-':
+            sig_name = node[None]
+        node = node.get(ch)
+        if node is None:
+            return sig_name
+    if None in node:
+        sig_name = node[None]
+
+    return sig_name
+
+def parse_alias_name(sig_index, area):
+    """Splits an OWNERS_ALIASES name that is mostly, but not always,
+    formatted like sig-name-subproject-role into its SIG, subproject and
+    role. Example: sig-auth-audit-approvers
+
+    Parameters
+    ----------
+    sig_index : dict
+        generated by the build_sig_index function
+    area : str
+        The alias name
+
+    Returns
+    -------
+    sig_name : str
+        'NA' if no SIG matches
+    subproject : str
+        'NA' if there isn't one
+    role : str
+        'unknown' if the name doesn't end with a known role
+    """
+    role = 'unknown'
+    rest = area
+    for suffix, suffix_role in ALIAS_ROLE_SUFFIXES:
+        if area.endswith(suffix):
+            role = suffix_role
+            rest = area[:-len(suffix)].rstrip('-')
+            break
+
+    sig_name = match_sig(sig_index, rest)
+
+    subproject = 'NA'
+    if sig_name != 'NA' and len(rest) > len(sig_name) + 1:
+        subproject = rest[len(sig_name) + 1:]
+
+    return sig_name, subproject, role
+
 def write_affil_line_istio (username, team, affil_dict, api_token, csv_file):
     """Used to write istio data to the CSV file
     Parameters
@@ -118,32 +380,47 @@ def write_affil_line_istio (username, team, affil_dict, api_token, csv_file):
     team : str
     affil_dict : dict
        generated by the read_cncf_affiliations function
-    api_token : str
-        string containing a GitHub API token
-    csv_file : csv
+    api_token : str or list
+        GitHub API token(s), added to the shared token pool
+    csv_file : DatasetWriter
     """
+    from company_names import get_company_normalizer
+
     affil = get_affil(affil_dict, username, api_token)
     if affil == None or affil == '':
         affil = 'NotFound'
-    line = ",".join([affil, username, team]) + "\n"
-    csv_file.write(line)
+    # Canonical company names from company_aliases.yaml
+    affil = get_company_normalizer().normalize(affil)
+    csv_file.write_row([affil, username, team])
 
-def write_affil_line(username, role, sig_name, subproject, owners_url, csv_file, affil_dict):
-    
-    # Writes a single line to the csv file with data about owners, including
-    # SIG/WG, subproject (if applicable), affiliation, owners url
+def affil_row(username, role, sig_name, subproject, owners_url, affil_dict):
+    """Builds the dataset row for an owner, including SIG/WG, subproject
+    (if applicable), affiliation and owners url.
 
+    Parameters
+    ----------
+    username : str
+    role : str
+    sig_name : str
+    subproject : str
+    owners_url : str
+    affil_dict : dict
+       generated by the read_cncf_affiliations function
+
+    Returns
+    -------
+    row : list
+        None for aliases and bots that are filtered out
+    """
     # Make sure username is lower case before checking affiliation
     username = username.lower()
 
     # Only print real users to the csv file. Need to filter out aliases.
-    ban = ['approve', 'review', 'maintain', 'provider', 'leads', 'sig-', 'admins', 'release', 'licensing', 'github-admin-team', 'test-infra-oncall', 'managers', 'owners', 'committee', 'steering']
+    # The lists of aliases and bots are in account_filters.yaml
+    from account_filter import get_account_filter
+    from company_names import get_company_normalizer
 
-    flag = 1
-    for b in ban:
-        if b in username:
-            flag = 0
-    if flag == 1:
+    if get_account_filter().keep(username):
         if username in affil_dict:
             affil = affil_dict[username]
             if affil == '?':
@@ -151,23 +428,369 @@ def write_affil_line(username, role, sig_name, subproject, owners_url, csv_file,
         else:
             affil = 'NotFound'
 
-        line = ",".join([affil, username, role, sig_name, subproject, owners_url]) + "\n"
-        csv_file.write(line)
+        # Canonical company names from company_aliases.yaml
+        affil = get_company_normalizer().normalize(affil)
 
-def read_owners_file(owners_url, sig_name, subproject, csv_file, affil_dict):
-    # Download contents of owners files and load them. Print error message for files that 404
-    
-    import yaml
+        return [affil, username, role, sig_name, subproject, owners_url]
+
+    return None
+
+def owners_aliases_url(owners_url):
+    """Returns the url of the OWNERS_ALIASES file at the root of the repo
+    containing an OWNERS file on raw.githubusercontent.com.
+
+    Parameters
+    ----------
+    owners_url : str
+
+    Returns
+    -------
+    alias_url : str
+        None if owners_url isn't a raw.githubusercontent.com url
+    """
+    from urllib.parse import urlsplit
+
+    url_parts = urlsplit(owners_url)
+    path_parts = url_parts.path.strip('/').split('/')
+    if url_parts.netloc != 'raw.githubusercontent.com' or len(path_parts) < 4:
+        return None
+
+    # Path is /org/repo/branch/path/to/OWNERS
+    alias_url = 'https://raw.githubusercontent.com/' + '/'.join(path_parts[:3]) + '/OWNERS_ALIASES'
+
+    return alias_url
+
+def expand_aliases(aliases):
+    """Expands an OWNERS_ALIASES mapping so that each alias maps to the
+    users it contains, following aliases that list other aliases. Cycles
+    between aliases are ignored.
+
+    Parameters
+    ----------
+    aliases : dict
+        The 'aliases' section of an OWNERS_ALIASES file
+
+    Returns
+    -------
+    alias_map : dict
+        Maps each lower case alias name to a list of usernames
+    """
+    aliases = {str(name).lower(): [str(member) for member in members or []] for name, members in aliases.items()}
+
+    alias_map = {}
+    for name in aliases:
+        members = []
+        seen = {name}
+        pending = [name]
+        while pending:
+            for member in aliases[pending.pop(0)]:
+                member_key = member.lower()
+                if member_key in aliases:
+                    if member_key not in seen:
+                        seen.add(member_key)
+                        pending.append(member_key)
+                elif member not in members:
+                    members.append(member)
+        alias_map[name] = members
+
+    return alias_map
+
+def get_alias_map(alias_url):
+    """Downloads and expands an OWNERS_ALIASES file, loading each file only
+    once per run. Safe to call from worker threads.
+
+    Parameters
+    ----------
+    alias_url : str
+        generated by the owners_aliases_url function
+
+    Returns
+    -------
+    alias_map : dict
+        generated by the expand_aliases function. Empty if the repo
+        doesn't have an OWNERS_ALIASES file, or if it couldn't be
+        downloaded, in which case the next call tries again.
+    """
+    import requests
+
+    if alias_url is None:
+        return {}
+
+    with _alias_maps_lock:
+        if alias_url in _alias_maps:
+            return _alias_maps[alias_url]
+        url_lock = _alias_url_locks.setdefault(alias_url, threading.Lock())
+
+    with url_lock:
+        # Another worker may have loaded it while this one waited
+        with _alias_maps_lock:
+            if alias_url in _alias_maps:
+                return _alias_maps[alias_url]
+
+        try:
+            with download_file(alias_url) as alias_file:
+                aliases = load_yaml(alias_file)
+        except requests.HTTPError as e:
+            if e.response is None or e.response.status_code != 404:
+                print("Cannot get", alias_url, e)
+                return {}
+            # The repo doesn't have an OWNERS_ALIASES file
+            aliases = None
+        except FileNotFoundError:
+            # Not in the cache in cache-only mode
+            aliases = None
+        except Exception as e:
+            print("Cannot get", alias_url, e)
+            return {}
+
+        try:
+            alias_map = expand_aliases(aliases['aliases'])
+        except:
+            alias_map = {}
+
+        with _alias_maps_lock:
+            _alias_maps[alias_url] = alias_map
+
+    return alias_map
 
+def compact_owners(owners):
+    """Keeps only the parts of a parsed OWNERS file used for the datasets.
+
+    Parameters
+    ----------
+    owners : dict
+        Parsed contents of the OWNERS file
+
+    Returns
+    -------
+    owners : dict
+        Contains only the labels, approvers and reviewers lists. An empty
+        file gives an empty dict, so like the original read_owners_file did,
+        it writes no rows without being reported as a failure.
+    """
+    if not isinstance(owners, dict):
+        return {}
+
+    return {key: owners[key] for key in ('labels', 'approvers', 'reviewers') if isinstance(owners.get(key), list)}
+
+def owners_tuple(owners):
+    """Packs the output of compact_owners into a (labels, approvers,
+    reviewers) tuple, with None for missing lists, which is cheaper to
+    send between processes than a dict.
+    """
+    return (owners.get('labels'), owners.get('approvers'), owners.get('reviewers'))
+
+def owners_from_tuple(packed):
+    """Unpacks a tuple from owners_tuple back into the format of
+    compact_owners.
+    """
+    return {key: value for key, value in zip(('labels', 'approvers', 'reviewers'), packed) if value is not None}
+
+def parse_owners(data):
+    """Parses the raw contents of an OWNERS file.
+
+    Parameters
+    ----------
+    data : bytes
+
+    Returns
+    -------
+    owners : dict
+        generated by the compact_owners function, or None if the file
+        could not be parsed
+    """
     try:
-        owners_file = download_file(owners_url)
-        #stream = open(owners_file, 'r')
-        #owners = yaml.safe_load(stream)
-        owners = yaml.safe_load(owners_file)
-        
+        return compact_owners(load_yaml(data))
     except:
-        print("Cannot get", sig_name, owners_url)
+        return None
+
+def parse_owners_chunk(chunk):
+    """Parses the raw contents of a list of OWNERS files. Used by the
+    parse processes, so only compact tuples are sent back.
+
+    Parameters
+    ----------
+    chunk : list
+        Raw contents of each file as bytes
+
+    Returns
+    -------
+    parsed : list
+        tuple from owners_tuple for each file, or None if it could not be
+        parsed
+    """
+    parsed = []
+    for data in chunk:
+        owners = parse_owners(data)
+        parsed.append(None if owners is None else owners_tuple(owners))
+
+    return parsed
+
+def git_blob_sha(data):
+    """Returns the git blob SHA-1 of the contents of a file, which is the
+    sha listed for the file in git trees.
+
+    Parameters
+    ----------
+    data : bytes
+
+    Returns
+    -------
+    blob_sha : str
+    """
+    import hashlib
+
+    return hashlib.sha1(b'blob ' + str(len(data)).encode() + b'\0' + data).hexdigest()
+
+def fetch_owners_raw(owners_url, previous_state=None, blob_sha=None):
+    """Downloads (or revalidates) a single OWNERS file without parsing it,
+    along with the OWNERS_ALIASES file for its repo, so the alias map is
+    ready when the rows are written. Safe to call from worker threads.
+
+    When previous_state has the parsed contents of the file from an
+    earlier run, they are reused if blob_sha from a git tree listing
+    matches the file from that run, without sending any request for the
+    file. Otherwise they are reused if the downloaded file has the same
+    content hash.
+
+    Parameters
+    ----------
+    owners_url : str
+    previous_state : dict
+        Maps each url to a dict with the 'sha256', git 'blob' sha and
+        parsed 'owners' from an earlier run
+    blob_sha : str
+        Git blob sha of the current file from a git tree listing, or None
+
+    Returns
+    -------
+    sha256 : str
+        Content hash of the file, or None if it could not be downloaded
+    blob_sha : str
+        Git blob sha of the file, or None
+    data : bytes
+        Raw contents of the file that still need to be parsed, or None
+    owners : dict
+        Parsed contents reused from previous_state, or None
+    """
+    from http_cache import open_cached
+
+    sha256 = None
+    data = None
+    owners = None
+    previous = (previous_state or {}).get(owners_url)
+
+    if blob_sha is not None and previous is not None and previous.get('blob') == blob_sha:
+        get_alias_map(owners_aliases_url(owners_url))
+        return previous['sha256'], blob_sha, None, previous['owners']
+
+    try:
+        entry, owners_file = open_cached(owners_url)
+        with owners_file:
+            data = owners_file.read()
+        # Only set once the file was read, so None means the download failed
+        sha256 = entry.sha256
+        blob_sha = git_blob_sha(data)
+        if previous is not None and previous['sha256'] == sha256:
+            owners = previous['owners']
+            data = None
+    except:
+        data = None
+
+    get_alias_map(owners_aliases_url(owners_url))
+
+    return sha256, blob_sha, data, owners
+
+def fetch_owners_entry(owners_url, previous_state=None, blob_sha=None):
+    """Downloads (or revalidates) and parses a single OWNERS file along
+    with the OWNERS_ALIASES file for its repo, so the alias map is ready
+    when the rows are written. Parsed contents from previous_state are
+    reused when the file hasn't changed (see fetch_owners_raw). Safe to
+    call from worker threads.
+
+    Parameters
+    ----------
+    owners_url : str
+    previous_state : dict
+    blob_sha : str
+        Git blob sha of the current file from a git tree listing, or None
+
+    Returns
+    -------
+    sha256 : str
+        Content hash of the file, or None if it could not be downloaded
+    blob_sha : str
+        Git blob sha of the file, or None
+    owners : dict
+        generated by the compact_owners function, or None if the file
+        could not be downloaded or parsed. The file was downloaded but
+        could not be parsed when sha256 is set.
+    reused : bool
+        True if the parsed contents came from previous_state
+    """
+    sha256, blob_sha, data, owners = fetch_owners_raw(owners_url, previous_state, blob_sha)
+    reused = owners is not None
+
+    if data is not None:
+        owners = parse_owners(data)
+
+    return sha256, blob_sha, owners, reused
+
+def print_fetch_summary(total, elapsed, workers, failed, reused_count=None, parse_failed=None):
+    """Prints the throughput and failures of a batch of OWNERS downloads.
+
+    Parameters
+    ----------
+    total : int
+        Number of OWNERS files processed
+    elapsed : float
+        Seconds taken
+    workers : int
+    failed : list
+        (sig_name, owners_url) tuples for the files that could not be
+        downloaded. Each one is only reported here.
+    reused_count : int
+        Number of unchanged files reused from the previous run, or None
+        when incremental mode is off
+    parse_failed : list
+        (sig_name, owners_url) tuples for the files that were downloaded
+        but could not be parsed, or None to leave them out
+    """
+    rate = total / elapsed if elapsed > 0 else 0
+    print("Fetched", total, "OWNERS files in", round(elapsed, 1), "seconds (" + str(round(rate, 1)), "files/sec) using", workers, "workers")
+    if reused_count is not None:
+        print("Reused", reused_count, "unchanged OWNERS files from the previous run")
+    print("Failed to get", len(failed), "OWNERS files")
+    for sig_name, owners_url in failed:
+        print(" * Cannot get", sig_name, owners_url)
+    if parse_failed is not None:
+        print("Failed to parse", len(parse_failed), "OWNERS files")
+        for sig_name, owners_url in parse_failed:
+            print(" * Cannot parse", sig_name, owners_url)
+
+def owners_rows(owners, owners_url, sig_name, subproject, sig_index=None):
+    """Builds the rows for each approver and reviewer in an OWNERS file
+    that has already been downloaded and parsed. When the sig_name or
+    subproject is 'NA', the labels in the file are used to fill them in.
+    If there is no sig label and sig_index is given, the SIG is taken from
+    aliases like sig-node-approvers in the file. Aliases from the
+    OWNERS_ALIASES file of the repo are expanded to the users they contain.
 
+    Parameters
+    ----------
+    owners : dict
+        Parsed contents of the OWNERS file
+    owners_url : str
+    sig_name : str
+    subproject : str
+    sig_index : dict
+        generated by the build_sig_index function
+
+    Returns
+    -------
+    rows : list
+        List of (username, role, sig_name, subproject) tuples
+    """
     # Wrapped with 'try' since not every owners file has approvers and reviewers. 
     try:
         for label in owners['labels']:
@@ -179,38 +802,61 @@ def read_owners_file(owners_url, sig_name, subproject, csv_file, affil_dict):
     except:
         pass
 
-    try:
-        for username in owners['approvers']:
-            write_affil_line(username, 'approver', sig_name, subproject, owners_url, csv_file, affil_dict)
-    except:
-        pass
-                
-    try: 
-        for username in owners['reviewers']:
-            write_affil_line(username, 'reviewer', sig_name, subproject, owners_url, csv_file, affil_dict)
-    except:
-        pass
+    if sig_name == 'NA' and sig_index is not None:
+        try:
+            for username in (owners.get('approvers') or []) + (owners.get('reviewers') or []):
+                sig_name = parse_alias_name(sig_index, str(username).lower())[0]
+                if sig_name != 'NA':
+                    break
+        except:
+            sig_name = 'NA'
 
-def files_done(owners_file_csv):
-    """
-    Reads the output csv file generated by reading the intial list of
-    OWNERS files and is used to avoid re-reading files again when
-    an additional list of OWNERS files is provided.
+    alias_map = get_alias_map(owners_aliases_url(owners_url))
+
+    rows = []
+
+    # A user listed both directly and through an alias only gets one row
+    # for each role
+    for key, role in (('approvers', 'approver'), ('reviewers', 'reviewer')):
+        seen = set()
+        try:
+            for entry in owners[key]:
+                for username in alias_map.get(str(entry).lower(), [entry]):
+                    if str(username).lower() not in seen:
+                        seen.add(str(username).lower())
+                        rows.append((str(username), role, sig_name, subproject))
+        except:
+            pass
+
+    return rows
+
+def owners_affil_rows(owners, owners_url, sig_name, subproject, affil_dict, sig_index=None):
+    """Builds the dataset rows with affiliations for each row from the
+    owners_rows function.
 
     Parameters
     ----------
-    owners_file_csv : file object
+    owners : dict
+        Parsed contents of the OWNERS file
+    owners_url : str
+    sig_name : str
+    subproject : str
+    affil_dict : dict
+       generated by the read_cncf_affiliations function
+    sig_index : dict
+        generated by the build_sig_index function
 
     Returns
     -------
-    files_doneDF : dataframe
-        Contains the contents of the csv file as a dataframe
-
+    rows : list
     """
-    import pandas as pd
+    rows = []
+    for username, role, row_sig_name, row_subproject in owners_rows(owners, owners_url, sig_name, subproject, sig_index):
+        row = affil_row(username, role, row_sig_name, row_subproject, owners_url, affil_dict)
+        if row is not None:
+            rows.append(row)
 
-    files_doneDF = pd.read_csv(owners_file_csv)
-    return files_doneDF
+    return rows
 
 def read_key(file_name):
     """Retrieves a GitHub API key from a file.
@@ -237,15 +883,44 @@ def read_key(file_name):
         key = kf.readline().rstrip() # remove newline & trailing whitespace
     return key
 
+def read_keys(file_name):
+    """Retrieves every GitHub API key from a file with one key per line
+    and adds them to the shared token pool, so requests are spread across
+    all of the keys.
+
+    Parameters
+    ----------
+    file_name : str
+
+    Returns
+    -------
+    keys : list
+    """
+    from os.path import dirname, join
+    from github_client import get_pool
+
+    current_dir = dirname(__file__)
+    file_path = join(current_dir, "./" + file_name)
+
+    with open(file_path, 'r') as kf:
+        keys = [line.strip() for line in kf if line.strip()]
+
+    get_pool().add(keys)
+
+    return keys
+
 def run_search_query(query, g, branch_name, owners_rows):
     """Runs the query against the GitHub search API, appends the results
        to owners_rows list and returns the list with results.
+       Each page of results is requested through the shared rate limit
+       governor, which only waits when the search budget is used up.
     
     Parameters
     ----------
     query : str
         String formatted as a search query.
     g : Github object
+        Client from the shared token pool, like get_pool().github('search')
     branch_name : str
         Default branch name from the API to use to build the URL
     owners_rows: list
@@ -254,60 +929,189 @@ def run_search_query(query, g, branch_name, owners_rows):
     -------
     owners_rows : list
     """
-    import time
+    from github_client import call_github
 
     # Run the search query to get all of the owners files
     output = g.search_code(query=query)
-    print("Total number found", output.totalCount)
+    total = call_github(lambda: output.totalCount, g, 'search')
+    print("Total number found", total)
 
     # Format the results for each owners file to get the full path as a url
-    # Sleep in the loop to avoid secondary rate limit exception
-    for owners in output:
-        full_path = 'https://raw.githubusercontent.com/' + owners.repository.full_name + '/' + branch_name + '/' + owners.path
-        owners_rows.append(full_path)
-        time.sleep(5)
-    
-    # Add an extra sleep before returning to give it more time to
-    # avoid the rate limit exception
-    time.sleep(60)
+    # The search API returns at most 1000 results
+    found = 0
+    page_num = 0
+    while found < min(total, 1000):
+        page = call_github(lambda: output.get_page(page_num), g, 'search')
+        if not page:
+            break
+        for owners in page:
+            full_path = 'https://raw.githubusercontent.com/' + owners.repository.full_name + '/' + branch_name + '/' + owners.path
+            owners_rows.append(full_path)
+        found += len(page)
+        page_num += 1
 
     return owners_rows
 
-def expand_name_df(df,old_col,new_col):
-    """Takes a dataframe df with an API JSON object with nested elements in old_col, 
-    extracts the name, and saves it in a new dataframe column called new_col
+def list_tree_files(org_name, repo_name, branch_name, file_name, api_token):
+    """Finds every file called file_name in a repo by listing the whole
+    default branch with a single recursive git trees API call and filtering
+    the paths locally. Falls back to list_clone_files when GitHub truncates
+    the tree for very large repos.
 
     Parameters
     ----------
-    df : dataframe
-    old_col : str
-    new_col : str
+    org_name : str
+    repo_name : str
+    branch_name : str
+        Default branch name used to build the URL
+    file_name : str
+        The filename to find, like OWNERS or CODEOWNERS
+    api_token : str or list
+        GitHub API token(s), added to the shared token pool
 
     Returns
     -------
-    df : dataframe
+    files : list
+        [url, blob_sha] for each file found, where url is the
+        raw.githubusercontent.com url and blob_sha is the git blob sha of
+        the file, which owners_details.py uses in incremental mode
     """
-    
-    import pandas as pd
-
-    def expand_name(nested_name):
-        """Takes an API JSON object with nested elements and extracts the name
-        Parameters
-        ----------
-        nested_name : JSON API object
-
-        Returns
-        -------
-        object_name : str
-        """
-        if pd.isnull(nested_name):
-            object_name = 'Likely Missing'
+    import posixpath
+    from urllib.parse import quote
+    from github_client import github_request, get_pool
+
+    url = 'https://api.github.com/repos/' + org_name + '/' + repo_name + '/git/trees/' + quote(branch_name, safe='') + '?recursive=1'
+    get_pool().add(api_token)
+
+    r = github_request('GET', url, 'core')
+    # Empty repos don't have a tree
+    if r.status_code in (404, 409):
+        return []
+    r.raise_for_status()
+    tree = r.json()
+
+    if tree.get('truncated'):
+        print("Tree for", org_name + '/' + repo_name, "is truncated, using a local clone")
+        return list_clone_files(org_name, repo_name, branch_name, file_name)
+
+    base_url = 'https://raw.githubusercontent.com/' + org_name + '/' + repo_name + '/' + branch_name + '/'
+    files = [[base_url + item['path'], item['sha']] for item in tree['tree'] if item['type'] == 'blob' and posixpath.basename(item['path']) == file_name]
+
+    return files
+
+def list_clone_files(org_name, repo_name, branch_name, file_name):
+    """Finds every file called file_name in a repo using a local bare clone
+    of the default branch. The clone is shallow and doesn't download file
+    contents, and it is kept in the cache directory so later runs only
+    need to fetch new commits.
+
+    Parameters
+    ----------
+    org_name : str
+    repo_name : str
+    branch_name : str
+    file_name : str
+        The filename to find, like OWNERS or CODEOWNERS
+
+    Returns
+    -------
+    files : list
+        [url, blob_sha] for each file found, like list_tree_files
+    """
+    import os
+    import posixpath
+    import subprocess
+    from os.path import join
+    from http_cache import cache_dir
+
+    clone_dir = join(cache_dir(), 'clones', org_name, repo_name + '.git')
+    clone_url = 'https://github.com/' + org_name + '/' + repo_name + '.git'
+    ref = 'refs/heads/' + branch_name
+
+    if os.path.exists(clone_dir):
+        subprocess.run(['git', '-C', clone_dir, 'fetch', '--quiet', '--depth', '1', '--filter=blob:none', 'origin', '+' + ref + ':' + ref], check=True)
+    else:
+        subprocess.run(['git', 'clone', '--quiet', '--bare', '--depth', '1', '--filter=blob:none', '--branch', branch_name, clone_url, clone_dir], check=True)
+
+    # -z keeps git from quoting paths with unusual characters. Each entry
+    # looks like: mode type sha<TAB>path
+    entries = subprocess.run(['git', '-C', clone_dir, 'ls-tree', '-r', '-z', ref], check=True, capture_output=True, text=True).stdout.split('\0')
+
+    base_url = 'https://raw.githubusercontent.com/' + org_name + '/' + repo_name + '/' + branch_name + '/'
+    files = []
+    for entry in entries:
+        if '\t' not in entry:
+            continue
+        info, path = entry.split('\t', 1)
+        mode, object_type, blob_sha = info.split(' ')
+        if object_type == 'blob' and posixpath.basename(path) == file_name:
+            files.append([base_url + path, blob_sha])
+
+    return files
+
+def build_email_index(org, logins=None, since=None):
+    """Walks the commit history of every repo in a GitHub org once and
+    records the most recent commit email for each author login, skipping
+    emails that contain 'noreply'. Looking up many users in the index
+    avoids searching every repo again for each user. Each repo is walked
+    with the client from the shared token pool that has the most budget.
+
+    Parameters
+    ----------
+    org : str
+        The GitHub org with the repos to walk
+    logins : set
+        Optional lower case logins to keep. Commits by anyone else are
+        skipped to keep the index small.
+    since : datetime
+        Optional date of the oldest commit to read
+
+    Returns
+    -------
+    email_index : dict
+        Maps each lower case login to an email address
+    """
+    from github import GithubException
+    from github_client import call_github, iter_pages, get_pool
+
+    newest = {}
+
+    g = get_pool().github()
+    organization = call_github(lambda: g.get_organization(org), g)
+    repo_list = [repo for page in iter_pages(organization.get_repos(), g) for repo in page]
+
+    for repo in repo_list:
+        # Paginated lists stay on the client that created them
+        g = get_pool().github()
+        repo = g.get_repo(repo.full_name, lazy=True)
+        if since:
+            commits = repo.get_commits(since=since)
         else:
-            object_name = nested_name['name']
-        return object_name
+            commits = repo.get_commits()
+
+        try:
+            for page in iter_pages(commits, g):
+                for commit in page:
+                    if commit.author is None:
+                        continue
+                    login = commit.author.login.lower()
+                    if logins is not None and login not in logins:
+                        continue
+                    email = commit.commit.author.email
+                    date = commit.commit.author.date
+                    if not email or 'noreply' in email:
+                        continue
+                    if login not in newest or date > newest[login][0]:
+                        newest[login] = (date, email)
+        except GithubException:
+            # Empty repos don't have any commits
+            pass
+
+        print("Indexed commits in", repo.name)
+
+    email_index = {login: x[1] for login, x in newest.items()}
 
-    df[new_col] = df[old_col].apply(expand_name)
-    return df
+    return email_index
 
 def create_file(pre_string):
     """Creates an output file in an "output" directory with today's date
@@ -0,0 +1,122 @@
+# Copyright (C) 2026 Dawn M. Foster
+# Licensed under GNU General Public License (GPL), version 3 or later: http://www.gnu.org/licenses/gpl.txt
+
+"""
+Normalization of company names to the canonical names in
+company_aliases.yaml.
+
+Each distinct raw name is only matched against the exact aliases and the
+compiled patterns once, and the result is cached. Whole pandas columns
+are normalized by mapping the unique values and broadcasting the results
+back, so the patterns never run once per row.
+"""
+
+import re
+import threading
+
+# Normalizer loaded from company_aliases.yaml by get_company_normalizer
+_default_normalizer = None
+
+class CompanyNormalizer:
+    """Maps raw company names to canonical names. Safe to share between
+    threads.
+
+    Parameters
+    ----------
+    exact : dict
+        Raw names that are replaced exactly
+    patterns : list
+        (regular expression, canonical name) tuples searched in order.
+        The whole name is replaced by the first one that matches.
+    version : int
+        Version of the alias table
+    """
+
+    def __init__(self, exact=None, patterns=(), version=None):
+        self.exact = dict(exact or {})
+        self.patterns = [(re.compile(pattern), company) for pattern, company in patterns]
+        self.version = version
+        self._cache = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_file(cls, file_name='company_aliases.yaml'):
+        """Loads the alias table from a yaml file in this directory.
+
+        Parameters
+        ----------
+        file_name : str
+
+        Returns
+        -------
+        normalizer : CompanyNormalizer
+        """
+        from os.path import dirname, join
+        from common_functions import load_yaml
+
+        with open(join(dirname(__file__), file_name), 'r') as f:
+            config = load_yaml(f) or {}
+
+        patterns = [(x['pattern'], x['company']) for x in config.get('patterns') or []]
+
+        return cls(config.get('exact') or {}, patterns, config.get('version'))
+
+    def _match(self, name):
+        # Leading and trailing spaces don't count
+        name = name.strip()
+        if name in self.exact:
+            return self.exact[name]
+        for pattern, company in self.patterns:
+            if pattern.search(name):
+                return company
+        return name
+
+    def normalize(self, name):
+        """Returns the canonical name for a company.
+
+        Parameters
+        ----------
+        name : str
+
+        Returns
+        -------
+        company : str
+            name itself when there is no alias for it
+        """
+        company = self._cache.get(name)
+        if company is None:
+            company = self._match(name)
+            with self._lock:
+                self._cache[name] = company
+
+        return company
+
+    def normalize_series(self, names):
+        """Vectorized version of normalize for a whole pandas column. Only
+        the unique values are normalized.
+
+        Parameters
+        ----------
+        names : pandas Series
+
+        Returns
+        -------
+        companies : pandas Series
+        """
+        mapping = {name: self.normalize(name) for name in names.dropna().unique()}
+
+        return names.map(mapping)
+
+def get_company_normalizer():
+    """Returns the normalizer from company_aliases.yaml, loading it once.
+
+    Returns
+    -------
+    normalizer : CompanyNormalizer
+    """
+    global _default_normalizer
+
+    if _default_normalizer is None:
+        _default_normalizer = CompanyNormalizer.from_file()
+
+    return _default_normalizer
@@ -0,0 +1,275 @@
+#!/usr/local/bin/python3
+
+# Copyright (C) 2026 Dawn M. Foster
+# Licensed under GNU General Public License (GPL), version 3 or later: http://www.gnu.org/licenses/gpl.txt
+
+"""
+Reading and writing the owners datasets.
+
+The csv files start with a license preamble followed by a blank line and
+the header. The same rows can also be written as a Parquet or Arrow IPC
+file with a fixed schema, where the repetitive columns are dictionary
+encoded and the license preamble is stored in the file metadata. The
+columnar files keep company names with commas, which are stripped in the
+csv files. Writing them requires the optional pyarrow package.
+
+Existing csv datasets can be converted from the command line:
+
+python3 dataset_io.py datasets/owners_data_2022-04-18.csv --format parquet
+
+Parameters
+----------
+csv_path : str
+    The csv dataset to convert
+--format : str
+    parquet (default) or arrow
+"""
+
+OWNERS_COLUMNS = ['company', 'username', 'status', 'sig_name', 'subproject', 'owners_file']
+ISTIO_COLUMNS = ['company', 'username', 'team']
+
+# Columns with few distinct values that are stored dictionary encoded
+DICTIONARY_COLUMNS = {'company', 'sig_name', 'owners_file', 'team'}
+
+COLUMNAR_SUFFIXES = {'parquet': '.parquet', 'arrow': '.arrow'}
+
+def preamble(status, source_url='https://github.com/geekygirldawn/k8s_data/datasets'):
+    """Returns the license preamble written at the top of each dataset.
+
+    Parameters
+    ----------
+    status : str
+        Like 'Updated on 2023-06-28'
+    source_url : str
+
+    Returns
+    -------
+    metadata : dict
+    """
+    return {'License': 'Creative Commons Attribution-ShareAlike 4.0 International License',
+            'License Link': 'http://creativecommons.org/licenses/by-sa/4.0/',
+            'Author': 'Dr. Dawn M. Foster',
+            'Status': status,
+            'Source URL': source_url}
+
+def dataset_schema(columns, metadata=None):
+    """Returns the Arrow schema for a dataset with the given columns.
+
+    Parameters
+    ----------
+    columns : list
+        OWNERS_COLUMNS or ISTIO_COLUMNS
+    metadata : dict
+        Saved as the schema metadata, like the license preamble
+
+    Returns
+    -------
+    schema : pyarrow.Schema
+    """
+    import pyarrow as pa
+
+    fields = []
+    for column in columns:
+        if column in DICTIONARY_COLUMNS:
+            fields.append(pa.field(column, pa.dictionary(pa.int32(), pa.string()), nullable=False))
+        else:
+            fields.append(pa.field(column, pa.string(), nullable=False))
+
+    return pa.schema(fields, metadata=metadata)
+
+def write_columnar(rows, columns, path, metadata=None):
+    """Writes rows to a Parquet file, or to an Arrow IPC file when path
+    ends in .arrow.
+
+    Parameters
+    ----------
+    rows : list
+        Lists of strings in the order of columns
+    columns : list
+    path : str
+    metadata : dict
+    """
+    import pyarrow as pa
+
+    schema = dataset_schema(columns, metadata)
+    arrays = []
+    for n, field in enumerate(schema):
+        values = pa.array([row[n] for row in rows], pa.string())
+        if pa.types.is_dictionary(field.type):
+            values = values.dictionary_encode()
+        arrays.append(values)
+    table = pa.Table.from_arrays(arrays, schema=schema)
+
+    if path.endswith('.arrow'):
+        with pa.OSFile(path, 'wb') as sink:
+            with pa.ipc.new_file(sink, schema) as writer:
+                writer.write_table(table)
+    else:
+        import pyarrow.parquet as pq
+
+        pq.write_table(table, path)
+
+class DatasetWriter:
+    """Writes the rows of a dataset to a csv file with the license
+    preamble, and optionally to a columnar file when it is closed.
+
+    Parameters
+    ----------
+    csv_path : str
+    columns : list
+        OWNERS_COLUMNS or ISTIO_COLUMNS
+    metadata : dict
+        License preamble from the preamble function
+    columnar_format : str
+        'parquet' or 'arrow' to also write a columnar file next to the csv
+        file, or None for only the csv file
+    """
+
+    def __init__(self, csv_path, columns, metadata, columnar_format=None):
+        self.csv_path = csv_path
+        self.columns = columns
+        self.metadata = metadata
+        self.columnar_path = None
+        self.rows = []
+
+        if columnar_format is not None:
+            try:
+                import pyarrow
+            except ImportError:
+                raise ImportError("pyarrow is needed to write " + columnar_format + " files: pip install pyarrow")
+            self.columnar_path = csv_path.rsplit('.', 1)[0] + COLUMNAR_SUFFIXES[columnar_format]
+
+        self._company = columns.index('company')
+        self._csv_file = open(csv_path, 'w')
+        for key, value in metadata.items():
+            self._csv_file.write(key + ": " + value + "\n")
+        self._csv_file.write("\n")
+        self._csv_file.write(",".join(columns) + "\n")
+
+    def write_row(self, row):
+        """Writes one row. Commas are removed from the company name in the
+        csv file only.
+
+        Parameters
+        ----------
+        row : list
+            Strings in the order of the columns
+        """
+        csv_row = list(row)
+        csv_row[self._company] = csv_row[self._company].replace(",", "")
+        self._csv_file.write(",".join(csv_row) + "\n")
+
+        if self.columnar_path is not None:
+            self.rows.append(row)
+
+    def write_rows(self, rows):
+        """Writes each row in rows."""
+
+        for row in rows:
+            self.write_row(row)
+
+    def close(self):
+        """Closes the csv file and writes the columnar file if requested."""
+
+        self._csv_file.close()
+        if self.columnar_path is not None:
+            write_columnar(self.rows, self.columns, self.columnar_path, self.metadata)
+            print("Wrote", self.columnar_path)
+
+def read_csv_preamble(csv_path):
+    """Reads the license preamble at the top of a csv dataset.
+
+    Parameters
+    ----------
+    csv_path : str
+
+    Returns
+    -------
+    metadata : dict
+    skiprows : int
+        Number of lines before the header
+    """
+    metadata = {}
+    skiprows = 0
+    with open(csv_path, 'r') as f:
+        for line in f:
+            line = line.rstrip('\n')
+            if ': ' not in line or line.startswith('company,'):
+                break
+            key, value = line.split(': ', 1)
+            metadata[key] = value
+            skiprows += 1
+    # The blank line between the preamble and the header
+    if metadata:
+        skiprows += 1
+
+    return metadata, skiprows
+
+def read_dataset(path):
+    """Loads a csv, Parquet or Arrow IPC dataset into a dataframe. The
+    dictionary encoded columns of columnar files become categoricals.
+
+    Parameters
+    ----------
+    path : str
+
+    Returns
+    -------
+    df : dataframe
+    metadata : dict
+        The license preamble
+    """
+    import pandas as pd
+
+    if path.endswith('.parquet') or path.endswith('.arrow'):
+        import pyarrow as pa
+
+        if path.endswith('.arrow'):
+            with pa.memory_map(path, 'r') as source:
+                table = pa.ipc.open_file(source).read_all()
+        else:
+            import pyarrow.parquet as pq
+
+            table = pq.read_table(path)
+
+        metadata = {key.decode(): value.decode() for key, value in (table.schema.metadata or {}).items()}
+        return table.to_pandas(), metadata
+
+    metadata, skiprows = read_csv_preamble(path)
+    df = pd.read_csv(path, skiprows=skiprows, dtype=str, keep_default_na=False)
+
+    return df, metadata
+
+def convert_csv(csv_path, columnar_format='parquet'):
+    """Converts a csv dataset to a columnar file next to it.
+
+    Parameters
+    ----------
+    csv_path : str
+    columnar_format : str
+        'parquet' or 'arrow'
+
+    Returns
+    -------
+    columnar_path : str
+    """
+    df, metadata = read_dataset(csv_path)
+
+    columns = list(df.columns)
+    if columns not in (OWNERS_COLUMNS, ISTIO_COLUMNS):
+        raise ValueError("Unknown dataset columns in " + csv_path + ": " + ",".join(columns))
+
+    columnar_path = csv_path.rsplit('.', 1)[0] + COLUMNAR_SUFFIXES[columnar_format]
+    write_columnar(df.values.tolist(), columns, columnar_path, metadata)
+
+    return columnar_path
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Convert a csv dataset to Parquet or Arrow.')
+    parser.add_argument('csv_path', help='The csv dataset to convert')
+    parser.add_argument('--format', choices=['parquet', 'arrow'], default='parquet', help='Columnar file format')
+    args = parser.parse_args()
+
+    print("Wrote", convert_csv(args.csv_path, args.format))
@@ -35,8 +35,10 @@ for each person to make it possible to send email reminders to eligible
 voters. 
 
 If an email address is in the GitHub profile, that is used first. Otherwise,
-it attempts to find an email address from the most recent commit. If the
-email contains the string 'noreply' it is not written to the csv file.
+it uses the email address from the voter's most recent commit in the org.
+The commit history of the org is read once up front to build an index of
+commit emails for all voters. Emails containing the string 'noreply' are
+not written to the csv file.
 
 As output, a csv file of this format containing comma separated email addresses 
 is created:
@@ -53,6 +55,9 @@ org_name : str
     Used to gather email address from commits
 file_name : str
     This should be an Elekto yaml file starting with "eligible_voters:"
+--since : str
+    Only read commits on or after this date (YYYY-MM-DD) when looking for
+    commit emails. Default: one year ago
 """
 
 def read_args():
@@ -70,75 +75,73 @@ def read_args():
     file_name : str
         This should be an Elekto yaml file (raw) starting with "eligible_voters:" Example:
         https://raw.githubusercontent.com/knative/community/main/elections/2021-TOC/voters.yaml
+    api_tokens : list
+        One or more GitHub API tokens
+    since : datetime
+        Oldest commit to read for commit emails
     """
-    import sys
+    import argparse
+    from datetime import datetime, timedelta
 
     # read org name and filename from command line or prompt if no 
     # arguments were given.
-    try:
-        org_name = str(sys.argv[1])
-        file_name = str(sys.argv[2])
+    parser = argparse.ArgumentParser(description='Find email addresses for the voters in an elekto voters.yaml file.')
+    parser.add_argument('org_name', nargs='?', default=None, help='The primary GitHub organization for the vote')
+    parser.add_argument('file_name', nargs='?', default=None, help='Raw url of the elekto voters.yaml file')
+    parser.add_argument('--since', default=None, help='Only read commits on or after this date (YYYY-MM-DD), default one year ago')
+    args = parser.parse_args()
 
-    except:
+    org_name = args.org_name
+    file_name = args.file_name
+
+    if org_name is None or file_name is None:
         print("Please enter the org name and filename for voters.yaml.")
         org_name = input("Enter a GitHub org name (like kubernetes): ")
         file_name = input("Enter a file name (like https://raw.githubusercontent.com/knative/community/main/elections/2021-TOC/voters.yaml): ")
 
-    api_token = input("Enter your GitHub Personal Access Token: ")
+    api_tokens = input("Enter your GitHub Personal Access Token(s), separated by spaces: ").split()
+
+    # Reading the whole commit history of large orgs takes far too long
+    if args.since:
+        since = datetime.strptime(args.since, '%Y-%m-%d')
+    else:
+        since = datetime.now() - timedelta(days=365)
 
-    return org_name, file_name, api_token
+    return org_name, file_name, api_tokens, since
 
-def get_email(org, username, api_token):
+def get_email(username, email_index):
     """Attempts to get an email address from the GitHub profile first. 
-    Otherwise, it attempts to find an email address from the most recent
-    commit, which is why the name of the GitHub org is required. If the
-    email contains the string 'noreply' it is not written to the csv file.
+    Otherwise, it uses the most recent commit email found for the user in
+    email_index, which is built once for the whole org by
+    build_email_index. Emails containing the string 'noreply' are not
+    used.
     
+    The profile is read with the client from the shared token pool that
+    has the most budget left.
+
     Parameters
     ----------
-    org : str
-        The primary org name where the users can be found
     username : str
         GitHub username
+    email_index : dict
+        Maps lower case logins to commit emails
 
     Returns
     -------
     email : str
     """
 
-    import sys
-    from github import Github # Uses https://github.com/PyGithub/
-
-    try:
-        g = Github(api_token)
-    except:
-        print("Cannot read gh_key file or does not contain a valid GitHub API token?")
-        sys.exit()
+    from github_client import call_github, get_pool
 
+    g = get_pool().github()
     try:
-        email = g.get_user(username).email
-
-        email_list = []
-
-        if email == None:
-            repo_list = g.get_organization(org).get_repos()
-
-            for repo in repo_list:
-                commits = repo.get_commits(author=username)
-
-                if commits.totalCount > 0:
-                    email_list.append([commits[0].commit.author.email, commits[0].commit.author.date, repo.name])
-
-            if len(email_list) > 0:
-                newest = sorted(email_list, key = lambda x: x[1], reverse = True)
-                email = newest[0][0]
-            else:
-                email = None
-        if 'noreply' in email:
-            email = None
+        email = call_github(lambda: g.get_user(username).email, g)
     except:
         email = None
 
+    if email == None or 'noreply' in email:
+        email = email_index.get(username.lower())
+
     return(email)
 
 import sys
@@ -146,10 +149,12 @@ import yaml
 import csv
 import urllib.request
 from datetime import datetime
+from github_client import get_pool
+from common_functions import build_email_index
 
 print(datetime.now().time())
 
-org_name, file_name, api_token = read_args()
+org_name, file_name, api_tokens, since = read_args()
 
 # Loads the yaml file and creates a list of voters
 try:
@@ -164,6 +169,11 @@ except:
 
 print("Gathering email addresses from GitHub. This may take a while.")
 
+get_pool().add(api_tokens)
+
+# Walk the org's commit history once to find commit emails for all voters
+email_index = build_email_index(org_name, {username.lower() for username in voter_list}, since)
+
 # Create a list for the emails and initialize a counter for the
 # number of emails found.
 email_list = []
@@ -173,7 +183,7 @@ found_count = 0
 # append it to the list and increment the counter. Also print to the screen to
 # show that the script is progressing.
 for username in voter_list:
-    email = get_email(org_name, username, api_token)
+    email = get_email(username, email_index)
     if email:
         email_list.append(email)
         found_count+=1
@@ -190,4 +200,5 @@ csv_file = csv.writer(f)
 
 csv_file.writerow(email_list)
 f.close()
+get_pool().report()
 print(datetime.now().time())
@@ -6,11 +6,20 @@
 This script is designed to find the path to OWNERS files within Kubernetes
 organizations, but it is generic enough to find any files of a specific
 filename within a specified GitHub org.
-Note: The GitHub search API is a little flaky, so it's likely that some
-files are missing.
+
+By default, the files are found by listing the whole default branch of
+each repo with one recursive git trees API call and filtering the paths
+locally. The older search mode uses the GitHub code search API instead,
+which is a little flaky, so it's likely that some files are missing.
+The clone mode reads the paths from local bare clones of each repo.
+
+The output csv has a row for each file with its raw url and, in the tree
+and clone modes, its git blob sha, which owners_details.py --incremental
+uses to skip files that haven't changed.
 
 As input, this script requires that you have a GitHub API token in a file
-called 'gh_key' in this directory.
+called 'gh_key' in this directory. The file can hold several tokens, one
+per line, and requests are spread across them.
 
 Parameters
 ----------
@@ -18,19 +27,30 @@ org_name : str
     The GitHub organization to be searched
 file_name : str
     The filename to search, like OWNERS or CODEOWNERS
+--mode : str
+    How files are found: tree (default), clone or search
+--workers : int
+    Number of repos processed in parallel (default 8)
+--resume
+    Continue an interrupted run using the journal of finished repos
 
 """
 
+import csv
 from datetime import datetime
 from os.path import dirname, join
-from github import Github
-from common_functions import read_key, run_search_query, expand_name_df
+from functools import partial
+from concurrent.futures import ThreadPoolExecutor
+from common_functions import read_keys, run_search_query
+from common_functions import list_tree_files, list_clone_files
+from github_client import get_pool
+from checkpoint import Journal, read_journal
 
-api_token = read_key('gh_key')
-g = Github(api_token)
+api_tokens = read_keys('gh_key')
 
 def read_args():
-    """Reads the org name and filename to be used in the search
+    """Reads the org name and filename to be used in the search along
+    with the discovery mode and number of workers
     
     Parameters
     ----------
@@ -42,22 +62,39 @@ def read_args():
         The GitHub organization to be searched
     file_name : str
         The filename to search, like OWNERS or CODEOWNERS
+    mode : str
+        'tree', 'clone' or 'search'
+    workers : int
+        Number of repos processed in parallel
+    resume : bool
+        Continue an interrupted run
     """
-    import sys
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Find files with a specific filename in a GitHub org.')
+    parser.add_argument('org_name', nargs='?', default=None, help='The GitHub organization to be searched')
+    parser.add_argument('file_name', nargs='?', default=None, help='The filename to search, like OWNERS or CODEOWNERS')
+    parser.add_argument('--mode', choices=['tree', 'clone', 'search'], default='tree', help='How files are found in each repo')
+    parser.add_argument('--workers', type=int, default=8, help='Number of repos processed in parallel')
+    parser.add_argument('--resume', action='store_true', help='Continue an interrupted run using the journal of finished repos')
+    args = parser.parse_args()
 
     # read org name and filename from command line
-    try:
-        org_name = str(sys.argv[1])
-        file_name = str(sys.argv[2])
+    org_name = args.org_name
+    file_name = args.file_name
 
-    except:
+    if org_name is None or file_name is None:
         print("Please enter the org name and filename to search when prompted.")
         org_name = input("Enter a GitHub org name (like kubernetes): ")
         file_name = input("Enter a file name (like OWNERS): ")
 
-    return org_name, file_name
+    return org_name, file_name, args.mode, args.workers, args.resume
+
+org_name, file_name, mode, workers, resume = read_args()
 
-org_name, file_name = read_args()
+# Code search has a very low rate limit, so parallel searches don't help
+if mode == 'search':
+    workers = 1
 
 def make_repo_query(after_cursor = None):
     """Creates the query string for the GraphQL API call using after_cursor
@@ -90,35 +127,31 @@ def make_repo_query(after_cursor = None):
         "AFTER", '"{}"'.format(after_cursor) if after_cursor else "null"
     )
 
-def get_repo_list(api_token, org_name):
+def iter_repo_pages(api_token, org_name, after_cursor = None):
     """Uses the make_repo_query function to run the GraphQL query and
-    returns the results as a dataframe containing the default branch 
-    and repo name for all of the repo within the org. Note: default
+    yields each page of repos within the org as it arrives. Note: default
     branch is needed to build the url to the file.
     
     Parameters
     ----------
-    api_token : str
+    api_token : str or list
+        GitHub API token(s)
     org_name : str
+    after_cursor : str
+        Cursor of the page to start from, or None for the first page
 
     Returns
     -------
-    repo_info_df : dataframe
+    generator of (after_cursor, end_cursor, repos) tuples. after_cursor
+    is the cursor used to request the page, end_cursor is None for the
+    last page, and repos is a list of (repo_name, branch_name) tuples.
+    branch_name is 'Likely Missing' for empty repos without a default branch.
     """
-    import requests
-    import json
-    import pandas as pd
-
-    # Setting up the variables needed for the API
-    url = 'https://api.github.com/graphql'
-    headers = {'Authorization': 'token %s' % api_token}
-    
-    repo_info_df = pd.DataFrame()
+    from common_functions import run_graphql
 
     # Initialize the variables needed to page through the results.
     # and while there are more pages, query a new page of results
     has_next_page = True
-    after_cursor = None
 
     while has_next_page:
 
@@ -127,38 +160,143 @@ def get_repo_list(api_token, org_name):
         # Pass the variables into the query and run it using the graphQL
         # API returning a json file
         variables = {"org_name": org_name}
-        r = requests.post(url=url, json={'query': query, 'variables': variables}, headers=headers)
-        json_data = json.loads(r.text)
+        json_data = run_graphql(query, api_token, variables)
+        repositories = json_data['data']['organization']['repositories']
 
-        # Convert the json file to a temporary dataframe that is added
-        # to the main dataframe with all of the results to be returned.
-        df_temp = pd.DataFrame(json_data['data']['organization']['repositories']['nodes'])
-        repo_info_df = pd.concat([repo_info_df, df_temp])
+        repos = []
+        for node in repositories['nodes']:
+            if node['defaultBranchRef'] is None:
+                branch_name = 'Likely Missing'
+            else:
+                branch_name = node['defaultBranchRef']['name']
+            repos.append((node['name'], branch_name))
 
         # Set variables that check for and handle results with 
         # multiple pages.
-        has_next_page = json_data["data"]["organization"]["repositories"]["pageInfo"]["hasNextPage"]
-        after_cursor = json_data["data"]["organization"]["repositories"]["pageInfo"]["endCursor"]
-        
-    return repo_info_df
+        has_next_page = repositories["pageInfo"]["hasNextPage"]
+        end_cursor = repositories["pageInfo"]["endCursor"] if has_next_page else None
 
-# Runs the function that gets the repos from the graphQL API
-# and convert the output dataframe to a list of repos.
-repo_info_df = get_repo_list(api_token, org_name)
-#repo_list = repo_info_df['name'].tolist()
+        yield after_cursor, end_cursor, repos
 
-repo_info_df = expand_name_df(repo_info_df,'defaultBranchRef','defaultBranch')
+        after_cursor = end_cursor
 
-owners_rows = []
+def find_repo_files(repo_name, branch_name):
+    """Finds the files in a single repo using the selected mode.
+
+    Parameters
+    ----------
+    repo_name : str
+    branch_name : str
+
+    Returns
+    -------
+    files : list
+        [url, blob_sha] for each file, or just [url] in search mode. None
+        if the files couldn't be listed, so a resumed run tries the repo
+        again
+    """
+    # Repos without a default branch are empty
+    if mode != 'search' and branch_name == 'Likely Missing':
+        return []
+
+    try:
+        if mode == 'search':
+            query = "filename:" + file_name + " repo:" + org_name + "/" + repo_name
+            print(query)
+            return [[url] for url in run_search_query(query, get_pool().github('search'), branch_name, [])]
+        elif mode == 'clone':
+            files = list_clone_files(org_name, repo_name, branch_name, file_name)
+        else:
+            files = list_tree_files(org_name, repo_name, branch_name, file_name, api_tokens)
+    except Exception as e:
+        print("Cannot list files for", org_name + '/' + repo_name, e)
+        return None
 
-# Iterate through the list of repos and run a search API query that
-# gets the owners files for each repo.
-for item in repo_info_df.iterrows():
-    repo_name = item[1]['name']
-    branch_name = item[1]['defaultBranch']
-    query = "filename:" + file_name + " repo:" + org_name + "/" + repo_name
-    print(query)
-    owners_rows = run_search_query(query, g, branch_name, owners_rows)
+    print(org_name + '/' + repo_name, "found", len(files))
+    return files
+
+def resume_point(records):
+    """Works out where an interrupted run should continue from its journal.
+
+    Parameters
+    ----------
+    records : list
+        Journal records. Page records look like {"page": after_cursor,
+        "next": end_cursor, "repos": [...]} and finished repo records
+        look like {"repo": repo_name, "files": [...]}
+
+    Returns
+    -------
+    repo_order : list
+        Names of the repos on the pages before the resume point, which
+        are all finished
+    done : dict
+        Maps each finished repo to its file urls
+    start : tuple
+        (after_cursor,) of the page to continue from, or None when every
+        page has been read and every repo is finished
+    """
+    pages = {}
+    done = {}
+    for record in records:
+        if 'page' in record:
+            # A resumed run reads its first page again, so keep the first copy
+            pages.setdefault(record['page'], record)
+        else:
+            done[record['repo']] = record['files']
+
+    repo_order = []
+    after_cursor = None
+    for page in pages.values():
+        if page['page'] != after_cursor:
+            # A page is missing from the journal
+            break
+        if any(repo not in done for repo in page['repos']):
+            break
+        repo_order.extend(page['repos'])
+        after_cursor = page['next']
+        if after_cursor is None:
+            return repo_order, done, None
+
+    return repo_order, done, (after_cursor,)
+
+# Each page of repos and each finished repo is recorded in a journal, so an
+# interrupted run can continue with --resume. Pagination restarts from the
+# first page with unfinished repos and finished repos aren't listed again.
+journal_path = "./output/" + org_name + "_" + file_name + ".journal"
+repo_order, done, start = [], {}, (None,)
+if resume:
+    repo_order, done, start = resume_point(read_journal(journal_path))
+    print("Resuming with", len(done), "finished repos from the journal")
+journal = Journal(journal_path, resume=resume)
+
+def record_repo(repo_name, future):
+    # Journals a repo as soon as its files are listed
+    if future.exception() is None and future.result() is not None:
+        journal.append({"repo": repo_name, "files": future.result()})
+
+# Repos from the graphQL API are processed in parallel as soon as each
+# page of results arrives, and the results are kept in repo order.
+futures = {}
+with ThreadPoolExecutor(max_workers=workers) as executor:
+    if start is not None:
+        for after_cursor, end_cursor, repos in iter_repo_pages(api_tokens, org_name, start[0]):
+            journal.append({"page": after_cursor, "next": end_cursor, "repos": [repo_name for repo_name, branch_name in repos]})
+            for repo_name, branch_name in repos:
+                repo_order.append(repo_name)
+                if repo_name not in done:
+                    futures[repo_name] = executor.submit(find_repo_files, repo_name, branch_name)
+                    futures[repo_name].add_done_callback(partial(record_repo, repo_name))
+
+    owners_rows = []
+    failed = 0
+    for repo_name in repo_order:
+        if repo_name not in futures:
+            owners_rows.extend(done[repo_name])
+        elif futures[repo_name].result() is None:
+            failed += 1
+        else:
+            owners_rows.extend(futures[repo_name].result())
 
 # prepare file and write rows to csv
 
@@ -168,8 +306,19 @@ try:
     current_dir = dirname(__file__)
     file_path = join(current_dir, output_filename)
 
-    with open(file_path, 'w') as file:    
-        file.writelines("%s\n" % item for item in owners_rows)
+    # One file per row: the url, followed by the git blob sha when it is
+    # known. Journals from older runs only have the url.
+    with open(file_path, 'w', newline='') as file:
+        csv.writer(file).writerows(row if isinstance(row, list) else [row] for row in owners_rows)
+
+    # Keep the journal when some repos failed so that --resume retries them
+    if failed:
+        print(failed, "repos could not be listed. Run again with --resume to retry them.")
+        journal.close()
+    else:
+        journal.remove()
 
 except:
-    print('Could not write to csv file. This may be because the output directory is missing or you do not have permissions to write to it. Exiting')
\ No newline at end of file
+    print('Could not write to csv file. This may be because the output directory is missing or you do not have permissions to write to it. Exiting')
+
+get_pool().report()
\ No newline at end of file
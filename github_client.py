@@ -0,0 +1,439 @@
+# Copyright (C) 2026 Dawn M. Foster
+# Licensed under GNU General Public License (GPL), version 3 or later: http://www.gnu.org/licenses/gpl.txt
+
+"""
+Shared handling of GitHub API rate limits.
+
+Instead of sleeping for a fixed amount of time after every request, every
+GitHub call goes through a RateGovernor that only waits when the budget
+requires it. The governor models each API resource (core REST, search,
+GraphQL) with two token buckets:
+
+* the primary limit, taken from the X-RateLimit-Remaining and
+  X-RateLimit-Reset headers of the latest response
+* the secondary per-minute limit, which GitHub doesn't report in headers
+
+When a request is rejected anyway, the Retry-After or X-RateLimit-Reset
+headers decide how long to wait before trying again.
+
+Several API tokens can be used at once. The shared TokenPool keeps one
+governor and one PyGithub client per token and sends each request to the
+token with the most remaining budget.
+"""
+
+import threading
+
+# Requests allowed per minute by the GitHub secondary rate limits. Code
+# search has its own much lower limit.
+SECONDARY_LIMITS = {'core': 900, 'search': 10, 'graphql': 2000}
+
+class TokenBucket:
+    """Token bucket that refills capacity tokens every per_seconds.
+
+    Parameters
+    ----------
+    capacity : int
+    per_seconds : float
+    """
+
+    def __init__(self, capacity, per_seconds):
+        import time
+
+        self.capacity = capacity
+        self.rate = capacity / per_seconds
+        self.tokens = capacity
+        self.updated = time.monotonic()
+
+    def take(self):
+        """Takes a token if one is available.
+
+        Returns
+        -------
+        wait : float
+            0 if a token was taken, otherwise the seconds until one is
+            available
+        """
+        import time
+
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0
+        return (1 - self.tokens) / self.rate
+
+    def peek(self):
+        """Returns the seconds until a token is available without taking it."""
+        import time
+
+        tokens = min(self.capacity, self.tokens + (time.monotonic() - self.updated) * self.rate)
+        if tokens >= 1:
+            return 0
+        return (1 - tokens) / self.rate
+
+class RateGovernor:
+    """Tracks the GitHub rate limit budget and makes callers wait only
+    when it is used up. Safe to share between threads.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._buckets = {resource: TokenBucket(limit, 60) for resource, limit in SECONDARY_LIMITS.items()}
+        self._remaining = {}
+        self._reset = {}
+        self._blocked_until = 0
+        self.throttled_seconds = 0.0
+        self.throttle_count = 0
+
+    def _wait_time(self, resource):
+        # Seconds to wait before the next request for resource, or 0 after
+        # taking a token from the buckets. Must be called with _lock held.
+        import time
+
+        now = time.time()
+        if self._blocked_until > now:
+            return self._blocked_until - now
+
+        remaining = self._remaining.get(resource)
+        reset = self._reset.get(resource, 0)
+        if remaining is not None and remaining <= 0:
+            if reset > now:
+                return reset - now + 1
+            # The limit has been reset since the last response
+            del self._remaining[resource]
+
+        wait = self._buckets[resource].take()
+        if wait == 0 and resource in self._remaining:
+            self._remaining[resource] -= 1
+
+        return wait
+
+    def budget(self, resource='core'):
+        """Returns how soon and how often resource can be used, without
+        using any of the budget.
+
+        Parameters
+        ----------
+        resource : str
+
+        Returns
+        -------
+        wait : float
+            Seconds before the next request can be sent
+        remaining : float
+            Requests left in the primary limit, or infinity before the
+            first response has reported it
+        """
+        import time
+
+        with self._lock:
+            now = time.time()
+            wait = max(self._blocked_until - now, self._buckets[resource].peek())
+            remaining = self._remaining.get(resource)
+            if remaining is None or self._reset.get(resource, 0) <= now:
+                remaining = float('inf')
+            elif remaining <= 0:
+                wait = max(wait, self._reset[resource] - now + 1)
+
+        return wait, remaining
+
+    def acquire(self, resource='core'):
+        """Blocks until a request for resource fits within the budget.
+
+        Parameters
+        ----------
+        resource : str
+            'core', 'search' or 'graphql'
+        """
+        import time
+
+        while True:
+            with self._lock:
+                wait = self._wait_time(resource)
+            if wait <= 0:
+                return
+            if wait > 10:
+                print("GitHub", resource, "rate limit reached, waiting", round(wait), "seconds")
+            with self._lock:
+                self.throttled_seconds += wait
+                self.throttle_count += 1
+            time.sleep(wait)
+
+    def update(self, resource, headers):
+        """Updates the budget for resource from the headers of a response.
+
+        Parameters
+        ----------
+        resource : str
+        headers : dict
+        """
+        with self._lock:
+            try:
+                self._remaining[resource] = int(headers['X-RateLimit-Remaining'])
+                self._reset[resource] = int(headers['X-RateLimit-Reset'])
+            except (KeyError, TypeError, ValueError):
+                pass
+
+    def back_off(self, resource, headers):
+        """Blocks further requests after a rate limited response, using
+        Retry-After when given, the reset time for an exhausted primary
+        limit, or one minute for a secondary limit without either.
+
+        Parameters
+        ----------
+        resource : str
+        headers : dict
+        """
+        import time
+        from requests.structures import CaseInsensitiveDict
+
+        headers = CaseInsensitiveDict(headers or {})
+        now = time.time()
+        try:
+            until = now + int(headers['Retry-After'])
+        except (KeyError, TypeError, ValueError):
+            if str(headers.get('X-RateLimit-Remaining')) == '0' and 'X-RateLimit-Reset' in headers:
+                until = int(headers['X-RateLimit-Reset']) + 1
+            else:
+                until = now + 60
+
+        with self._lock:
+            self._blocked_until = max(self._blocked_until, until)
+
+    def report(self):
+        """Prints how much time was spent waiting on rate limits."""
+
+        print("Waited", round(self.throttled_seconds, 1), "seconds for GitHub rate limits", "(" + str(self.throttle_count), "waits)")
+
+class TokenPool:
+    """Set of GitHub API tokens, each with its own RateGovernor and reused
+    PyGithub client. Requests go to the token with the most remaining
+    budget. Safe to share between threads.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._governors = {}
+        self._clients = {}
+
+    def add(self, tokens):
+        """Adds tokens to the pool. Tokens already in the pool are ignored.
+
+        Parameters
+        ----------
+        tokens : str or list
+        """
+        if isinstance(tokens, str):
+            tokens = [tokens]
+        with self._lock:
+            for token in tokens:
+                if token and token not in self._governors:
+                    self._governors[token] = RateGovernor()
+
+    def choose(self, resource='core'):
+        """Returns the token that can be used soonest for resource, and
+        among those the one with the most requests left.
+
+        Parameters
+        ----------
+        resource : str
+
+        Returns
+        -------
+        token : str
+        governor : RateGovernor
+        """
+        with self._lock:
+            governors = list(self._governors.items())
+        if not governors:
+            raise RuntimeError("No GitHub API tokens have been added to the pool")
+
+        def score(item):
+            wait, remaining = item[1].budget(resource)
+            return wait, -remaining
+
+        return min(governors, key=score)
+
+    def github(self, resource='core'):
+        """Returns the PyGithub client for the token with the most budget
+        for resource. Objects returned by the client, like paginated
+        lists, keep using that client's token.
+
+        Parameters
+        ----------
+        resource : str
+
+        Returns
+        -------
+        g : Github object
+        """
+        from github import Github
+
+        token, governor = self.choose(resource)
+        with self._lock:
+            if token not in self._clients:
+                self._clients[token] = Github(token, per_page=100)
+            return self._clients[token]
+
+    def governor_for(self, g):
+        """Returns the RateGovernor of the token used by a client returned
+        by github().
+
+        Parameters
+        ----------
+        g : Github object
+
+        Returns
+        -------
+        governor : RateGovernor
+        """
+        with self._lock:
+            for token, client in self._clients.items():
+                if client is g:
+                    return self._governors[token]
+        raise KeyError("Github client is not part of the token pool")
+
+    def report(self):
+        """Prints how much time was spent waiting on rate limits."""
+
+        with self._lock:
+            governors = list(self._governors.values())
+        throttled_seconds = sum(governor.throttled_seconds for governor in governors)
+        throttle_count = sum(governor.throttle_count for governor in governors)
+        print("Waited", round(throttled_seconds, 1), "seconds for GitHub rate limits", "(" + str(throttle_count), "waits,", len(governors), "tokens)")
+
+_pool = TokenPool()
+
+def get_pool():
+    """Returns the TokenPool shared by all GitHub calls in this process."""
+
+    return _pool
+
+def is_rate_limited(status, headers):
+    """Returns True if a response status and headers indicate that the
+    request was rejected because of a rate limit.
+
+    Parameters
+    ----------
+    status : int
+    headers : dict
+
+    Returns
+    -------
+    limited : bool
+    """
+    from requests.structures import CaseInsensitiveDict
+
+    headers = CaseInsensitiveDict(headers or {})
+    if status == 429:
+        return True
+    if status == 403:
+        # 403 responses without rate limit headers are real errors
+        return 'Retry-After' in headers or str(headers.get('X-RateLimit-Remaining')) == '0'
+    return False
+
+def github_request(method, url, resource='core', max_retries=5, **kwargs):
+    """Sends a request to the GitHub API with the pool token that has the
+    most budget, using the requests session for the current thread. Rate
+    limited responses are retried after the wait GitHub asks for, possibly
+    with a different token.
+
+    Parameters
+    ----------
+    method : str
+        'GET' or 'POST'
+    url : str
+    resource : str
+        'core', 'search' or 'graphql'
+    max_retries : int
+    kwargs
+        Passed to requests, like json
+
+    Returns
+    -------
+    r : requests.Response
+    """
+    from common_functions import get_session
+
+    headers = dict(kwargs.pop('headers', None) or {})
+
+    for attempt in range(max_retries + 1):
+        token, governor = get_pool().choose(resource)
+        governor.acquire(resource)
+        headers['Authorization'] = 'token %s' % token
+        r = get_session().request(method, url, headers=headers, **kwargs)
+        governor.update(resource, r.headers)
+
+        if not is_rate_limited(r.status_code, r.headers) or attempt == max_retries:
+            return r
+        governor.back_off(resource, r.headers)
+
+    return r
+
+def call_github(fn, g, resource='core', max_retries=5):
+    """Runs a PyGithub call through the governor of the token used by g.
+    fn should be a function without arguments that sends a single request,
+    like lambda: g.get_user(username).email, since each call is charged as
+    one request. Use iter_pages for paginated lists.
+
+    Parameters
+    ----------
+    fn : function
+    g : Github object
+        Client from TokenPool.github(). The rate limit headers of its
+        latest response are used to update the budget.
+    resource : str
+        'core', 'search' or 'graphql'
+    max_retries : int
+
+    Returns
+    -------
+    The return value of fn
+    """
+    from github import GithubException
+
+    governor = get_pool().governor_for(g)
+
+    for attempt in range(max_retries + 1):
+        governor.acquire(resource)
+        try:
+            result = fn()
+        except GithubException as e:
+            headers = getattr(e, 'headers', None) or {}
+            if attempt == max_retries or not is_rate_limited(e.status, headers):
+                raise
+            governor.back_off(resource, headers)
+            continue
+
+        # g.rate_limiting would send a request of its own when no response
+        # has reported the limit yet, so the requester is read directly
+        remaining, limit = g.requester.rate_limiting
+        reset = g.requester.rate_limiting_resettime
+        if limit >= 0 and reset:
+            governor.update(resource, {'X-RateLimit-Remaining': remaining, 'X-RateLimit-Reset': reset})
+        return result
+
+def iter_pages(paginated_list, g, resource='core'):
+    """Yields each page of a PyGithub paginated list, sending every page
+    request through call_github so that each one is charged to the budget.
+
+    Parameters
+    ----------
+    paginated_list : PaginatedList
+        Created by g, like g.get_organization(org).get_repos()
+    g : Github object
+    resource : str
+
+    Returns
+    -------
+    generator of lists
+    """
+    page_num = 0
+    while True:
+        page = call_github(lambda: paginated_list.get_page(page_num), g, resource)
+        if not page:
+            return
+        yield page
+        page_num += 1
@@ -0,0 +1,259 @@
+# Copyright (C) 2026 Dawn M. Foster
+# Licensed under GNU General Public License (GPL), version 3 or later: http://www.gnu.org/licenses/gpl.txt
+
+"""
+Persistent on-disk cache used by common_functions.download_file.
+
+Bodies are stored once per content hash under cache/objects and an sqlite
+index maps each url to its body along with the ETag and Last-Modified
+validators from the last response. When a url is requested again, a
+conditional request is sent and a 304 response reuses the stored body.
+
+The cache is kept under a size limit by evicting the least recently used
+urls. These environment variables change the default behavior:
+
+K8S_DATA_CACHE_DIR : str
+    Directory for the cache (default: cache/ in this directory)
+K8S_DATA_CACHE_MAX_MB : int
+    Maximum size of the stored bodies in MB (default: 2048)
+K8S_DATA_CACHE_ONLY : str
+    Set to 1 to only read from the cache without using the network
+"""
+
+import os
+import threading
+from collections import namedtuple
+
+CacheEntry = namedtuple('CacheEntry', ['url', 'path', 'sha256', 'size', 'status'])
+
+# The sqlite index is shared by all threads, so access is serialized
+_lock = threading.Lock()
+_db = None
+_cache_only = None
+
+def cache_dir():
+    """Returns the directory used to store the cache, creating it if needed.
+
+    Returns
+    -------
+    directory : str
+    """
+    from os.path import dirname, join
+
+    directory = os.environ.get('K8S_DATA_CACHE_DIR', join(dirname(__file__), 'cache'))
+    os.makedirs(join(directory, 'objects'), exist_ok=True)
+
+    return directory
+
+def max_cache_bytes():
+    """Returns the maximum size of the stored bodies in bytes."""
+
+    return int(os.environ.get('K8S_DATA_CACHE_MAX_MB', '2048')) * 1024 * 1024
+
+def set_cache_only(flag):
+    """Turns the offline cache-only mode on or off for this process. This
+    overrides the K8S_DATA_CACHE_ONLY environment variable.
+
+    Parameters
+    ----------
+    flag : bool
+    """
+    global _cache_only
+    _cache_only = flag
+
+def cache_only():
+    """Returns True when files should only be read from the cache."""
+
+    if _cache_only is not None:
+        return _cache_only
+    return os.environ.get('K8S_DATA_CACHE_ONLY', '') not in ('', '0')
+
+def _connect():
+    # Opens the sqlite index the first time it is needed. Must be called
+    # while holding _lock.
+    import sqlite3
+    from os.path import join
+
+    global _db
+    if _db is None:
+        _db = sqlite3.connect(join(cache_dir(), 'index.sqlite'), check_same_thread=False)
+        _db.execute("""CREATE TABLE IF NOT EXISTS entries (
+                         url TEXT PRIMARY KEY,
+                         sha256 TEXT NOT NULL,
+                         size INTEGER NOT NULL,
+                         etag TEXT,
+                         last_modified TEXT,
+                         last_access REAL NOT NULL)""")
+        _db.execute("CREATE INDEX IF NOT EXISTS entries_sha256 ON entries (sha256)")
+        _db.execute("CREATE INDEX IF NOT EXISTS entries_last_access ON entries (last_access)")
+        _db.commit()
+    return _db
+
+def _object_path(sha256):
+    from os.path import join
+
+    return join(cache_dir(), 'objects', sha256[:2], sha256)
+
+def _lookup(url):
+    # Returns the index row for url as a dict, or None if it isn't cached
+    with _lock:
+        row = _connect().execute("SELECT sha256, size, etag, last_modified FROM entries WHERE url = ?", (url,)).fetchone()
+    if row is None or not os.path.exists(_object_path(row[0])):
+        return None
+    return {'sha256': row[0], 'size': row[1], 'etag': row[2], 'last_modified': row[3]}
+
+def _touch(url):
+    import time
+
+    with _lock:
+        db = _connect()
+        db.execute("UPDATE entries SET last_access = ? WHERE url = ?", (time.time(), url))
+        db.commit()
+
+def _store_body(response):
+    # Streams the response body to a temporary file while hashing it and
+    # moves it into place under its content hash.
+    import hashlib
+    import tempfile
+    from os.path import join
+
+    sha = hashlib.sha256()
+    size = 0
+    fd, tmp_path = tempfile.mkstemp(dir=join(cache_dir(), 'objects'))
+    try:
+        with os.fdopen(fd, 'wb') as tmp_file:
+            for chunk in response.iter_content(chunk_size=1024 * 1024):
+                sha.update(chunk)
+                size += len(chunk)
+                tmp_file.write(chunk)
+
+        sha256 = sha.hexdigest()
+        path = _object_path(sha256)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        os.replace(tmp_path, path)
+    except:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+    return sha256, size
+
+def _evict(keep_url):
+    # Removes the least recently used urls until the stored bodies fit
+    # within max_cache_bytes(). Bodies are only deleted once no other url
+    # refers to them. The url that was just fetched is never evicted.
+    limit = max_cache_bytes()
+
+    with _lock:
+        db = _connect()
+        total = db.execute("SELECT COALESCE(SUM(size), 0) FROM (SELECT DISTINCT sha256, size FROM entries)").fetchone()[0]
+        if total <= limit:
+            return
+
+        candidates = db.execute("SELECT url, sha256, size FROM entries WHERE url != ? ORDER BY last_access", (keep_url,)).fetchall()
+        for url, sha256, size in candidates:
+            if total <= limit:
+                break
+            db.execute("DELETE FROM entries WHERE url = ?", (url,))
+            still_used = db.execute("SELECT 1 FROM entries WHERE sha256 = ? LIMIT 1", (sha256,)).fetchone()
+            if still_used is None:
+                total -= size
+                try:
+                    os.remove(_object_path(sha256))
+                except FileNotFoundError:
+                    pass
+        db.commit()
+
+def fetch(url):
+    """Returns the cached copy of url, downloading it or revalidating it
+    with a conditional request first unless cache-only mode is on.
+
+    Parameters
+    ----------
+    url : str
+
+    Returns
+    -------
+    entry : CacheEntry
+        status is one of 'downloaded', 'not_modified' or 'cache_only'
+    """
+    import time
+    from common_functions import get_session
+
+    cached = _lookup(url)
+
+    if cache_only():
+        if cached is None:
+            raise FileNotFoundError("Not in cache (cache-only mode): " + url)
+        _touch(url)
+        return CacheEntry(url, _object_path(cached['sha256']), cached['sha256'], cached['size'], 'cache_only')
+
+    headers = {}
+    if cached is not None:
+        if cached['etag']:
+            headers['If-None-Match'] = cached['etag']
+        if cached['last_modified']:
+            headers['If-Modified-Since'] = cached['last_modified']
+
+    with get_session().get(url, headers=headers, stream=True) as r:
+        if r.status_code == 304 and cached is not None:
+            _touch(url)
+            return CacheEntry(url, _object_path(cached['sha256']), cached['sha256'], cached['size'], 'not_modified')
+
+        r.raise_for_status()
+        sha256, size = _store_body(r)
+        etag = r.headers.get('ETag')
+        last_modified = r.headers.get('Last-Modified')
+
+    with _lock:
+        db = _connect()
+        db.execute("""INSERT OR REPLACE INTO entries (url, sha256, size, etag, last_modified, last_access)
+                      VALUES (?, ?, ?, ?, ?, ?)""", (url, sha256, size, etag, last_modified, time.time()))
+        db.commit()
+
+    _evict(url)
+
+    return CacheEntry(url, _object_path(sha256), sha256, size, 'downloaded')
+
+def open_cached(url, encoding=None):
+    """Returns the cached copy of url like fetch, along with the body
+    opened for reading. The body is opened while holding the index lock,
+    so another thread can't evict it first. If it was evicted between
+    fetching and opening, it is fetched again. The caller closes the file.
+
+    Parameters
+    ----------
+    url : str
+    encoding : str
+        Opens the body as text with this encoding instead of as bytes
+
+    Returns
+    -------
+    entry : CacheEntry
+    body : file object
+    """
+    for attempt in range(2):
+        entry = fetch(url)
+        with _lock:
+            try:
+                if encoding is None:
+                    return entry, open(entry.path, 'rb')
+                return entry, open(entry.path, 'r', encoding=encoding)
+            except FileNotFoundError:
+                if attempt == 1:
+                    raise
+
+def read_bytes(url):
+    """Returns the contents of the cached copy of url as bytes.
+
+    Parameters
+    ----------
+    url : str
+
+    Returns
+    -------
+    data : bytes
+    """
+    entry, body = open_cached(url)
+    with body:
+        return body.read()
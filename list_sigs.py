@@ -3,18 +3,18 @@
 
 def get_sig_list():
 
-    from common_functions import process_sig_yaml
+    from sigs_model import SigsModel
 
-    sigs_wgs = process_sig_yaml()
+    sigs_wgs = SigsModel.load()
 
     print('SIGs:')
 
-    for k in sigs_wgs["sigs"]:
+    for k in sigs_wgs.sigs():
         print(' * ', k['name'])
     
     print('\nWGs:')
 
-    for k in sigs_wgs["workinggroups"]:
+    for k in sigs_wgs.workinggroups():
         print(' * ', k['name'])
 
 get_sig_list()
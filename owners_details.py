@@ -9,108 +9,496 @@ Uses the owners files found in sigs.yaml plus the OWNERS_ALIASES file containing
 You can also provide as a command line argument, the full path to an 
 additional list of owners files to use that you can generate using
 get_more_owners.py.
+Aliases listed in OWNERS files are expanded to the people they contain
+using the OWNERS_ALIASES file at the root of each repo.
+The affiliation data, sigs.yaml, the OWNERS_ALIASES files and the OWNERS
+files are all downloaded concurrently, and rows are written in the same
+order as before once the affiliation data is ready.
+Each new dataset is also added to the snapshot store in
+output/snapshots.sqlite (see snapshot_store.py).
 
 Parameters
 ----------
 new_owners_file : str
     Full path to a file containing a list of owners files
+--workers : int
+    Number of OWNERS files downloaded in parallel (default 8)
+--cache-only
+    Only use files already in the local download cache
+--incremental
+    Reuse the OWNERS files that haven't changed since the previous run.
+    Files from the additional list that get_more_owners.py listed with
+    their git blob sha aren't requested at all when the sha is the same.
+    Other files are revalidated through the download cache and only
+    parsed when they changed.
+--resume
+    Continue an interrupted run using the journal of finished OWNERS files
+--format : str
+    Also write the dataset as a parquet or arrow file next to the csv file
+--parse-processes : int
+    Parse the OWNERS files in this many processes instead of in the
+    download threads (default 0). Parsing takes about 0.2 ms per file with
+    libyaml, so this only helps on machines with several cores when the
+    files are already in the download cache.
 """
     
-def write_aliases(role, alias_url, csv_file, affil_dict):
+# OWNERS_ALIASES files with SIG/WG leads and with k/k owners by area
+KK_ALIASES_URL = 'https://raw.githubusercontent.com/kubernetes/kubernetes/master/OWNERS_ALIASES'
+LEADS_ALIASES_URL = 'https://raw.githubusercontent.com/kubernetes/community/master/OWNERS_ALIASES'
+
+# Put on the results queue once the affiliation index has been loaded
+AFFILIATIONS_READY = 'affiliations ready'
+
+# Most OWNERS files sent to a parse process at once. Sending a chunk to a
+# process costs about as much as parsing one file (~0.25 ms), so chunks of
+# 64 keep that overhead to a few percent while still giving dozens of
+# chunks to spread across the processes for a few thousand files.
+PARSE_CHUNK_SIZE = 64
+
+def load_aliases(alias_url):
+    """Downloads and parses an OWNERS_ALIASES file. Safe to call from
+    worker threads.
+    """
+    from common_functions import download_file, load_yaml
+
+    return load_yaml(download_file(alias_url))
+
+def lead_members(role, alias_url, aliases):
     """
     Takes OWNERS_ALIASES file with details about SIG/WG leadership and
-    writes those details to the csv file with role of 'lead' and NA
-    for subproject.
-     """
-    import yaml
-    from common_functions import download_file, write_affil_line
-
-    alias_file = download_file(alias_url)
-    aliases = yaml.safe_load(alias_file)
-    
+    returns those details with role of 'lead' and NA for subproject.
+
+    Returns
+    -------
+    members : list
+        (username, role, sig_name, subproject, owners_url) tuples
+    """
+    members = []
+
     # Filter out anything that isn't a SIG/WG (committees, etc.)
     for x in aliases['aliases'].items():
         if x[0].startswith('sig') or x[0].startswith('wg'):
             sig_or_wg = x[0][:-6] #Note: this strips the -leads from the end of the sig name
             for username in x[1]:
-                write_affil_line(username, role, sig_or_wg, 'NA', alias_url, csv_file, affil_dict)
+                members.append((username, role, sig_or_wg, 'NA', alias_url))
 
-def get_sig_list(sigs):
+    return members
 
-    # Gets the list of SIGs from sigs.yaml using the dir format sig-name
+def kk_members(sig_index, k_k_aliases):
 
-    import yaml
-    
-    sig_name_list = []
-    
-    for k in sigs["sigs"]:
-        sig_name_list.append(k['dir'])
-        
-    return sig_name_list
-
-def find_sig(sig_name_list, area):
-    
-    # Uses the sig-name formatted data from sigs.yaml and compares to data from OWNERS_ALIASES 
-    # to determine the SIG name
-
-    sig_name = 'NA'
-    for name in sig_name_list:
-        if area.startswith(name):
-            sig_name = area[:len(name)]
-            
-    return sig_name
-
-def kk_aliases(sigs, csv_file, affil_dict):
-
-    # Reads OWNERS_ALIASES file from k/k and uses the find_sig function to split the
+    # Reads the OWNERS_ALIASES file from k/k and uses parse_alias_name to split the
     # area into SIG, subproject, and role for things that are mostly, but not always,
     # formatted like sig-name-subproject-role. Example: sig-auth-audit-approvers
-    # Then it grabs org affiliation and other data before saving it to the CSV file.
-
-    import yaml
-    from common_functions import download_file, write_affil_line
+    # Returns (username, role, sig_name, subproject, owners_url) tuples
 
-    sig_name_list = get_sig_list(sigs)
+    from common_functions import parse_alias_name
 
-    owners_url = 'https://raw.githubusercontent.com/kubernetes/kubernetes/master/OWNERS_ALIASES'
-    k_k_alias_file = download_file(owners_url)
-    k_k_aliases = yaml.safe_load(k_k_alias_file)
+    members = []
 
     for x in k_k_aliases.items():
         for y in x[1].items():
             area = y[0]
 
-            if area.endswith('approvers'):
-                role = 'approver'
-                role_len = 9
-            elif area.endswith('reviewers'):
-                role = 'reviewer'
-                role_len = 9
-            elif area.endswith('maintainer'):
-                role = 'maintainer'
-                role_len = 10
-            elif area.endswith('maintainers'):
-                role = 'maintainer'
-                role_len = 11
-            else:
-                role = 'unknown'
-                role_len = 0
-
-            sig_name = find_sig(sig_name_list, area)
+            sig_name, subproject, role = parse_alias_name(sig_index, area)
 
             if area.startswith('release-engineering'):
                 sig_name = 'sig-release'
                 subproject = 'release-engineering'
-            else:
-                subproject = area[len(sig_name)+1:-role_len-1]
 
-            if subproject == '':
-                subproject = 'NA'
-
-            if 'NA' not in sig_name:
+            if sig_name != 'NA':
                 for username in y[1]:
-                    write_affil_line(username, role, sig_name, subproject, owners_url, csv_file, affil_dict)
- 
+                    members.append((username, role, sig_name, subproject, KK_ALIASES_URL))
+
+    return members
+
+def list_owners_jobs(sigs, new_owners_file=None):
+    """Lists the OWNERS files from sigs.yaml followed by the ones from the
+    optional additional list that weren't already included. Files from
+    the list that are also in sigs.yaml are kept as retries, which are
+    only used when the file couldn't be read for sigs.yaml.
+
+    Parameters
+    ----------
+    sigs : SigsModel
+    new_owners_file : str
+        Full path to a file containing a list of owners files, or None
+
+    Returns
+    -------
+    owners_jobs : list
+        List of (owners_url, sig_name, subproject) tuples
+    retries : set
+        Positions in owners_jobs of the retries
+    blob_shas : dict
+        Git blob sha of each file from the second column of the list, when
+        get_more_owners.py listed it
+    """
+    import csv
+
+    # Gather data for each SIG in sigs.yaml
+    # NOTE: WGs don't have OWNERS files in sigs.yaml
+    owners_jobs = []
+    for x in sigs.subprojects():
+        for owners_url in x.owners:
+            owners_jobs.append((owners_url, x.sig_dir, x.name))
+
+    # Gather data from an additional list of OWNERS files if available
+    retries = set()
+    blob_shas = {}
+    if new_owners_file is not None:
+        # Urls of the files already included, used to avoid
+        # re-reading files again when an additional list is provided
+        files_done = {KK_ALIASES_URL, LEADS_ALIASES_URL}
+        sigs_urls = {job[0] for job in owners_jobs}
+
+        # Open csv with new list of owners files
+        with open(new_owners_file, newline='') as f:
+            new_owners_list = list(csv.reader(f))
+
+        for owners_url_list in new_owners_list:
+            owners_url = owners_url_list[0]
+            if len(owners_url_list) > 1 and owners_url_list[1]:
+                blob_shas.setdefault(owners_url, owners_url_list[1])
+            # Only process owners files that weren't done in one of the above steps
+            if owners_url not in files_done:
+                if owners_url in sigs_urls:
+                    retries.add(len(owners_jobs))
+                owners_jobs.append((owners_url, 'NA', 'NA'))
+                files_done.add(owners_url)
+
+    return owners_jobs, retries, blob_shas
+
+def read_args():
+    """Reads the optional list of additional owners files and the number
+    of download workers from the command line.
+
+    Parameters
+    ----------
+    None
+
+    Returns
+    -------
+    args : argparse.Namespace
+        new_owners_file is None when no additional owners file was given
+    """
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Build a csv file with details about Kubernetes owners.')
+    parser.add_argument('new_owners_file', nargs='?', default=None, help='Full path to a file containing a list of owners files')
+    parser.add_argument('--workers', type=int, default=8, help='Number of OWNERS files downloaded in parallel')
+    parser.add_argument('--cache-only', action='store_true', help='Only use files already in the local download cache')
+    parser.add_argument('--incremental', action='store_true', help='Reuse OWNERS files that have not changed since the previous run')
+    parser.add_argument('--resume', action='store_true', help='Continue an interrupted run using the journal of finished OWNERS files')
+    parser.add_argument('--format', choices=['parquet', 'arrow'], default=None, help='Also write the dataset as a columnar file')
+    parser.add_argument('--parse-processes', type=int, default=0, help='Parse the OWNERS files in this many processes instead of in the download threads')
+
+    return parser.parse_args()
+
+def owners_state_path():
+    """Returns the path of the file that stores the content hash and
+    parsed contents of each OWNERS file from the previous run.
+    """
+    from os.path import join
+    from http_cache import cache_dir
+
+    return join(cache_dir(), 'owners_state.json')
+
+def load_owners_state():
+    """Loads the OWNERS file state saved by the previous run.
+
+    Returns
+    -------
+    state : dict
+        Maps each OWNERS url to a dict with 'sha256', 'blob' and 'owners'.
+        Empty if there was no previous run.
+    """
+    import json
+
+    try:
+        with open(owners_state_path(), 'r') as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        state = {}
+
+    return state
+
+def save_owners_state(state):
+    """Saves the OWNERS file state from this run for the next
+    incremental run.
+
+    Parameters
+    ----------
+    state : dict
+    """
+    import os
+    import json
+
+    state_path = owners_state_path()
+    tmp_path = state_path + '.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(state, f)
+    os.replace(tmp_path, state_path)
+
+def journal_key(owners_url, sig_name, subproject):
+    """Returns the key of an OWNERS file job in the run journal. The same
+    file can be listed for more than one subproject in sigs.yaml.
+    """
+    return owners_url + ' ' + sig_name + ' ' + subproject
+
+async def owners_pipeline(args, csv_file, previous_state, new_state, journal, journaled):
+    """Builds the dataset as a pipeline of concurrent stages. The
+    affiliation index, sigs.yaml and both OWNERS_ALIASES files are
+    downloaded at the same time, and the OWNERS files start downloading
+    as soon as sigs.yaml is read. Fetched files flow through bounded
+    queues to a single writer that puts them back in order and labels
+    them with affiliations once the index is ready, so the csv file is
+    the same as a serial run.
+
+    Downloads run in worker threads over the shared download cache. With
+    --parse-processes, the raw files are parsed in chunks by a pool of
+    processes instead, so parsing isn't limited to one core. If the
+    processes stop, the rest of the files are parsed in the threads.
+    Files that couldn't be parsed are reported apart from the ones that
+    couldn't be downloaded.
+
+    Parameters
+    ----------
+    args : argparse.Namespace
+        from read_args
+    csv_file : DatasetWriter
+    previous_state : dict
+        State from the previous run used to reuse unchanged files,
+        or None to parse every file
+    new_state : dict
+        The content hash and parsed contents of each file are added to it
+    journal : Journal
+        Each finished file is recorded with the rows written for it
+    journaled : dict
+        Journal records from an interrupted run keyed by journal_key
+    """
+    import asyncio
+    import time
+    import multiprocessing
+    from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+    from concurrent.futures.process import BrokenProcessPool
+    from common_functions import read_cncf_affiliations, build_sig_index, fetch_owners_entry, fetch_owners_raw, parse_owners_chunk, owners_from_tuple, affil_row, owners_affil_rows, print_fetch_summary
+    from sigs_model import SigsModel
+
+    workers = args.workers
+    loop = asyncio.get_running_loop()
+
+    # Bounded, so downloads wait for the writer instead of piling up
+    jobs = asyncio.Queue(maxsize=workers * 2)
+    results = asyncio.Queue(maxsize=workers * 4)
+    parsing = asyncio.Queue(maxsize=PARSE_CHUNK_SIZE * 2)
+
+    # Room for every download stage to run at once. Passed explicitly
+    # instead of replacing the event loop's default executor, and shut
+    # down when the pipeline ends.
+    threads = ThreadPoolExecutor(max_workers=workers + 4)
+
+    # Spawned, since the download threads may already be running when the
+    # first chunk is sent
+    parse_pool = None
+    if args.parse_processes > 0:
+        parse_pool = ProcessPoolExecutor(max_workers=args.parse_processes, mp_context=multiprocessing.get_context('spawn'))
+
+    def in_thread(func, *func_args):
+        return loop.run_in_executor(threads, func, *func_args)
+
+    try:
+        async def load_affiliations():
+            try:
+                return await in_thread(read_cncf_affiliations)
+            finally:
+                # Also wakes the writer when the download failed, which stops
+                # the run with a clear error
+                await results.put(AFFILIATIONS_READY)
+
+        # Independent downloads start right away
+        affil_task = asyncio.create_task(load_affiliations())
+        kk_task = in_thread(load_aliases, KK_ALIASES_URL)
+        leads_task = in_thread(load_aliases, LEADS_ALIASES_URL)
+        sigs = await in_thread(SigsModel.load)
+
+        # Prefix trie of the SIG names used to classify aliases
+        sig_index = build_sig_index(sigs.sig_dirs())
+        owners_jobs, retries, blob_shas = await in_thread(list_owners_jobs, sigs, args.new_owners_file)
+
+        # Urls that were read, so their retries can be skipped
+        fetched_urls = set()
+        # Set when the first OWNERS file starts downloading, so the rate in
+        # the summary doesn't include loading sigs.yaml
+        start = None
+
+        # The k/k aliases come first in the csv, then the SIG/WG leads, then
+        # the OWNERS files
+        total = len(owners_jobs) + 2
+
+        async def alias_stage():
+            await results.put((0, 'aliases', kk_members(sig_index, await kk_task)))
+            await results.put((1, 'aliases', lead_members('lead', LEADS_ALIASES_URL, await leads_task)))
+
+        async def job_stage():
+            for index, job in enumerate(owners_jobs, 2):
+                key = journal_key(*job)
+                if key in journaled:
+                    fetched_urls.add(job[0])
+                    await results.put((index, 'journaled', job, journaled[key]))
+                else:
+                    await jobs.put((index, job))
+            for _ in range(workers):
+                await jobs.put(None)
+
+        async def fetch_stage():
+            nonlocal start
+            while True:
+                item = await jobs.get()
+                if item is None:
+                    return
+                index, job = item
+                if index - 2 in retries and job[0] in fetched_urls:
+                    await results.put((index, 'skipped', job))
+                    continue
+
+                if start is None:
+                    start = time.time()
+
+                if parse_pool is None:
+                    sha256, blob_sha, owners, reused = await in_thread(fetch_owners_entry, job[0], previous_state, blob_shas.get(job[0]))
+                    if owners is not None:
+                        fetched_urls.add(job[0])
+                    await results.put((index, 'owners', job, sha256, blob_sha, owners, reused))
+                    continue
+
+                sha256, blob_sha, data, owners = await in_thread(fetch_owners_raw, job[0], previous_state, blob_shas.get(job[0]))
+                if owners is not None:
+                    fetched_urls.add(job[0])
+                if data is None:
+                    await results.put((index, 'owners', job, sha256, blob_sha, owners, owners is not None))
+                else:
+                    await parsing.put((index, job, sha256, blob_sha, data))
+
+        async def fetch_all():
+            await asyncio.gather(*[fetch_stage() for _ in range(workers)])
+            await parsing.put(None)
+
+        # Set when the parse processes died, so the rest of the files are
+        # parsed in the download threads instead
+        pool_broken = False
+
+        async def parse_chunk(chunk, slots):
+            nonlocal pool_broken
+            data = [x[4] for x in chunk]
+            parsed = None
+            try:
+                if not pool_broken:
+                    try:
+                        parsed = await loop.run_in_executor(parse_pool, parse_owners_chunk, data)
+                    except BrokenProcessPool as e:
+                        if not pool_broken:
+                            pool_broken = True
+                            print("The parse processes stopped (" + repr(e) + "), parsing the rest of the OWNERS files in the download threads")
+                if parsed is None:
+                    parsed = await in_thread(parse_owners_chunk, data)
+            finally:
+                slots.release()
+            for (index, job, sha256, blob_sha, data), packed in zip(chunk, parsed):
+                owners = None if packed is None else owners_from_tuple(packed)
+                if owners is not None:
+                    fetched_urls.add(job[0])
+                await results.put((index, 'owners', job, sha256, blob_sha, owners, False))
+
+        async def parse_stage():
+            # Two chunks per process keeps every process busy
+            slots = asyncio.Semaphore(max(args.parse_processes, 1) * 2)
+            tasks = []
+            finished = False
+            while not finished:
+                # Whatever is waiting goes in the next chunk, up to its size
+                chunk = [await parsing.get()]
+                while chunk[-1] is not None and len(chunk) < PARSE_CHUNK_SIZE and not parsing.empty():
+                    chunk.append(parsing.get_nowait())
+                finished = chunk[-1] is None
+                chunk = [x for x in chunk if x is not None]
+                if chunk:
+                    await slots.acquire()
+                    tasks.append(asyncio.create_task(parse_chunk(chunk, slots)))
+            await asyncio.gather(*tasks)
+
+        async def write_stage():
+            # Reorder buffer of results that arrived ahead of the next one to
+            # write, or before the affiliation index was ready
+            pending = {}
+            next_index = 0
+            affil_dict = None
+            fetched = 0
+            reused_count = 0
+            # Map the url of each file that couldn't be downloaded, or was
+            # downloaded but couldn't be parsed, to its SIG
+            failed = {}
+            parse_failed = {}
+            written_urls = set()
+
+            while next_index < total:
+                item = await results.get()
+                if item == AFFILIATIONS_READY:
+                    if affil_task.exception() is not None:
+                        raise RuntimeError("Cannot load the CNCF affiliation data, so the owners can't be labeled: " + repr(affil_task.exception())) from affil_task.exception()
+                    affil_dict = affil_task.result()
+                else:
+                    pending[item[0]] = item[1:]
+
+                while affil_dict is not None and next_index in pending:
+                    index = next_index
+                    next_index += 1
+                    kind, *details = pending.pop(index)
+
+                    if kind == 'aliases':
+                        rows = [affil_row(*member, affil_dict) for member in details[0]]
+                        csv_file.write_rows([row for row in rows if row is not None])
+                        continue
+
+                    (owners_url, sig_name, subproject) = job = details[0]
+                    if kind == 'skipped' or (index - 2 in retries and owners_url in written_urls):
+                        continue
+
+                    if kind == 'journaled':
+                        record = details[1]
+                        written_urls.add(owners_url)
+                        new_state[owners_url] = {'sha256': record['sha256'], 'blob': record.get('blob'), 'owners': record['owners']}
+                        csv_file.write_rows(record['rows'])
+                        continue
+
+                    sha256, blob_sha, owners, reused = details[1:]
+                    fetched += 1
+                    reused_count += reused
+                    if owners is None:
+                        # Not journaled, so a resumed run tries the file again.
+                        # Only downloaded files have a content hash.
+                        if sha256 is None:
+                            failed.setdefault(owners_url, sig_name)
+                        else:
+                            parse_failed.setdefault(owners_url, sig_name)
+                    else:
+                        written_urls.add(owners_url)
+                        failed.pop(owners_url, None)
+                        parse_failed.pop(owners_url, None)
+                        new_state[owners_url] = {'sha256': sha256, 'blob': blob_sha, 'owners': owners}
+                        rows = owners_affil_rows(owners, owners_url, sig_name, subproject, affil_dict, sig_index)
+                        csv_file.write_rows(rows)
+                        journal.append({'key': journal_key(*job), 'sha256': sha256, 'blob': blob_sha, 'owners': owners, 'rows': rows})
+
+            elapsed = time.time() - start if start is not None else 0
+            print_fetch_summary(fetched, elapsed, workers, [(sig_name, owners_url) for owners_url, sig_name in failed.items()], reused_count if previous_state is not None else None,
+                                [(sig_name, owners_url) for owners_url, sig_name in parse_failed.items()])
+
+        await asyncio.gather(alias_stage(), job_stage(), write_stage(), fetch_all(), parse_stage())
+    finally:
+        threads.shutdown(cancel_futures=True)
+        if parse_pool is not None:
+            parse_pool.shutdown(cancel_futures=True)
+
 def build_owners_csv():
     """This is the primary function that pulls all of this together.
         It gets the list of OWNERS files from sigs.yaml, downloads the 
@@ -121,80 +509,52 @@ def build_owners_csv():
         containing the full path to a file with additional owners files
     
     """
-    import yaml
-    import sys
-    import csv
+    import asyncio
     from datetime import datetime
-    from common_functions import download_file, read_owners_file, files_done
-    from common_functions import read_cncf_affiliations
+    from http_cache import set_cache_only
+    from checkpoint import Journal, read_journal
+    from dataset_io import DatasetWriter, OWNERS_COLUMNS, preamble
+    from snapshot_store import append_snapshot
 
-    # read additional owners file from command line if available
-    try:
-        new_owners_file = str(sys.argv[1])
-        additional_owners = True
-    except:
-        additional_owners = False
+    args = read_args()
 
-    affil_dict = read_cncf_affiliations()
+    if args.cache_only:
+        set_cache_only(True)
 
-    sig_file = download_file('https://raw.githubusercontent.com/kubernetes/community/master/sigs.yaml')    
-    sigs = yaml.safe_load(sig_file)
-   
     # Open the CSV file for writing and write the license and header lines
     today = datetime.today().strftime('%Y-%m-%d')
     outfile_name = 'output/owners_data_' + today + '.csv'
-    csv_file = open(outfile_name,'w')
+    csv_file = DatasetWriter(outfile_name, OWNERS_COLUMNS, preamble("Updated on April 18 2022"), args.format)
+
+    # Content hash, git blob sha and parsed contents of each OWNERS file.
+    # Files that are unchanged since the previous run are reused in
+    # incremental mode.
+    # Entries for files that aren't part of this run are kept for later runs.
+    saved_state = load_owners_state()
+    previous_state = saved_state if args.incremental else None
+    new_state = dict(saved_state)
+
+    # Each finished OWNERS file is journaled with its csv lines. A resumed
+    # run rewrites the csv from the journal and only fetches the rest.
+    journal_path = 'output/owners_data.journal'
+    journaled = {}
+    if args.resume:
+        journaled = {record['key']: record for record in read_journal(journal_path)}
+        print("Resuming with", len(journaled), "OWNERS files from the journal")
+    journal = Journal(journal_path, resume=args.resume)
+
+    asyncio.run(owners_pipeline(args, csv_file, previous_state, new_state, journal, journaled))
 
-    csv_file.write("License: Creative Commons Attribution-ShareAlike 4.0 International License\n")
-    csv_file.write("License Link: http://creativecommons.org/licenses/by-sa/4.0/\n")
-    csv_file.write("Author: Dr. Dawn M. Foster\n")
-    csv_file.write("Status: Updated on April 18 2022\n")
-    csv_file.write("Source URL: https://github.com/geekygirldawn/k8s_data/datasets\n\n")
-
-    csv_file.write("company,username,status,sig_name,subproject,owners_file\n")
-    
-    kk_aliases(sigs, csv_file, affil_dict)
- 
-    # Get list of SIG / WG leads and add them to the csv file
-    alias_url = 'https://raw.githubusercontent.com/kubernetes/community/master/OWNERS_ALIASES'
-    write_aliases('lead', alias_url, csv_file, affil_dict)
-
-    # Gather data for each SIG in sigs.yaml
-    # NOTE: WGs don't have OWNERS files in sigs.yaml
-    for x in sigs['sigs']:
-
-        sig_name = x['dir']
-        for y in x['subprojects']:
-            for owners_url in y['owners']:
-                subproject = y['name']
-    
-                read_owners_file(owners_url, sig_name, subproject, csv_file, affil_dict)
     csv_file.close()
 
-    # Gather data from an additional list of OWNERS files if available
-
-    if additional_owners == True:
-        # Open output csv from earlier for reading and close it again before writing to it
-        csv_file = open(outfile_name,'r')
-        files_doneDF = files_done(csv_file)
-        csv_file.close()
+    # Keep the history of datasets in the local snapshot store
+    append_snapshot(outfile_name)
 
-        # Open csv with new list of owners files
-        with open(new_owners_file, newline='') as f:
-            new_owners_list = list(csv.reader(f))
+    save_owners_state(new_state)
 
-        #re-open original output file to append data from new owners files
-        csv_file = open(outfile_name,'a')
+    # The run finished, so there is nothing left to resume
+    journal.remove()
 
-        for owners_url_list in new_owners_list:
-            owners_url = owners_url_list[0]
-            # Only process owners files that weren't done in one of the above steps
-            if files_doneDF['owners_file'].str.contains(owners_url).any() == False:
-                sig_name = 'NA'
-                subproject = 'NA'
-                read_owners_file(owners_url, sig_name, subproject, csv_file, affil_dict)
-        
-        csv_file.close()
-    
-build_owners_csv()
-        
+# The parse processes import this file, so the run has to be guarded
+if __name__ == '__main__':
+    build_owners_csv()
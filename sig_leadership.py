@@ -3,27 +3,16 @@
 
 def get_sig_leaders():
 
-    from common_functions import process_sig_yaml, create_file
+    from common_functions import create_file
+    from sigs_model import SigsModel
 
-    sigs_wgs = process_sig_yaml()
+    sigs_wgs = SigsModel.load()
 
     output_list = ['group,name,github_id,company\n']
     
-    for k in sigs_wgs["sigs"]:
-        group = 'SIG ' + k['name']
-        leadership_list = k['leadership']['chairs']
-
-        for leader in leadership_list:
-            line = group + ',' + leader['name'] + ',' + leader['github'] + ',' + leader['company'] + '\n'
-            output_list.append(line)
-
-    for k in sigs_wgs["workinggroups"]:
-        group = 'WG ' + k['name']
-        leadership_list = k['leadership']['chairs']
-
-        for leader in leadership_list:
-            line = group + ',' + leader['name'] + ',' + leader['github'] + ',' + leader['company'] + '\n'
-            output_list.append(line)
+    for leader in sigs_wgs.leadership():
+        line = leader.group + ',' + leader.name + ',' + leader.github + ',' + leader.company + '\n'
+        output_list.append(line)
 
     # prepare output file and write header and list to csv
     try:
@@ -3,27 +3,15 @@
 
 def get_sig_meetings():
 
-    from common_functions import process_sig_yaml
+    from sigs_model import SigsModel
 
-    sigs_wgs = process_sig_yaml()
+    sigs_wgs = SigsModel.load()
 
-    for k in sigs_wgs["sigs"]:
-        print('\nSIG ', k['name'], ':', sep='')
+    for group, meetings in sigs_wgs.meetings():
+        print('\n', group, ':', sep='')
 
-        for x in k['meetings']:
-            print(x['description'], x['day'], x['time'], x['tz'], x['frequency'])
-
-        for y in k['subprojects']:
-            try:
-                for z in y['meetings']:
-                    print(z['description'], z['day'], z['time'], z['tz'], z['frequency'])
-            except:
-                pass
-    for k in sigs_wgs["workinggroups"]:
-        print('\nWG ', k['name'], ':', sep='')
-
-        for x in k['meetings']:
-            print(x['description'], x['day'], x['time'], x['tz'], x['frequency'])
+        for x in meetings:
+            print(x.description, x.day, x.time, x.tz, x.frequency)
 
 
 get_sig_meetings()
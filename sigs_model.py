@@ -0,0 +1,139 @@
+# Copyright (C) 2026 Dawn M. Foster
+# Licensed under GNU General Public License (GPL), version 3 or later: http://www.gnu.org/licenses/gpl.txt
+
+"""
+Shared model of the Kubernetes community sigs.yaml file.
+
+The file is downloaded through the local download cache and parsed once
+with the libyaml loader when it is available. The parsed data is saved as
+a pickle snapshot named after the content hash of the file, so scripts
+that run back to back only revalidate the download and load the snapshot
+instead of parsing the yaml again.
+"""
+
+from collections import namedtuple
+
+SIGS_URL = 'https://raw.githubusercontent.com/kubernetes/community/master/sigs.yaml'
+
+Leader = namedtuple('Leader', ['group', 'name', 'github', 'company'])
+Meeting = namedtuple('Meeting', ['group', 'description', 'day', 'time', 'tz', 'frequency'])
+Subproject = namedtuple('Subproject', ['sig_dir', 'name', 'owners'])
+
+# Models already loaded by this process, keyed by content hash
+_models = {}
+
+class SigsModel:
+    """Parsed sigs.yaml with accessors for the parts used by the scripts.
+
+    Parameters
+    ----------
+    data : dict
+        The parsed contents of sigs.yaml
+    """
+
+    def __init__(self, data):
+        self.data = data
+
+    @classmethod
+    def load(cls, url=SIGS_URL):
+        """Returns the model for the current sigs.yaml, reusing the pickle
+        snapshot from an earlier run when the file hasn't changed.
+
+        Parameters
+        ----------
+        url : str
+
+        Returns
+        -------
+        model : SigsModel
+        """
+        import os
+        import pickle
+        from os.path import join
+        from http_cache import open_cached, cache_dir
+        from common_functions import load_yaml
+
+        entry, sig_file = open_cached(url)
+        with sig_file:
+            if entry.sha256 in _models:
+                return _models[entry.sha256]
+
+            snapshot_path = join(cache_dir(), 'sigs_' + entry.sha256 + '.pickle')
+            try:
+                with open(snapshot_path, 'rb') as snapshot:
+                    data = pickle.load(snapshot)
+            except (OSError, pickle.UnpicklingError, EOFError):
+                data = load_yaml(sig_file)
+                tmp_path = snapshot_path + '.tmp'
+                with open(tmp_path, 'wb') as snapshot:
+                    pickle.dump(data, snapshot, protocol=pickle.HIGHEST_PROTOCOL)
+                os.replace(tmp_path, snapshot_path)
+
+        model = cls(data)
+        _models[entry.sha256] = model
+
+        return model
+
+    def sigs(self):
+        """Returns the list of SIG entries."""
+
+        return self.data.get('sigs') or []
+
+    def workinggroups(self):
+        """Returns the list of WG entries."""
+
+        return self.data.get('workinggroups') or []
+
+    def sig_dirs(self):
+        """Returns the SIG names in the dir format sig-name."""
+
+        return [k['dir'] for k in self.sigs()]
+
+    def subprojects(self):
+        """Returns every SIG subproject with the urls of its OWNERS files.
+
+        Returns
+        -------
+        subprojects : list of Subproject
+        """
+        subprojects = []
+        for k in self.sigs():
+            for y in k.get('subprojects') or []:
+                subprojects.append(Subproject(k['dir'], y['name'], y.get('owners') or []))
+
+        return subprojects
+
+    def leadership(self):
+        """Returns the chairs of every SIG followed by every WG.
+
+        Returns
+        -------
+        leaders : list of Leader
+        """
+        leaders = []
+        for prefix, groups in (('SIG ', self.sigs()), ('WG ', self.workinggroups())):
+            for k in groups:
+                group = prefix + k['name']
+                for leader in k['leadership']['chairs']:
+                    leaders.append(Leader(group, leader['name'], leader['github'], leader['company']))
+
+        return leaders
+
+    def meetings(self):
+        """Returns the meetings of every SIG and WG, including subproject
+        meetings, grouped by SIG or WG.
+
+        Returns
+        -------
+        meetings : list of (group, list of Meeting) tuples
+        """
+        meetings = []
+        for prefix, groups in (('SIG ', self.sigs()), ('WG ', self.workinggroups())):
+            for k in groups:
+                group = prefix + k['name']
+                group_meetings = list(k.get('meetings') or [])
+                for y in k.get('subprojects') or []:
+                    group_meetings.extend(y.get('meetings') or [])
+                meetings.append((group, [Meeting(group, x['description'], x['day'], x['time'], x['tz'], x['frequency']) for x in group_meetings]))
+
+        return meetings
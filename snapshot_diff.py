@@ -0,0 +1,231 @@
+#!/usr/local/bin/python3
+
+# Copyright (C) 2026 Dawn M. Foster
+# Licensed under GNU General Public License (GPL), version 3 or later: http://www.gnu.org/licenses/gpl.txt
+
+"""
+Compares owners or Istio dataset snapshots to find who was added to or
+removed from a role and whose affiliation changed, along with how many
+seats each company and each SIG (or Istio team) gained or lost.
+
+Rows are matched on (username, status, sig_name, subproject, owners_file)
+for owners datasets and on (username, team) for Istio datasets. Company
+names on both sides are normalized with company_aliases.yaml first, so
+older snapshots with raw names don't show up as affiliation changes. Each
+comparison is a single pass over the newer snapshot using a hash table of
+the older one. When more than two files are given, each file is compared
+with the one before it.
+
+For each comparison, three csv files are written to the output directory:
+snapshot_diff_OLD_NEW_rows.csv, snapshot_diff_OLD_NEW_companies.csv and
+snapshot_diff_OLD_NEW_groups.csv
+
+Parameters
+----------
+paths : str
+    Two or more dataset files (csv, parquet or arrow), oldest first
+"""
+
+from collections import namedtuple
+
+# Key and group columns for each kind of dataset
+KEY_COLUMNS = {'owners': ['username', 'status', 'sig_name', 'subproject', 'owners_file'],
+               'istio': ['username', 'team']}
+GROUP_COLUMNS = {'owners': 'sig_name', 'istio': 'team'}
+
+SnapshotDiff = namedtuple('SnapshotDiff', ['kind', 'added', 'removed', 'changed', 'companies', 'groups'])
+
+def dataset_kind(df):
+    """Returns 'owners' or 'istio' for a dataset dataframe."""
+    from snapshot_store import KIND_COLUMNS
+
+    for kind, columns in KIND_COLUMNS.items():
+        if list(df.columns) == columns:
+            return kind
+    raise ValueError("Unknown dataset columns: " + ",".join(df.columns))
+
+def snapshot_seats(df, kind):
+    """Returns the company for each seat in a snapshot. Company names are
+    normalized with company_aliases.yaml, so snapshots written before the
+    names were normalized compare equal to newer ones.
+
+    Parameters
+    ----------
+    df : dataframe
+        From dataset_io.read_dataset
+    kind : str
+
+    Returns
+    -------
+    seats : dict
+        Maps each key tuple to the company
+    """
+    from company_names import get_company_normalizer
+
+    keys = zip(*[df[column].astype(str) for column in KEY_COLUMNS[kind]])
+    companies = get_company_normalizer().normalize_series(df['company'].astype(str))
+
+    return dict(zip(keys, companies))
+
+def diff_seats(old, new, kind):
+    """Compares the seats of two snapshots.
+
+    Parameters
+    ----------
+    old : dict
+        From snapshot_seats
+    new : dict
+    kind : str
+
+    Returns
+    -------
+    diff : SnapshotDiff
+        added and removed are lists of (key, company) tuples, changed is
+        a list of (key, old_company, new_company) tuples, and companies
+        and groups map each company or group to [added, removed]
+    """
+    from collections import defaultdict
+
+    group = KEY_COLUMNS[kind].index(GROUP_COLUMNS[kind])
+    remaining = dict(old)
+    added = []
+    changed = []
+    companies = defaultdict(lambda: [0, 0])
+    groups = defaultdict(lambda: [0, 0])
+
+    for key, company in new.items():
+        old_company = remaining.pop(key, None)
+        if old_company is None:
+            added.append((key, company))
+            companies[company][0] += 1
+            groups[key[group]][0] += 1
+        elif old_company != company:
+            changed.append((key, old_company, company))
+            # The seat moves from one company to the other
+            companies[company][0] += 1
+            companies[old_company][1] += 1
+
+    removed = list(remaining.items())
+    for key, company in removed:
+        companies[company][1] += 1
+        groups[key[group]][1] += 1
+
+    return SnapshotDiff(kind, added, removed, changed, dict(companies), dict(groups))
+
+def delta_df(counts, column):
+    """Builds a dataframe of added, removed and net seats sorted by the
+    largest changes first.
+
+    Parameters
+    ----------
+    counts : dict
+        Maps each company or group to [added, removed]
+    column : str
+        Name of the first column
+
+    Returns
+    -------
+    df : dataframe
+    """
+    import pandas as pd
+
+    df = pd.DataFrame([(name, x[0], x[1], x[0] - x[1]) for name, x in counts.items()], columns=[column, 'added', 'removed', 'net'])
+    df = df.sort_values(['net', column], key=lambda x: x.abs() if x.name == 'net' else x, ascending=[False, True])
+
+    return df
+
+def rows_df(diff):
+    """Builds a dataframe with one row for every added, removed or changed
+    seat.
+
+    Parameters
+    ----------
+    diff : SnapshotDiff
+
+    Returns
+    -------
+    df : dataframe
+    """
+    import pandas as pd
+
+    key_columns = KEY_COLUMNS[diff.kind]
+    rows = [['added', '', company] + list(key) for key, company in diff.added]
+    rows += [['removed', company, ''] + list(key) for key, company in diff.removed]
+    rows += [['changed', old_company, company] + list(key) for key, old_company, company in diff.changed]
+
+    return pd.DataFrame(rows, columns=['change', 'old_company', 'new_company'] + key_columns)
+
+def diff_files(old_path, new_path):
+    """Compares two dataset files.
+
+    Parameters
+    ----------
+    old_path : str
+    new_path : str
+
+    Returns
+    -------
+    diff : SnapshotDiff
+    """
+    from dataset_io import read_dataset
+
+    old_df = read_dataset(old_path)[0]
+    new_df = read_dataset(new_path)[0]
+
+    kind = dataset_kind(new_df)
+    if dataset_kind(old_df) != kind:
+        raise ValueError("Cannot compare an owners dataset with an Istio dataset")
+
+    return diff_seats(snapshot_seats(old_df, kind), snapshot_seats(new_df, kind), kind)
+
+def write_diff(diff, old_path, new_path):
+    """Prints a summary of a diff and writes the rows, company deltas and
+    group deltas to csv files in the output directory.
+
+    Parameters
+    ----------
+    diff : SnapshotDiff
+    old_path : str
+    new_path : str
+    """
+    from os.path import dirname, join, basename, splitext
+
+    name = 'snapshot_diff_' + splitext(basename(old_path))[0] + '_' + splitext(basename(new_path))[0]
+    file_path = join(dirname(__file__), 'output', name)
+
+    print(old_path, "->", new_path)
+    print("Added", len(diff.added), "Removed", len(diff.removed), "Changed affiliation", len(diff.changed))
+
+    companies = delta_df(diff.companies, 'company')
+    groups = delta_df(diff.groups, GROUP_COLUMNS[diff.kind])
+    print(companies.head(10).to_string(index=False))
+
+    rows_df(diff).to_csv(file_path + '_rows.csv', index=False)
+    companies.to_csv(file_path + '_companies.csv', index=False)
+    groups.to_csv(file_path + '_groups.csv', index=False)
+    print("Wrote", file_path + "_*.csv\n")
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Compare owners or Istio dataset snapshots.')
+    parser.add_argument('paths', nargs='+', help='Two or more dataset files, oldest first')
+    args = parser.parse_args()
+
+    if len(args.paths) < 2:
+        parser.error("At least two dataset files are needed")
+
+    from dataset_io import read_dataset
+
+    # Each file is read once and compared with the one before it
+    previous = None
+    for path in args.paths:
+        df = read_dataset(path)[0]
+        kind = dataset_kind(df)
+        seats = snapshot_seats(df, kind)
+        if previous is not None:
+            old_path, old_kind, old_seats = previous
+            if old_kind != kind:
+                raise ValueError("Cannot compare an owners dataset with an Istio dataset")
+            write_diff(diff_seats(old_seats, seats, kind), old_path, path)
+        previous = (path, kind, seats)
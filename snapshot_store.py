@@ -0,0 +1,307 @@
+#!/usr/local/bin/python3
+
+# Copyright (C) 2026 Dawn M. Foster
+# Licensed under GNU General Public License (GPL), version 3 or later: http://www.gnu.org/licenses/gpl.txt
+
+"""
+Local sqlite store of the dated owners and Istio dataset snapshots, so
+they can be compared over time without loading every csv file again.
+
+Each dataset file is one snapshot, named after the file and dated from
+the YYYY-MM-DD in its filename. owners_details.py and istio_owners.py
+add each new dataset automatically. Older datasets can be added with the
+ingest command, and ingesting a file again replaces its snapshot.
+
+python3 snapshot_store.py ingest datasets/*.csv
+python3 snapshot_store.py share --group sig-node --status approver
+python3 snapshot_store.py history dims
+
+Parameters
+----------
+--db : str
+    Path to the store (default: output/snapshots.sqlite)
+ingest paths
+    Dataset files (csv, parquet or arrow) to add to the store
+share
+    Company share of the people in each SIG (or Istio team) in each
+    snapshot. --kind istio uses the Istio snapshots, --group limits the
+    results to one SIG or team and --status to one role.
+history username
+    Every role a user has had in each snapshot, along with the first
+    snapshot for each role
+"""
+
+import re
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS snapshots (
+    id INTEGER PRIMARY KEY,
+    source TEXT NOT NULL UNIQUE,
+    kind TEXT NOT NULL,
+    snapshot_date TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS owners (
+    snapshot_id INTEGER NOT NULL REFERENCES snapshots (id),
+    company TEXT NOT NULL,
+    username TEXT NOT NULL,
+    status TEXT NOT NULL,
+    sig_name TEXT NOT NULL,
+    subproject TEXT NOT NULL,
+    owners_file TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS istio (
+    snapshot_id INTEGER NOT NULL REFERENCES snapshots (id),
+    company TEXT NOT NULL,
+    username TEXT NOT NULL,
+    team TEXT NOT NULL);
+CREATE INDEX IF NOT EXISTS owners_snapshot ON owners (snapshot_id);
+CREATE INDEX IF NOT EXISTS owners_username ON owners (username);
+CREATE INDEX IF NOT EXISTS owners_company ON owners (company);
+CREATE INDEX IF NOT EXISTS owners_sig_name ON owners (sig_name);
+CREATE INDEX IF NOT EXISTS owners_owners_file ON owners (owners_file);
+CREATE INDEX IF NOT EXISTS istio_snapshot ON istio (snapshot_id);
+CREATE INDEX IF NOT EXISTS istio_username ON istio (username);
+CREATE INDEX IF NOT EXISTS istio_company ON istio (company);
+CREATE INDEX IF NOT EXISTS istio_team ON istio (team);
+"""
+
+# Dataset columns stored for each kind of snapshot
+KIND_COLUMNS = {'owners': ['company', 'username', 'status', 'sig_name', 'subproject', 'owners_file'],
+                'istio': ['company', 'username', 'team']}
+
+# Column used to group people in each kind of snapshot
+KIND_GROUPS = {'owners': 'sig_name', 'istio': 'team'}
+
+def default_store_path():
+    """Returns the path of the store in the output directory."""
+    from os.path import dirname, join
+
+    return join(dirname(__file__), 'output', 'snapshots.sqlite')
+
+def connect(db_path=None):
+    """Opens the store, creating the tables and indexes if needed.
+
+    Parameters
+    ----------
+    db_path : str
+        Defaults to default_store_path()
+
+    Returns
+    -------
+    db : sqlite3.Connection
+    """
+    import sqlite3
+
+    db = sqlite3.connect(db_path or default_store_path())
+    db.executescript(SCHEMA)
+
+    return db
+
+def snapshot_name(path):
+    """Returns the source name and date of a dataset file from its filename,
+    like ('owners_data_2022-04-18_xtra_owners', '2022-04-18').
+
+    Parameters
+    ----------
+    path : str
+
+    Returns
+    -------
+    source : str
+    snapshot_date : str
+    """
+    from os.path import basename, splitext
+
+    source = splitext(basename(path))[0]
+    match = re.search(r'\d{4}-\d{2}-\d{2}', source)
+    if match is None:
+        raise ValueError("No YYYY-MM-DD date in the filename " + path)
+
+    return source, match.group(0)
+
+def ingest(db, path):
+    """Adds a dataset file to the store as a snapshot, replacing the
+    snapshot from an earlier ingest of the same file. Company names are
+    normalized with company_aliases.yaml, so ingesting older datasets
+    again migrates them to the canonical names.
+
+    Parameters
+    ----------
+    db : sqlite3.Connection
+    path : str
+        csv, parquet or arrow dataset
+
+    Returns
+    -------
+    rows : int
+        Number of rows stored
+    """
+    from company_names import get_company_normalizer
+    from dataset_io import read_dataset
+
+    source, snapshot_date = snapshot_name(path)
+    df, metadata = read_dataset(path)
+    # Datasets written before company names were normalized are stored
+    # with the canonical names too
+    df['company'] = get_company_normalizer().normalize_series(df['company'].astype(str))
+
+    columns = list(df.columns)
+    for kind, kind_columns in KIND_COLUMNS.items():
+        if columns == kind_columns:
+            break
+    else:
+        raise ValueError("Unknown dataset columns in " + path + ": " + ",".join(columns))
+
+    with db:
+        row = db.execute("SELECT id, kind FROM snapshots WHERE source = ?", (source,)).fetchone()
+        if row is not None:
+            # The rows are in the table of the kind stored for the old
+            # snapshot, which can differ if the file was rewritten
+            old_id, old_kind = row
+            db.execute("DELETE FROM " + old_kind + " WHERE snapshot_id = ?", (old_id,))
+            db.execute("DELETE FROM snapshots WHERE id = ?", (old_id,))
+
+        snapshot_id = db.execute("INSERT INTO snapshots (source, kind, snapshot_date) VALUES (?, ?, ?)", (source, kind, snapshot_date)).lastrowid
+        placeholders = ", ".join("?" * (len(columns) + 1))
+        db.executemany("INSERT INTO " + kind + " VALUES (" + placeholders + ")",
+                       ([snapshot_id] + [str(value) for value in values] for values in df.itertuples(index=False)))
+
+    return len(df)
+
+def append_snapshot(path, db_path=None):
+    """Adds a dataset that was just written by one of the scripts to the
+    store and prints a short message.
+
+    Parameters
+    ----------
+    path : str
+    db_path : str
+    """
+    db = connect(db_path)
+    rows = ingest(db, path)
+    db.close()
+
+    print("Added", rows, "rows from", path, "to the snapshot store")
+
+def company_share(db, kind='owners', group=None, status=None):
+    """Returns the share of the people in each SIG (or Istio team) that
+    work for each company, for every snapshot.
+
+    Parameters
+    ----------
+    db : sqlite3.Connection
+    kind : str
+        'owners' or 'istio'
+    group : str
+        Only this SIG or team, or None for all of them
+    status : str
+        Only people with this role, like 'approver'. Owners snapshots only.
+
+    Returns
+    -------
+    df : dataframe
+        snapshot_date, source, group column, company, people and share
+    """
+    import pandas as pd
+
+    group_column = KIND_GROUPS[kind]
+    conditions = []
+    params = []
+    if group is not None:
+        conditions.append("t." + group_column + " = ?")
+        params.append(group)
+    if status is not None:
+        conditions.append("t.status = ?")
+        params.append(status)
+    where = ("WHERE " + " AND ".join(conditions)) if conditions else ""
+
+    query = """SELECT s.snapshot_date, s.source, t.{group} AS {group}, t.company,
+                      COUNT(DISTINCT t.username) AS people,
+                      ROUND(COUNT(DISTINCT t.username) * 1.0 /
+                            SUM(COUNT(DISTINCT t.username)) OVER (PARTITION BY s.id, t.{group}), 4) AS share
+               FROM {kind} t JOIN snapshots s ON s.id = t.snapshot_id
+               {where}
+               GROUP BY s.id, t.{group}, t.company
+               ORDER BY s.snapshot_date, s.source, t.{group}, people DESC, t.company""".format(group=group_column, kind=kind, where=where)
+
+    return pd.read_sql_query(query, db, params=params)
+
+def user_history(db, username):
+    """Returns every role a user has had in every owners snapshot.
+
+    Parameters
+    ----------
+    db : sqlite3.Connection
+    username : str
+
+    Returns
+    -------
+    history : dataframe
+        snapshot_date, source, company, status, sig_name, subproject and
+        owners_file for each row
+    first_seen : dataframe
+        The first snapshot_date for each status, like when a user first
+        became an approver
+    """
+    import pandas as pd
+
+    history = pd.read_sql_query("""SELECT s.snapshot_date, s.source, o.company, o.status, o.sig_name, o.subproject, o.owners_file
+                                   FROM owners o JOIN snapshots s ON s.id = o.snapshot_id
+                                   WHERE o.username = ?
+                                   ORDER BY s.snapshot_date, s.source, o.status, o.sig_name, o.subproject""", db, params=[username.lower()])
+    first_seen = pd.read_sql_query("""SELECT o.status, MIN(s.snapshot_date) AS first_seen
+                                      FROM owners o JOIN snapshots s ON s.id = o.snapshot_id
+                                      WHERE o.username = ?
+                                      GROUP BY o.status
+                                      ORDER BY first_seen""", db, params=[username.lower()])
+
+    return history, first_seen
+
+def read_args():
+    """Reads the store path and the command to run from the command line.
+
+    Returns
+    -------
+    args : argparse.Namespace
+    """
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Store and query dated owners dataset snapshots.')
+    parser.add_argument('--db', default=None, help='Path to the store (default: output/snapshots.sqlite)')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    ingest_parser = commands.add_parser('ingest', help='Add dataset files to the store')
+    ingest_parser.add_argument('paths', nargs='+', help='Dataset files (csv, parquet or arrow)')
+
+    share_parser = commands.add_parser('share', help='Company share per SIG or team over time')
+    share_parser.add_argument('--kind', choices=['owners', 'istio'], default='owners', help='Which snapshots to use')
+    share_parser.add_argument('--group', default=None, help='Only this SIG or team')
+    share_parser.add_argument('--status', default=None, help='Only this role, like approver')
+
+    history_parser = commands.add_parser('history', help='Roles of a user over time')
+    history_parser.add_argument('username', help='GitHub username')
+
+    return parser.parse_args()
+
+if __name__ == '__main__':
+    import pandas as pd
+
+    args = read_args()
+    db = connect(args.db)
+
+    with pd.option_context('display.max_rows', None, 'display.width', 200):
+        if args.command == 'ingest':
+            for path in args.paths:
+                print("Ingested", ingest(db, path), "rows from", path)
+
+        elif args.command == 'share':
+            print(company_share(db, args.kind, args.group, args.status).to_string(index=False))
+
+        elif args.command == 'history':
+            history, first_seen = user_history(db, args.username)
+            if history.empty:
+                print("No roles found for", args.username)
+            else:
+                print(history.to_string(index=False))
+                print()
+                print(first_seen.to_string(index=False))
+
+    db.close()
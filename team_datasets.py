@@ -0,0 +1,230 @@
+#!/usr/local/bin/python3
+
+# Copyright (C) 2026 Dawn M. Foster
+# Licensed under GNU General Public License (GPL), version 3 or later: http://www.gnu.org/licenses/gpl.txt
+
+"""
+Builds leadership datasets for every project listed in team_projects.yaml
+from their teams.yaml style files, along with CNCF Affiliation data and
+company information from GitHub user profiles.
+
+The teams files are downloaded and read in parallel, and the teams in
+each file are walked recursively to any depth. GitHub companies are then
+looked up once for the users of all projects together, sharing the
+affiliation index and the download cache, before each dataset is written.
+
+As input, this script requires that you have a GitHub API token in a file
+called 'gh_key' in this directory. The file can hold several tokens, one
+per line, and requests are spread across them.
+
+The output for each project is saved as a csv of the format:
+output/owners_data_PROJECT_YYYY-MM-DD.csv
+and added to the snapshot store in output/snapshots.sqlite
+(see snapshot_store.py).
+
+Parameters
+----------
+--config : str
+    yaml file listing the projects (default: team_projects.yaml)
+--projects : str
+    Only build the datasets for these project names
+--workers : int
+    Number of teams files downloaded in parallel (default 8)
+--format : str
+    Also write each dataset as a parquet or arrow file next to the csv file
+"""
+
+def extract_team_members(teams, member_keys=('members',)):
+    """Walks a tree of teams and returns a (username, team) pair for each
+    member of each team. The members of the top level teams come first.
+    The subteams of each top level team follow, depth-first, with every
+    team followed by its own subteams before the next one. This is the
+    order istio_owners.py has always written its dataset in.
+
+    Parameters
+    ----------
+    teams : dict
+        Maps team name to a dict with member lists and optional 'teams'
+    member_keys : list
+        Keys of each team that hold usernames
+
+    Returns
+    -------
+    team_members : list
+    """
+    team_members = []
+
+    def add_members(team, details):
+        for key in member_keys:
+            for username in details.get(key) or []:
+                team_members.append((str(username), team))
+
+    def walk(subteams):
+        for team, details in (subteams or {}).items():
+            details = details or {}
+            add_members(team, details)
+            walk(details.get('teams'))
+
+    top_level = [(team, details or {}) for team, details in (teams or {}).items()]
+    for team, details in top_level:
+        add_members(team, details)
+    for team, details in top_level:
+        walk(details.get('teams'))
+
+    return team_members
+
+def load_projects(file_name='team_projects.yaml'):
+    """Loads the list of projects from a yaml file in this directory.
+
+    Parameters
+    ----------
+    file_name : str
+
+    Returns
+    -------
+    projects : list
+        dicts with name, teams_url and optional member_keys
+    """
+    from os.path import dirname, join
+    from common_functions import load_yaml
+
+    with open(join(dirname(__file__), file_name), 'r') as f:
+        config = load_yaml(f) or {}
+
+    return config.get('projects') or []
+
+def fetch_team_members(project):
+    """Downloads the teams file of a project and extracts its members.
+
+    Parameters
+    ----------
+    project : dict
+
+    Returns
+    -------
+    team_members : list
+        (username, team) tuples
+    """
+    from common_functions import download_file, load_yaml
+
+    teams_file = download_file(project['teams_url'])
+    teams_yaml = load_yaml(teams_file)
+
+    return extract_team_members(teams_yaml.get('teams'), project.get('member_keys') or ['members'])
+
+def write_team_dataset(name, team_members, affil_dict, api_tokens, columnar_format=None):
+    """Writes the dataset for one project and adds it to the snapshot store.
+
+    Parameters
+    ----------
+    name : str
+        Project name used in the output filename
+    team_members : list
+        (username, team) tuples
+    affil_dict : dict
+       generated by the read_cncf_affiliations function
+    api_tokens : list
+    columnar_format : str
+        'parquet' or 'arrow' to also write a columnar file, or None
+
+    Returns
+    -------
+    outfile_name : str
+    """
+    from datetime import datetime
+    from common_functions import write_affil_line_istio
+    from dataset_io import DatasetWriter, ISTIO_COLUMNS, preamble
+    from snapshot_store import append_snapshot
+
+    # Open the CSV file for writing and write the license and header lines
+    today = datetime.today().strftime('%Y-%m-%d')
+    outfile_name = 'output/owners_data_' + name + '_' + today + '.csv'
+    csv_file = DatasetWriter(outfile_name, ISTIO_COLUMNS, preamble("Updated on " + str(today)), columnar_format)
+
+    for username, team in team_members:
+        write_affil_line_istio (username, team, affil_dict, api_tokens, csv_file)
+
+    csv_file.close()
+
+    # Keep the history of datasets in the local snapshot store
+    append_snapshot(outfile_name)
+
+    return outfile_name
+
+def build_team_datasets(projects, api_tokens, workers=8, columnar_format=None):
+    """Builds the datasets for a list of projects.
+
+    Parameters
+    ----------
+    projects : list
+        From load_projects
+    api_tokens : list
+    workers : int
+        Number of teams files downloaded in parallel
+    columnar_format : str
+
+    Returns
+    -------
+    outfile_names : list
+    """
+    from concurrent.futures import ThreadPoolExecutor
+    from common_functions import read_cncf_affiliations, resolve_companies
+
+    # The large affiliation download overlaps with the teams files
+    with ThreadPoolExecutor(max_workers=workers + 1) as executor:
+        affil_future = executor.submit(read_cncf_affiliations)
+        member_futures = [(project, executor.submit(fetch_team_members, project)) for project in projects]
+
+        project_members = []
+        for project, future in member_futures:
+            try:
+                project_members.append((project['name'], future.result()))
+            except Exception as e:
+                print("Cannot get the teams for", project['name'], e)
+
+        affil_dict = affil_future.result()
+
+    # Look up GitHub companies for the users of every project at once
+    try:
+        resolve_companies([username for name, team_members in project_members for username, team in team_members], api_tokens)
+    except:
+        print("Cannot get companies from the GitHub API, using CNCF affiliation data only")
+
+    outfile_names = []
+    for name, team_members in project_members:
+        outfile_names.append(write_team_dataset(name, team_members, affil_dict, api_tokens, columnar_format))
+        print(name + ":", len(team_members), "team members written to", outfile_names[-1])
+
+    return outfile_names
+
+def read_args():
+    """Reads the config file, project names, number of workers and
+    output format from the command line.
+
+    Returns
+    -------
+    args : argparse.Namespace
+    """
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Build leadership datasets from teams.yaml style files.')
+    parser.add_argument('--config', default='team_projects.yaml', help='yaml file listing the projects')
+    parser.add_argument('--projects', nargs='+', default=None, help='Only build the datasets for these project names')
+    parser.add_argument('--workers', type=int, default=8, help='Number of teams files downloaded in parallel')
+    parser.add_argument('--format', choices=['parquet', 'arrow'], default=None, help='Also write each dataset as a columnar file')
+
+    return parser.parse_args()
+
+if __name__ == '__main__':
+    from common_functions import read_keys
+    from github_client import get_pool
+
+    args = read_args()
+
+    projects = load_projects(args.config)
+    if args.projects:
+        projects = [project for project in projects if project['name'] in args.projects]
+
+    build_team_datasets(projects, read_keys('gh_key'), args.workers, args.format)
+
+    get_pool().report()
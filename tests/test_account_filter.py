@@ -0,0 +1,42 @@
+# Copyright (C) 2026 Dawn M. Foster
+# Licensed under GNU General Public License (GPL), version 3 or later: http://www.gnu.org/licenses/gpl.txt
+
+import re
+
+import pandas as pd
+
+from account_filter import AccountFilter, trie_regex
+
+def test_trie_regex_matches_exactly_the_words():
+    words = ['approve', 'approvers', 'app', 'review']
+    pattern = re.compile('^' + trie_regex(words) + '$')
+
+    for word in words:
+        assert pattern.match(word)
+    assert not pattern.match('appr')
+    assert not pattern.match('reviews')
+
+def test_keep():
+    account_filter = AccountFilter(ban=['approve', 'sig-'], prefixes=['team'], bots=['k8s-ci-robot'], allow=['Teamwork'])
+
+    assert account_filter.keep('Frank')
+    assert not account_filter.keep('sig-node-approvers')
+    assert not account_filter.keep('team-leads')
+    assert not account_filter.keep('K8S-CI-ROBOT')
+    assert account_filter.keep('k8s-ci-robot-fan')
+    assert account_filter.keep('teamwork')
+
+def test_mask_matches_keep():
+    account_filter = AccountFilter(ban=['approve'], prefixes=['team'], allow=['teamwork'])
+    usernames = pd.Series(['frank', 'sig-approvers', 'team-a', 'teamwork', 'Gina'])
+
+    assert account_filter.mask(usernames).tolist() == [account_filter.keep(x) for x in usernames]
+
+def test_empty_filter_keeps_everyone():
+    assert AccountFilter().keep('sig-node-approvers')
+
+def test_file_filter_drops_aliases():
+    account_filter = AccountFilter.from_file()
+
+    assert not account_filter.keep('sig-node-reviewers')
+    assert account_filter.keep('dims')
@@ -0,0 +1,43 @@
+# Copyright (C) 2026 Dawn M. Foster
+# Licensed under GNU General Public License (GPL), version 3 or later: http://www.gnu.org/licenses/gpl.txt
+
+import io
+import json
+
+import pytest
+
+from affiliation_index import AffiliationIndex, build_affiliation_index, current_affiliation, index_source_sha256, iter_json_array
+
+USERS = [{'login': 'Alice', 'affiliation': 'Old Co until 2020-01-01, Acme'},
+         {'login': 'bob', 'affiliation': 'Google LLC'},
+         {'login': 'k8s-ci-robot', 'affiliation': '(Robots)'},
+         {'login': 'carol'}]
+
+@pytest.mark.parametrize('chunk_size', [1, 7, 1024])
+def test_iter_json_array_across_chunks(chunk_size):
+    text = ' [\n' + ',\n'.join(json.dumps(user) for user in USERS) + '\n]\n'
+
+    assert list(iter_json_array(io.StringIO(text), chunk_size)) == USERS
+
+@pytest.mark.parametrize('text', ['{"login": "alice"}', '[{"login": "alice"}'])
+def test_iter_json_array_rejects_bad_files(text):
+    with pytest.raises(ValueError):
+        list(iter_json_array(io.StringIO(text), 4))
+
+def test_current_affiliation():
+    assert current_affiliation('Old Co until 2020-01-01, Acme') == 'Acme'
+    assert current_affiliation('Google LLC') == 'Google LLC'
+    assert current_affiliation('(Robots)') is None
+
+def test_index(tmp_path):
+    db_path = str(tmp_path / 'affiliations.sqlite')
+    assert index_source_sha256(db_path) is None
+
+    build_affiliation_index(io.StringIO(json.dumps(USERS)), db_path, 'sha-1')
+    affil_dict = AffiliationIndex(db_path)
+
+    assert index_source_sha256(db_path) == 'sha-1'
+    assert dict(affil_dict) == {'alice': 'Acme', 'bob': 'Google LLC'}
+    assert 'k8s-ci-robot' not in affil_dict
+    with pytest.raises(KeyError):
+        affil_dict['carol']
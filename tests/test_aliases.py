@@ -0,0 +1,83 @@
+# Copyright (C) 2026 Dawn M. Foster
+# Licensed under GNU General Public License (GPL), version 3 or later: http://www.gnu.org/licenses/gpl.txt
+
+import io
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+import requests
+
+import common_functions
+from common_functions import expand_aliases, get_alias_map, owners_aliases_url, owners_rows
+
+ALIAS_URL = 'https://raw.githubusercontent.com/kubernetes/kubernetes/master/OWNERS_ALIASES'
+
+@pytest.fixture(autouse=True)
+def empty_alias_cache(monkeypatch):
+    monkeypatch.setattr(common_functions, '_alias_maps', {})
+    monkeypatch.setattr(common_functions, '_alias_url_locks', {})
+
+def not_found(url):
+    response = requests.Response()
+    response.status_code = 404
+    raise requests.HTTPError('404', response=response)
+
+def test_owners_aliases_url():
+    assert owners_aliases_url('https://raw.githubusercontent.com/kubernetes/kubernetes/master/pkg/kubelet/OWNERS') == ALIAS_URL
+    assert owners_aliases_url('https://github.com/kubernetes/kubernetes/blob/master/OWNERS') is None
+
+def test_expand_aliases_follows_nested_aliases_and_cycles():
+    alias_map = expand_aliases({
+        'Sig-Node-Approvers': ['frank', 'node-leads'],
+        'node-leads': ['gina', 'sig-node-approvers', 'frank'],
+    })
+
+    assert alias_map['sig-node-approvers'] == ['frank', 'gina']
+    assert alias_map['node-leads'] == ['gina', 'frank']
+
+def test_get_alias_map_downloads_each_file_once(monkeypatch):
+    calls = []
+
+    def slow_download(url):
+        calls.append(url)
+        time.sleep(0.05)
+        return io.BytesIO(b'aliases:\n  node-approvers: [frank]\n')
+    monkeypatch.setattr(common_functions, 'download_file', slow_download)
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        alias_maps = list(executor.map(get_alias_map, [ALIAS_URL] * 8))
+
+    assert calls == [ALIAS_URL]
+    assert all(alias_map == {'node-approvers': ['frank']} for alias_map in alias_maps)
+
+def test_get_alias_map_does_not_cache_failures(monkeypatch):
+    def flaky_download(url):
+        raise requests.ConnectionError('reset')
+    monkeypatch.setattr(common_functions, 'download_file', flaky_download)
+
+    assert get_alias_map(ALIAS_URL) == {}
+
+    monkeypatch.setattr(common_functions, 'download_file', lambda url: io.BytesIO(b'aliases:\n  a: [frank]\n'))
+    assert get_alias_map(ALIAS_URL) == {'a': ['frank']}
+
+def test_get_alias_map_caches_missing_files(monkeypatch):
+    calls = []
+    def download(url):
+        calls.append(url)
+        not_found(url)
+    monkeypatch.setattr(common_functions, 'download_file', download)
+
+    assert get_alias_map(ALIAS_URL) == {}
+    assert get_alias_map(ALIAS_URL) == {}
+    assert len(calls) == 1
+
+def test_owners_rows_lists_each_user_once_per_role(monkeypatch):
+    monkeypatch.setattr(common_functions, 'get_alias_map', lambda url: {'node-approvers': ['frank', 'gina']})
+    owners = {'approvers': ['node-approvers', 'Frank'], 'reviewers': ['frank'], 'labels': ['sig/node', 'area/kubelet']}
+
+    rows = owners_rows(owners, 'https://raw.githubusercontent.com/kubernetes/kubernetes/master/OWNERS', 'NA', 'NA')
+
+    assert rows == [('frank', 'approver', 'sig-node', 'kubelet'),
+                    ('gina', 'approver', 'sig-node', 'kubelet'),
+                    ('frank', 'reviewer', 'sig-node', 'kubelet')]
@@ -0,0 +1,52 @@
+# Copyright (C) 2026 Dawn M. Foster
+# Licensed under GNU General Public License (GPL), version 3 or later: http://www.gnu.org/licenses/gpl.txt
+
+import numpy as np
+import pandas as pd
+
+from bus_elephant import calculate_factors, factor_arrays
+
+def test_factor_arrays():
+    # Project 0: 5, 3, 2 (factor 1 reaches half), project 1: 1, 1, 1, 1
+    project_codes = np.array([0, 1, 0, 1, 0, 1, 1])
+    name_codes = np.array([0, 0, 1, 1, 2, 2, 3])
+    counts = np.array([3, 1, 5, 1, 2, 1, 1])
+
+    order, starts, sizes, bf, bf_share, top_share = factor_arrays(project_codes, name_codes, counts, top=2)
+
+    assert list(counts[order]) == [5, 3, 2, 1, 1, 1, 1]
+    assert list(starts) == [0, 3]
+    assert list(sizes) == [3, 4]
+    assert list(bf) == [1, 2]
+    assert np.allclose(bf_share, [0.5, 0.5])
+    assert np.allclose(top_share, [0.8, 0.5])
+
+def test_ties_are_broken_by_name():
+    order = factor_arrays(np.array([0, 0, 0]), np.array([2, 0, 1]), np.array([1, 1, 1]))[0]
+
+    assert list(order) == [1, 2, 0]
+
+def test_empty_input():
+    empty = np.zeros(0, dtype=int)
+    results = factor_arrays(empty, empty, empty)
+
+    assert [len(x) for x in results] == [0] * 6
+
+def test_calculate_factors():
+    df = pd.DataFrame({'project': ['b', 'a', 'a', 'a', 'b'],
+                       'name': ['x', 'y', 'x', 'y', 'z'],
+                       'contributions': [4, 2, 1, 2, 0]})
+    factors_df = calculate_factors(df)
+
+    assert list(factors_df['Project/Repository Group']) == ['a', 'b']
+    assert list(factors_df['BF']) == [1, 1]
+    assert list(factors_df['Bus/Elephant Factor Users']) == ['y', 'x']
+    assert list(factors_df['Top Users']) == ['y, x', 'x']
+    assert list(factors_df['BF%']) == [80.0, 100.0]
+
+def test_calculate_factors_without_contributions():
+    df = pd.DataFrame({'project': ['a'], 'name': ['x'], 'contributions': [0]})
+    factors_df = calculate_factors(df, kind='orgs')
+
+    assert factors_df.empty
+    assert 'Bus/Elephant Factor Organizations' in factors_df.columns
@@ -0,0 +1,70 @@
+# Copyright (C) 2026 Dawn M. Foster
+# Licensed under GNU General Public License (GPL), version 3 or later: http://www.gnu.org/licenses/gpl.txt
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from checkpoint import Journal, read_journal
+
+def test_records_are_read_back(tmp_path):
+    path = str(tmp_path / 'run.journal')
+    journal = Journal(path, sync_every=2)
+    for i in range(5):
+        journal.append({'key': i})
+    journal.close()
+
+    assert read_journal(path) == [{'key': i} for i in range(5)]
+
+def test_missing_journal_is_empty(tmp_path):
+    assert read_journal(str(tmp_path / 'missing.journal')) == []
+
+def test_partial_last_line_is_ignored(tmp_path):
+    path = tmp_path / 'run.journal'
+    path.write_text('{"key": 1}\n{"key": 2}\n{"ke')
+
+    assert read_journal(str(path)) == [{'key': 1}, {'key': 2}]
+
+def test_resume_appends_after_a_partial_line(tmp_path):
+    path = tmp_path / 'run.journal'
+    path.write_text('{"key": 1}\n{"ke')
+
+    journal = Journal(str(path), resume=True)
+    journal.append({'key': 2})
+    journal.close()
+
+    assert read_journal(str(path)) == [{'key': 1}, {'key': 2}]
+
+def test_resume_after_a_partial_first_line(tmp_path):
+    path = tmp_path / 'run.journal'
+    path.write_text('{"ke')
+
+    journal = Journal(str(path), resume=True)
+    journal.append({'key': 1})
+    journal.close()
+
+    assert read_journal(str(path)) == [{'key': 1}]
+
+def test_without_resume_the_journal_starts_empty(tmp_path):
+    path = tmp_path / 'run.journal'
+    path.write_text('{"key": 1}\n')
+
+    Journal(str(path)).close()
+
+    assert read_journal(str(path)) == []
+
+def test_appends_from_threads_are_whole_lines(tmp_path):
+    path = str(tmp_path / 'run.journal')
+    journal = Journal(path, sync_every=7)
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(lambda i: journal.append({'key': i, 'rows': ['x'] * 50}), range(400)))
+    journal.close()
+
+    assert sorted(record['key'] for record in read_journal(path)) == list(range(400))
+
+def test_remove_deletes_the_journal(tmp_path):
+    path = str(tmp_path / 'run.journal')
+    journal = Journal(path)
+    journal.append({'key': 1})
+    journal.remove()
+
+    assert not os.path.exists(path)
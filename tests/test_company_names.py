@@ -0,0 +1,39 @@
+# Copyright (C) 2026 Dawn M. Foster
+# Licensed under GNU General Public License (GPL), version 3 or later: http://www.gnu.org/licenses/gpl.txt
+
+import pandas as pd
+import pytest
+
+from company_names import CompanyNormalizer, get_company_normalizer
+
+@pytest.mark.parametrize('raw, company', [('International Business Machines Corporation', 'IBM'),
+                                          ('Google', 'Google LLC'),
+                                          ('  google inc ', 'Google LLC'),
+                                          ('Red Hat, Inc.', 'Red Hat'),
+                                          ('Cisco Systems Inc', 'Cisco Systems'),
+                                          ('@Tencent', 'Tencent')])
+def test_aliases(raw, company):
+    assert get_company_normalizer().normalize(raw) == company
+
+@pytest.mark.parametrize('raw', ['Redis', 'Intelligent Systems', 'Stripes Ltd', 'Acme'])
+def test_unrelated_names_are_kept(raw):
+    assert get_company_normalizer().normalize(raw) == raw
+
+def test_exact_aliases_are_tried_before_patterns():
+    normalizer = CompanyNormalizer({'Foo Corp': 'Bar'}, [(r'\bFoo\b', 'Foo')])
+
+    assert normalizer.normalize('Foo Corp') == 'Bar'
+    assert normalizer.normalize('Foo Inc') == 'Foo'
+
+def test_normalize_series_maps_each_unique_name_once():
+    normalizer = CompanyNormalizer(patterns=[(r'\bFoo\b', 'Foo')])
+    calls = []
+    match = normalizer._match
+    normalizer._match = lambda name: calls.append(name) or match(name)
+
+    names = pd.Series(['Foo Inc', 'Acme', 'Foo Inc', None, 'Acme'])
+    result = normalizer.normalize_series(names)
+
+    assert list(result[:3]) == ['Foo', 'Acme', 'Foo']
+    assert pd.isna(result[3])
+    assert sorted(calls) == ['Acme', 'Foo Inc']
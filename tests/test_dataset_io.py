@@ -0,0 +1,45 @@
+# Copyright (C) 2026 Dawn M. Foster
+# Licensed under GNU General Public License (GPL), version 3 or later: http://www.gnu.org/licenses/gpl.txt
+
+import pytest
+
+from dataset_io import ISTIO_COLUMNS, OWNERS_COLUMNS, DatasetWriter, convert_csv, preamble, read_dataset
+
+ROWS = [['Acme, Inc.', 'alice', 'approver', 'sig-node', 'kubelet', 'url1'],
+        ['Other', 'bob', 'reviewer', 'sig-node', 'kubelet', 'url1']]
+
+def test_csv_keeps_the_preamble_and_drops_commas(tmp_path):
+    path = str(tmp_path / 'owners.csv')
+    writer = DatasetWriter(path, OWNERS_COLUMNS, preamble('Updated on 2024-01-01'))
+    writer.write_rows(ROWS)
+    writer.close()
+
+    df, metadata = read_dataset(path)
+
+    assert metadata == preamble('Updated on 2024-01-01')
+    assert list(df.columns) == OWNERS_COLUMNS
+    assert df.values.tolist() == [['Acme Inc.'] + ROWS[0][1:], ROWS[1]]
+
+@pytest.mark.parametrize('columnar_format', ['parquet', 'arrow'])
+def test_columnar_file_keeps_the_full_company(tmp_path, columnar_format):
+    path = str(tmp_path / 'owners.csv')
+    writer = DatasetWriter(path, OWNERS_COLUMNS, preamble('Updated'), columnar_format)
+    writer.write_rows(ROWS)
+    writer.close()
+
+    df, metadata = read_dataset(writer.columnar_path)
+
+    assert writer.columnar_path == str(tmp_path / ('owners.' + columnar_format))
+    assert metadata == preamble('Updated')
+    assert df.astype(str).values.tolist() == ROWS
+    assert str(df['company'].dtype) == 'category'
+
+def test_convert_csv(tmp_path):
+    path = str(tmp_path / 'istio.csv')
+    writer = DatasetWriter(path, ISTIO_COLUMNS, preamble('Updated'))
+    writer.write_row(['Acme', 'alice', 'networking'])
+    writer.close()
+
+    df, metadata = read_dataset(convert_csv(path, 'arrow'))
+
+    assert df.astype(str).values.tolist() == [['Acme', 'alice', 'networking']]
@@ -0,0 +1,71 @@
+# Copyright (C) 2026 Dawn M. Foster
+# Licensed under GNU General Public License (GPL), version 3 or later: http://www.gnu.org/licenses/gpl.txt
+
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+from github import GithubException
+
+import github_client
+from common_functions import build_email_index
+from github_client import TokenPool
+
+def commit(login, email, day):
+    author = None if login is None else SimpleNamespace(login=login)
+    return SimpleNamespace(author=author, commit=SimpleNamespace(author=SimpleNamespace(email=email, date=datetime(2024, 1, day))))
+
+class FakeList:
+    def __init__(self, pages, error=None):
+        self.pages = pages
+        self.error = error
+
+    def get_page(self, page_num):
+        if self.error is not None:
+            raise self.error
+        return self.pages[page_num] if page_num < len(self.pages) else []
+
+class FakeRepo:
+    def __init__(self, name, commits, error=None):
+        self.name = name
+        self.full_name = 'testorg/' + name
+        self.commits = commits
+        self.error = error
+        self.since = None
+
+    def get_commits(self, since=None):
+        self.since = since
+        return FakeList(self.commits, self.error)
+
+class FakeGithub:
+    def __init__(self, repos):
+        self.requester = SimpleNamespace(rate_limiting=(-1, -1), rate_limiting_resettime=0)
+        self.repos = {repo.full_name: repo for repo in repos}
+
+    def get_organization(self, org):
+        return SimpleNamespace(get_repos=lambda: FakeList([list(self.repos.values())]))
+
+    def get_repo(self, full_name, lazy=False):
+        return self.repos[full_name]
+
+@pytest.fixture
+def org(monkeypatch):
+    repos = [FakeRepo('a', [[commit('Alice', 'old@example.com', 1), commit('bob', 'bob@users.noreply.github.com', 2)],
+                            [commit(None, 'ghost@example.com', 3), commit('carol', 'carol@example.com', 4)]]),
+             FakeRepo('b', [[commit('alice', 'new@example.com', 5), commit('bob', 'bob@example.com', 1)]]),
+             FakeRepo('empty', [], GithubException(409, {'message': 'Git Repository is empty.'}, {}))]
+    pool = TokenPool()
+    pool.add('token')
+    pool._clients['token'] = FakeGithub(repos)
+    monkeypatch.setattr(github_client, '_pool', pool)
+
+    return repos
+
+def test_newest_email_for_each_login(org):
+    assert build_email_index('testorg') == {'alice': 'new@example.com', 'bob': 'bob@example.com', 'carol': 'carol@example.com'}
+
+def test_logins_and_since_limit_the_index(org):
+    since = datetime(2023, 10, 1)
+
+    assert build_email_index('testorg', logins={'bob'}, since=since) == {'bob': 'bob@example.com'}
+    assert [repo.since for repo in org] == [since] * 3
@@ -0,0 +1,97 @@
+# Copyright (C) 2026 Dawn M. Foster
+# Licensed under GNU General Public License (GPL), version 3 or later: http://www.gnu.org/licenses/gpl.txt
+
+import time
+
+import pytest
+
+import github_client
+from github_client import RateGovernor, TokenBucket, TokenPool, call_github, iter_pages, is_rate_limited
+
+class FakeRequester:
+    def __init__(self):
+        self.rate_limiting = (-1, -1)
+        self.rate_limiting_resettime = 0
+
+class FakeGithub:
+    """Stands in for a PyGithub client. Reading rate_limiting on the real
+    client sends a request when no response has reported the limit yet."""
+
+    def __init__(self):
+        self.requester = FakeRequester()
+
+    @property
+    def rate_limiting(self):
+        raise AssertionError("rate_limiting sends an extra request")
+
+class FakePaginatedList:
+    def __init__(self, g, pages):
+        self.g = g
+        self.pages = pages
+        self.requests = 0
+
+    def get_page(self, page_num):
+        self.requests += 1
+        self.g.requester.rate_limiting = (1000 - self.requests, 5000)
+        self.g.requester.rate_limiting_resettime = int(time.time()) + 3600
+        return self.pages[page_num] if page_num < len(self.pages) else []
+
+@pytest.fixture
+def client(monkeypatch):
+    pool = TokenPool()
+    pool.add('token')
+    g = FakeGithub()
+    pool._clients['token'] = g
+    monkeypatch.setattr(github_client, '_pool', pool)
+    return g
+
+def test_token_bucket_waits_when_empty():
+    bucket = TokenBucket(2, 60)
+
+    assert bucket.take() == 0
+    assert bucket.take() == 0
+    assert bucket.take() > 0
+    assert bucket.peek() > 0
+
+def test_governor_budget_from_headers():
+    governor = RateGovernor()
+    assert governor.budget('core') == (0, float('inf'))
+
+    governor.update('core', {'X-RateLimit-Remaining': '0', 'X-RateLimit-Reset': str(int(time.time()) + 100)})
+    wait, remaining = governor.budget('core')
+
+    assert remaining == 0
+    assert wait > 90
+
+def test_pool_chooses_the_token_with_most_budget():
+    pool = TokenPool()
+    pool.add(['a', 'b'])
+    reset = str(int(time.time()) + 3600)
+    pool._governors['a'].update('core', {'X-RateLimit-Remaining': '10', 'X-RateLimit-Reset': reset})
+    pool._governors['b'].update('core', {'X-RateLimit-Remaining': '20', 'X-RateLimit-Reset': reset})
+
+    assert pool.choose('core')[0] == 'b'
+
+def test_is_rate_limited():
+    assert is_rate_limited(429, {})
+    assert is_rate_limited(403, {'x-ratelimit-remaining': '0'})
+    assert not is_rate_limited(403, {})
+    assert not is_rate_limited(200, {'Retry-After': '1'})
+
+def test_call_github_reads_the_requester_without_a_request(client):
+    assert call_github(lambda: 'result', client) == 'result'
+
+    client.requester.rate_limiting = (42, 5000)
+    client.requester.rate_limiting_resettime = int(time.time()) + 3600
+    call_github(lambda: 'result', client)
+
+    assert github_client.get_pool().governor_for(client).budget('core')[1] == 42
+
+def test_iter_pages_charges_every_page(client):
+    paginated = FakePaginatedList(client, [[1, 2], [3]])
+    governor = github_client.get_pool().governor_for(client)
+    tokens = governor._buckets['core'].tokens
+
+    assert [item for page in iter_pages(paginated, client) for item in page] == [1, 2, 3]
+    assert paginated.requests == 3
+    assert tokens - governor._buckets['core'].tokens == pytest.approx(3, abs=0.1)
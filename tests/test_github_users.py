@@ -0,0 +1,56 @@
+# Copyright (C) 2026 Dawn M. Foster
+# Licensed under GNU General Public License (GPL), version 3 or later: http://www.gnu.org/licenses/gpl.txt
+
+import re
+
+import pytest
+
+import common_functions
+from common_functions import get_affil, query_github_users, resolve_companies
+
+PROFILES = {'alice': {'company': 'Acme'}, 'bob': {'company': None}, 'carol': {'company': '?'}}
+
+@pytest.fixture
+def graphql(monkeypatch):
+    """Answers user(login:) queries from PROFILES and records the queries."""
+    queries = []
+
+    def run_graphql(query, api_token, variables=None):
+        queries.append(query)
+        users = re.findall(r'(u\d+): user\(login: "([^"]*)"\)', query)
+        return {'data': {alias: PROFILES.get(login) for alias, login in users}}
+
+    monkeypatch.setattr(common_functions, 'run_graphql', run_graphql)
+    monkeypatch.setattr(common_functions, '_company_cache', {})
+
+    return queries
+
+def test_users_are_queried_in_batches(graphql):
+    users = query_github_users(['alice', 'bob', 'carol', 'ghost', 'erin'], 'company', 'token', batch_size=2)
+
+    assert len(graphql) == 3
+    assert users == {'alice': {'company': 'Acme'}, 'bob': {'company': None}, 'carol': {'company': '?'}, 'ghost': None, 'erin': None}
+
+def test_companies_are_looked_up_once(graphql):
+    assert resolve_companies(['Alice', 'alice', 'ghost'], 'token') == {'alice': 'Acme', 'ghost': None}
+    assert resolve_companies(['alice', 'bob'], 'token') == {'alice': 'Acme', 'bob': None}
+
+    assert len(graphql) == 2
+    assert 'alice' not in graphql[1]
+
+def test_get_affil_falls_back_to_the_cncf_data(graphql):
+    affil_dict = {'bob': 'Google LLC', 'carol': 'Acme'}
+
+    assert get_affil(affil_dict, 'Alice', 'token') == 'Acme'
+    assert get_affil(affil_dict, 'bob', 'token') == 'Google LLC'
+    assert get_affil(affil_dict, 'carol', 'token') == 'NotFound'
+    assert get_affil(affil_dict, 'ghost', 'token') == 'NotFound'
+
+def test_login_case_from_parallel_batches(graphql, monkeypatch):
+    monkeypatch.setitem(PROFILES, 'dave', {'login': 'Dave'})
+    monkeypatch.setitem(PROFILES, 'erin', {'login': 'erin'})
+
+    users = query_github_users(['dave', 'erin', 'ghost'], 'login', 'token', batch_size=1, workers=3)
+
+    assert len(graphql) == 3
+    assert users == {'dave': {'login': 'Dave'}, 'erin': {'login': 'erin'}, 'ghost': None}
@@ -0,0 +1,127 @@
+# Copyright (C) 2026 Dawn M. Foster
+# Licensed under GNU General Public License (GPL), version 3 or later: http://www.gnu.org/licenses/gpl.txt
+
+import os
+
+import pytest
+
+import common_functions
+import http_cache
+
+class FakeResponse:
+    def __init__(self, status_code, body=b'', headers=None):
+        self.status_code = status_code
+        self.body = body
+        self.headers = headers or {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return False
+
+    def iter_content(self, chunk_size):
+        yield self.body
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise RuntimeError(self.status_code)
+
+class FakeSession:
+    """Serves bodies from a dict and answers 304 when the ETag matches."""
+
+    def __init__(self, bodies):
+        self.bodies = bodies
+        self.requests = []
+
+    def get(self, url, headers=None, stream=False):
+        self.requests.append((url, dict(headers or {})))
+        if url not in self.bodies:
+            return FakeResponse(404)
+        body = self.bodies[url]
+        etag = '"' + str(len(body)) + str(hash(body)) + '"'
+        if (headers or {}).get('If-None-Match') == etag:
+            return FakeResponse(304)
+        return FakeResponse(200, body, {'ETag': etag})
+
+@pytest.fixture
+def session(tmp_path, monkeypatch):
+    monkeypatch.setenv('K8S_DATA_CACHE_DIR', str(tmp_path))
+    monkeypatch.setattr(http_cache, '_db', None)
+    monkeypatch.setattr(http_cache, '_cache_only', None)
+    fake = FakeSession({})
+    monkeypatch.setattr(common_functions, 'get_session', lambda: fake)
+    yield fake
+    if http_cache._db is not None:
+        http_cache._db.close()
+
+def test_fetch_stores_and_revalidates(session):
+    session.bodies['http://x/a'] = b'hello'
+
+    first = http_cache.fetch('http://x/a')
+    second = http_cache.fetch('http://x/a')
+
+    assert first.status == 'downloaded'
+    assert second.status == 'not_modified'
+    assert second.sha256 == first.sha256
+    assert 'If-None-Match' in session.requests[1][1]
+    assert http_cache.read_bytes('http://x/a') == b'hello'
+
+def test_cache_only_does_not_use_the_network(session):
+    session.bodies['http://x/a'] = b'hello'
+    http_cache.fetch('http://x/a')
+    http_cache.set_cache_only(True)
+
+    assert http_cache.fetch('http://x/a').status == 'cache_only'
+    with pytest.raises(FileNotFoundError):
+        http_cache.fetch('http://x/missing')
+    assert len(session.requests) == 1
+
+def test_eviction_removes_least_recently_used(session, monkeypatch):
+    monkeypatch.setattr(http_cache, 'max_cache_bytes', lambda: 10)
+    session.bodies.update({'http://x/a': b'aaaaaa', 'http://x/b': b'bbbbbb'})
+
+    a = http_cache.fetch('http://x/a')
+    b = http_cache.fetch('http://x/b')
+
+    assert not os.path.exists(a.path)
+    assert os.path.exists(b.path)
+    assert http_cache._lookup('http://x/a') is None
+
+def test_eviction_keeps_bodies_shared_with_other_urls(session, monkeypatch):
+    monkeypatch.setattr(http_cache, 'max_cache_bytes', lambda: 10)
+    session.bodies.update({'http://x/a': b'same', 'http://x/b': b'same', 'http://x/c': b'cccccccc'})
+
+    http_cache.fetch('http://x/a')
+    b = http_cache.fetch('http://x/b')
+    http_cache.fetch('http://x/c')
+
+    # a and b share one body, so it only goes once both urls are evicted
+    assert http_cache._lookup('http://x/a') is None
+    assert http_cache._lookup('http://x/b') is None
+    assert not os.path.exists(b.path)
+
+def test_open_cached_fetches_again_after_eviction(session, monkeypatch):
+    session.bodies['http://x/a'] = b'hello'
+    entry = http_cache.fetch('http://x/a')
+    fetch = http_cache.fetch
+
+    # Another thread evicts the body right after the first fetch returns
+    calls = []
+    def evicting_fetch(url):
+        result = fetch(url)
+        if not calls:
+            os.remove(result.path)
+        calls.append(url)
+        return result
+    monkeypatch.setattr(http_cache, 'fetch', evicting_fetch)
+
+    entry, body = http_cache.open_cached('http://x/a')
+    with body:
+        assert body.read() == b'hello'
+    assert len(calls) == 2
+
+def test_download_file_returns_contents_in_memory(session):
+    session.bodies['http://x/a'] = b'key: value\n'
+
+    assert common_functions.load_yaml(common_functions.download_file('http://x/a')) == {'key': 'value'}
@@ -0,0 +1,176 @@
+# Copyright (C) 2026 Dawn M. Foster
+# Licensed under GNU General Public License (GPL), version 3 or later: http://www.gnu.org/licenses/gpl.txt
+
+import asyncio
+import concurrent.futures
+import threading
+from argparse import Namespace
+from collections import namedtuple
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+
+import common_functions
+import owners_details
+import sigs_model
+
+Subproject = namedtuple('Subproject', ['sig_dir', 'name', 'owners'])
+
+SIG_URL = 'https://raw.githubusercontent.com/kubernetes/kubernetes/master/pkg/kubelet/OWNERS'
+EXTRA_URL = 'https://raw.githubusercontent.com/kubernetes-sigs/foo/main/OWNERS'
+
+class FakeSigs:
+    def __init__(self, subprojects):
+        self._subprojects = subprojects
+
+    def sig_dirs(self):
+        return sorted({x.sig_dir for x in self._subprojects})
+
+    def subprojects(self):
+        return self._subprojects
+
+class FakeWriter:
+    def __init__(self):
+        self.rows = []
+
+    def write_rows(self, rows):
+        self.rows.extend(rows)
+
+class FakeJournal:
+    def __init__(self):
+        self.records = []
+
+    def append(self, record):
+        self.records.append(record)
+
+@pytest.fixture
+def extra_file(tmp_path):
+    path = tmp_path / 'extra.csv'
+    path.write_text(SIG_URL + '\n' + EXTRA_URL + '\n' + EXTRA_URL + '\n')
+    return str(path)
+
+@pytest.fixture
+def pipeline(monkeypatch, extra_file):
+    """Runs owners_pipeline without the network. Returns the rows written
+    and the urls fetched. Each url in 'failures' fails that many times."""
+    sigs = FakeSigs([Subproject('sig-node', 'kubelet', [SIG_URL])])
+    monkeypatch.setattr(sigs_model.SigsModel, 'load', classmethod(lambda cls, *args: sigs))
+    monkeypatch.setattr(owners_details, 'load_aliases', lambda url: {'aliases': {}})
+    monkeypatch.setattr(common_functions, 'read_cncf_affiliations', lambda: {'frank': 'Acme'})
+    monkeypatch.setattr(common_functions, 'get_alias_map', lambda url: {})
+
+    def run(failures=None, unparsable=(), parse_processes=0):
+        failures = dict(failures or {})
+        fetched = []
+
+        def fetch_owners_raw(owners_url, previous_state=None, blob_sha=None):
+            fetched.append(owners_url)
+            if failures.get(owners_url, 0) > 0:
+                failures[owners_url] -= 1
+                return None, None, None, None
+            if owners_url in unparsable:
+                return 'sha', 'blob', b'approvers: [frank', None
+            return 'sha', 'blob', b'approvers:\n- frank\n', None
+
+        def fetch_owners_entry(owners_url, previous_state=None, blob_sha=None):
+            sha256, blob_sha, data, owners = fetch_owners_raw(owners_url)
+            return sha256, blob_sha, None if data is None else common_functions.parse_owners(data), False
+
+        monkeypatch.setattr(common_functions, 'fetch_owners_raw', fetch_owners_raw)
+        monkeypatch.setattr(common_functions, 'fetch_owners_entry', fetch_owners_entry)
+        args = Namespace(workers=1, new_owners_file=extra_file, parse_processes=parse_processes)
+        csv_file = FakeWriter()
+        asyncio.run(owners_details.owners_pipeline(args, csv_file, None, {}, FakeJournal(), {}))
+        return csv_file.rows, fetched
+
+    return run
+
+def test_list_owners_jobs_keeps_sigs_urls_as_retries(extra_file):
+    sigs = FakeSigs([Subproject('sig-node', 'kubelet', [SIG_URL])])
+
+    owners_jobs, retries, blob_shas = owners_details.list_owners_jobs(sigs, extra_file)
+
+    assert owners_jobs == [(SIG_URL, 'sig-node', 'kubelet'), (SIG_URL, 'NA', 'NA'), (EXTRA_URL, 'NA', 'NA')]
+    assert retries == {1}
+    assert blob_shas == {}
+
+def test_list_owners_jobs_reads_blob_shas(tmp_path):
+    path = tmp_path / 'extra.csv'
+    path.write_text(EXTRA_URL + ',0123abcd\n')
+
+    owners_jobs, retries, blob_shas = owners_details.list_owners_jobs(FakeSigs([]), str(path))
+
+    assert owners_jobs == [(EXTRA_URL, 'NA', 'NA')]
+    assert blob_shas == {EXTRA_URL: '0123abcd'}
+
+def test_retry_is_skipped_when_the_file_was_read(pipeline):
+    rows, fetched = pipeline()
+
+    assert rows == [['Acme', 'frank', 'approver', 'sig-node', 'kubelet', SIG_URL],
+                    ['Acme', 'frank', 'approver', 'NA', 'NA', EXTRA_URL]]
+    assert fetched.count(SIG_URL) == 1
+
+def test_retry_is_used_when_the_file_failed(pipeline, capsys):
+    rows, fetched = pipeline({SIG_URL: 1})
+
+    assert rows == [['Acme', 'frank', 'approver', 'NA', 'NA', SIG_URL],
+                    ['Acme', 'frank', 'approver', 'NA', 'NA', EXTRA_URL]]
+    assert 'Failed to get 0 OWNERS files' in capsys.readouterr().out
+
+def test_failed_file_is_reported_once(pipeline, capsys):
+    rows, fetched = pipeline({SIG_URL: 2})
+
+    out = capsys.readouterr().out
+    assert out.count(SIG_URL) == 1
+    assert 'Failed to get 1 OWNERS files' in out
+
+def test_download_threads_are_shut_down(pipeline):
+    before = set(threading.enumerate())
+    pipeline()
+
+    assert [thread for thread in threading.enumerate() if thread not in before] == []
+
+def test_failed_affiliation_load_stops_the_run(pipeline, monkeypatch):
+    def read_cncf_affiliations():
+        raise OSError('connection reset')
+
+    monkeypatch.setattr(common_functions, 'read_cncf_affiliations', read_cncf_affiliations)
+
+    with pytest.raises(RuntimeError, match='Cannot load the CNCF affiliation data') as error:
+        pipeline()
+    assert isinstance(error.value.__cause__, OSError)
+
+def test_parse_failures_are_reported_apart_from_downloads(pipeline, capsys):
+    rows, fetched = pipeline({SIG_URL: 2}, unparsable={EXTRA_URL})
+
+    out = capsys.readouterr().out
+    assert rows == []
+    assert 'Failed to get 1 OWNERS files\n * Cannot get sig-node ' + SIG_URL in out
+    assert 'Failed to parse 1 OWNERS files\n * Cannot parse NA ' + EXTRA_URL in out
+
+class BrokenPool:
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def submit(self, *args):
+        raise BrokenProcessPool('killed')
+
+    def shutdown(self, **kwargs):
+        pass
+
+def test_broken_parse_pool_falls_back_to_threads(pipeline, monkeypatch, capsys):
+    monkeypatch.setattr(concurrent.futures, 'ProcessPoolExecutor', BrokenPool)
+
+    rows, fetched = pipeline(parse_processes=2)
+
+    out = capsys.readouterr().out
+    assert rows == [['Acme', 'frank', 'approver', 'sig-node', 'kubelet', SIG_URL],
+                    ['Acme', 'frank', 'approver', 'NA', 'NA', EXTRA_URL]]
+    assert out.count('The parse processes stopped') == 1
+    assert 'Failed to parse 0 OWNERS files' in out
+
+def test_parse_processes_write_the_same_rows(pipeline, capsys):
+    rows, fetched = pipeline(unparsable={EXTRA_URL}, parse_processes=1)
+
+    assert rows == [['Acme', 'frank', 'approver', 'sig-node', 'kubelet', SIG_URL]]
+    assert 'Failed to parse 1 OWNERS files' in capsys.readouterr().out
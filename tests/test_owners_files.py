@@ -0,0 +1,88 @@
+# Copyright (C) 2026 Dawn M. Foster
+# Licensed under GNU General Public License (GPL), version 3 or later: http://www.gnu.org/licenses/gpl.txt
+
+import io
+import subprocess
+
+import pytest
+
+import common_functions
+import http_cache
+from common_functions import compact_owners, fetch_owners_entry, fetch_owners_raw, git_blob_sha, owners_from_tuple, parse_owners, parse_owners_chunk
+
+OWNERS_URL = 'https://raw.githubusercontent.com/kubernetes/kubernetes/master/pkg/kubelet/OWNERS'
+OWNERS_DATA = b'approvers:\n- frank\nreviewers:\n- gina\nlabels:\n- sig/node\noptions:\n  no_parent_owners: true\n'
+
+class FakeEntry:
+    sha256 = 'content-sha256'
+
+@pytest.fixture
+def downloads(monkeypatch):
+    """Serves OWNERS_DATA for every url and records the urls requested."""
+    requested = []
+
+    def open_cached(url, encoding=None):
+        requested.append(url)
+        return FakeEntry(), io.BytesIO(OWNERS_DATA)
+    monkeypatch.setattr(http_cache, 'open_cached', open_cached)
+    monkeypatch.setattr(common_functions, 'get_alias_map', lambda url: {})
+
+    return requested
+
+def test_git_blob_sha_matches_git():
+    expected = subprocess.run(['git', 'hash-object', '--stdin'], input=OWNERS_DATA, capture_output=True, check=True).stdout.decode().strip()
+
+    assert git_blob_sha(OWNERS_DATA) == expected
+
+def test_compact_owners_keeps_only_the_owner_lists():
+    assert compact_owners({'approvers': ['frank'], 'labels': 'not a list', 'options': {}}) == {'approvers': ['frank']}
+    # Empty files have no owners, but aren't failures
+    assert compact_owners(None) == {}
+
+def test_fetch_owners_entry_parses_new_files(downloads):
+    sha256, blob_sha, owners, reused = fetch_owners_entry(OWNERS_URL)
+
+    assert (sha256, blob_sha, reused) == ('content-sha256', git_blob_sha(OWNERS_DATA), False)
+    assert owners == {'approvers': ['frank'], 'reviewers': ['gina'], 'labels': ['sig/node']}
+
+def test_unchanged_blob_sha_skips_the_request(downloads):
+    previous_state = {OWNERS_URL: {'sha256': 'old-sha256', 'blob': 'abc', 'owners': {'approvers': ['old']}}}
+
+    assert fetch_owners_raw(OWNERS_URL, previous_state, 'abc') == ('old-sha256', 'abc', None, {'approvers': ['old']})
+    assert downloads == []
+
+def test_changed_blob_sha_downloads_the_file(downloads):
+    previous_state = {OWNERS_URL: {'sha256': 'old-sha256', 'blob': 'abc', 'owners': {'approvers': ['old']}}}
+
+    sha256, blob_sha, owners, reused = fetch_owners_entry(OWNERS_URL, previous_state, 'def')
+
+    assert downloads == [OWNERS_URL]
+    assert not reused
+    assert owners['approvers'] == ['frank']
+
+def test_unchanged_content_reuses_the_parsed_file(downloads):
+    previous_state = {OWNERS_URL: {'sha256': 'content-sha256', 'owners': {'approvers': ['old']}}}
+
+    sha256, blob_sha, owners, reused = fetch_owners_entry(OWNERS_URL, previous_state)
+
+    assert reused
+    assert owners == {'approvers': ['old']}
+    assert blob_sha == git_blob_sha(OWNERS_DATA)
+
+def test_failed_download_has_no_content_hash(monkeypatch):
+    class BrokenFile(io.BytesIO):
+        def read(self):
+            raise OSError('connection reset')
+
+    monkeypatch.setattr(http_cache, 'open_cached', lambda url, encoding=None: (FakeEntry(), BrokenFile()))
+    monkeypatch.setattr(common_functions, 'get_alias_map', lambda url: {})
+
+    assert fetch_owners_entry(OWNERS_URL) == (None, None, None, False)
+
+def test_parse_chunk_round_trip():
+    empty = b'# no owners yet\n'
+    parsed = parse_owners_chunk([OWNERS_DATA, b'approvers: [frank', empty])
+
+    assert parsed[1] is None
+    assert owners_from_tuple(parsed[0]) == parse_owners(OWNERS_DATA)
+    assert owners_from_tuple(parsed[2]) == parse_owners(empty) == {}
@@ -0,0 +1,31 @@
+# Copyright (C) 2026 Dawn M. Foster
+# Licensed under GNU General Public License (GPL), version 3 or later: http://www.gnu.org/licenses/gpl.txt
+
+import pytest
+
+from common_functions import build_sig_index, match_sig, parse_alias_name
+
+@pytest.fixture
+def sig_index():
+    return build_sig_index(['sig-node', 'sig-auth', 'sig-api-machinery', 'sig-api'])
+
+def test_match_sig_needs_a_dash_or_the_end(sig_index):
+    assert match_sig(sig_index, 'sig-node') == 'sig-node'
+    assert match_sig(sig_index, 'sig-node-approvers') == 'sig-node'
+    assert match_sig(sig_index, 'sig-nodes') == 'NA'
+    assert match_sig(sig_index, 'wg-node') == 'NA'
+
+def test_match_sig_prefers_the_longest_name(sig_index):
+    assert match_sig(sig_index, 'sig-api-machinery-reviewers') == 'sig-api-machinery'
+    assert match_sig(sig_index, 'sig-api-reviewers') == 'sig-api'
+    assert match_sig(sig_index, 'sig-api-mach') == 'sig-api'
+
+@pytest.mark.parametrize('area, expected', [
+    ('sig-auth-audit-approvers', ('sig-auth', 'audit', 'approver')),
+    ('sig-node-reviewers', ('sig-node', 'NA', 'reviewer')),
+    ('sig-api-machinery-maintainer', ('sig-api-machinery', 'NA', 'maintainer')),
+    ('sig-node-kubelet', ('sig-node', 'kubelet', 'unknown')),
+    ('release-engineering-approvers', ('NA', 'NA', 'approver')),
+])
+def test_parse_alias_name(sig_index, area, expected):
+    assert parse_alias_name(sig_index, area) == expected
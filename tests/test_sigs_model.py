@@ -0,0 +1,68 @@
+# Copyright (C) 2026 Dawn M. Foster
+# Licensed under GNU General Public License (GPL), version 3 or later: http://www.gnu.org/licenses/gpl.txt
+
+import io
+from types import SimpleNamespace
+
+import pytest
+
+import common_functions
+import http_cache
+import sigs_model
+from sigs_model import Leader, SigsModel, Subproject
+
+SIGS_YAML = b'''
+sigs:
+- dir: sig-node
+  name: Node
+  leadership:
+    chairs:
+    - {name: Alice, github: alice, company: Acme}
+  meetings:
+  - {description: Weekly, day: Tuesday, time: '10:00', tz: PT, frequency: weekly}
+  subprojects:
+  - name: kubelet
+    owners:
+    - https://raw.githubusercontent.com/kubernetes/kubernetes/master/pkg/kubelet/OWNERS
+    meetings:
+    - {description: CRI, day: Friday, time: '09:00', tz: PT, frequency: biweekly}
+  - name: no-owners
+workinggroups:
+- dir: wg-batch
+  name: Batch
+  leadership:
+    chairs:
+    - {name: Bob, github: bob, company: Other}
+'''
+
+@pytest.fixture
+def sigs_file(tmp_path, monkeypatch):
+    """Serves SIGS_YAML through a fake download cache in tmp_path."""
+    monkeypatch.setattr(http_cache, 'open_cached', lambda url, encoding=None: (SimpleNamespace(sha256='sigs-sha'), io.BytesIO(SIGS_YAML)))
+    monkeypatch.setattr(http_cache, 'cache_dir', lambda: str(tmp_path))
+    monkeypatch.setattr(sigs_model, '_models', {})
+
+    return tmp_path
+
+def test_load_saves_a_snapshot(sigs_file, monkeypatch):
+    model = SigsModel.load()
+    assert SigsModel.load() is model
+    assert (sigs_file / 'sigs_sigs-sha.pickle').exists()
+
+    # A new process reads the snapshot instead of parsing the yaml again
+    monkeypatch.setattr(sigs_model, '_models', {})
+    monkeypatch.setattr(common_functions, 'load_yaml', lambda stream: pytest.fail("sigs.yaml was parsed again"))
+    assert SigsModel.load().data == model.data
+
+def test_accessors(sigs_file):
+    model = SigsModel.load()
+
+    assert model.sig_dirs() == ['sig-node']
+    assert model.subprojects() == [Subproject('sig-node', 'kubelet', ['https://raw.githubusercontent.com/kubernetes/kubernetes/master/pkg/kubelet/OWNERS']),
+                                   Subproject('sig-node', 'no-owners', [])]
+    assert model.leadership() == [Leader('SIG Node', 'Alice', 'alice', 'Acme'), Leader('WG Batch', 'Bob', 'bob', 'Other')]
+
+    meetings = model.meetings()
+    assert [group for group, group_meetings in meetings] == ['SIG Node', 'WG Batch']
+    assert [x.description for x in meetings[0][1]] == ['Weekly', 'CRI']
+    assert meetings[1][1] == []
@@ -0,0 +1,40 @@
+# Copyright (C) 2026 Dawn M. Foster
+# Licensed under GNU General Public License (GPL), version 3 or later: http://www.gnu.org/licenses/gpl.txt
+
+import pandas as pd
+import pytest
+
+from dataset_io import OWNERS_COLUMNS
+from snapshot_diff import delta_df, diff_seats, rows_df, snapshot_seats
+
+def owners_df(rows):
+    return pd.DataFrame(rows, columns=OWNERS_COLUMNS)
+
+def test_added_removed_and_changed_seats():
+    old = snapshot_seats(owners_df([['Acme', 'alice', 'approver', 'sig-node', 'kubelet', 'url1'],
+                                    ['Acme', 'bob', 'reviewer', 'sig-node', 'kubelet', 'url1'],
+                                    ['Other', 'carol', 'approver', 'sig-apps', '', 'url2']]), 'owners')
+    new = snapshot_seats(owners_df([['Other', 'alice', 'approver', 'sig-node', 'kubelet', 'url1'],
+                                    ['Other', 'carol', 'approver', 'sig-apps', '', 'url2'],
+                                    ['Acme', 'dave', 'reviewer', 'sig-apps', '', 'url2']]), 'owners')
+    diff = diff_seats(old, new, 'owners')
+
+    assert diff.added == [(('dave', 'reviewer', 'sig-apps', '', 'url2'), 'Acme')]
+    assert diff.removed == [(('bob', 'reviewer', 'sig-node', 'kubelet', 'url1'), 'Acme')]
+    assert diff.changed == [(('alice', 'approver', 'sig-node', 'kubelet', 'url1'), 'Acme', 'Other')]
+    assert diff.companies == {'Acme': [1, 2], 'Other': [1, 0]}
+    assert diff.groups == {'sig-apps': [1, 0], 'sig-node': [0, 1]}
+
+    assert list(rows_df(diff).change) == ['added', 'removed', 'changed']
+    companies = delta_df(diff.companies, 'company')
+    assert list(companies.company) == ['Acme', 'Other']
+    assert list(companies.net) == [-1, 1]
+
+@pytest.mark.parametrize('raw', ['International Business Machines Corporation', 'IBM Research'])
+def test_raw_company_names_are_not_changes(raw):
+    old = snapshot_seats(owners_df([[raw, 'alice', 'approver', 'sig-node', 'kubelet', 'url1']]), 'owners')
+    new = snapshot_seats(owners_df([['IBM', 'alice', 'approver', 'sig-node', 'kubelet', 'url1']]), 'owners')
+
+    diff = diff_seats(old, new, 'owners')
+    assert diff.changed == []
+    assert diff.companies == {}
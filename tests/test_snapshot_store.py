@@ -0,0 +1,66 @@
+# Copyright (C) 2026 Dawn M. Foster
+# Licensed under GNU General Public License (GPL), version 3 or later: http://www.gnu.org/licenses/gpl.txt
+
+import pytest
+
+from dataset_io import ISTIO_COLUMNS, OWNERS_COLUMNS, DatasetWriter
+from snapshot_store import company_share, connect, ingest, snapshot_name, user_history
+
+METADATA = {'License': 'test'}
+
+def write_dataset(path, columns, rows):
+    writer = DatasetWriter(str(path), columns, METADATA)
+    writer.write_rows(rows)
+    writer.close()
+    return str(path)
+
+def count(db, table):
+    return db.execute("SELECT COUNT(*) FROM " + table).fetchone()[0]
+
+def test_snapshot_name_uses_the_date_in_the_filename():
+    assert snapshot_name('output/owners_data_2022-04-18_xtra.csv') == ('owners_data_2022-04-18_xtra', '2022-04-18')
+
+    with pytest.raises(ValueError):
+        snapshot_name('output/owners_data.csv')
+
+def test_ingesting_again_replaces_the_snapshot(tmp_path):
+    db = connect(str(tmp_path / 'store.sqlite'))
+    path = write_dataset(tmp_path / 'owners_2024-01-01.csv', OWNERS_COLUMNS,
+                         [['Acme', 'alice', 'approver', 'sig-node', 'kubelet', 'url1'],
+                          ['Other', 'bob', 'reviewer', 'sig-node', 'kubelet', 'url1']])
+    assert ingest(db, path) == 2
+    assert ingest(db, path) == 2
+
+    assert count(db, 'snapshots') == 1
+    assert count(db, 'owners') == 2
+
+def test_ingesting_another_kind_removes_the_old_rows(tmp_path):
+    db = connect(str(tmp_path / 'store.sqlite'))
+    path = tmp_path / 'data_2024-01-01.csv'
+    write_dataset(path, OWNERS_COLUMNS, [['Acme', 'alice', 'approver', 'sig-node', 'kubelet', 'url1']])
+    ingest(db, str(path))
+
+    write_dataset(path, ISTIO_COLUMNS, [['Acme', 'alice', 'networking'], ['Other', 'bob', 'networking']])
+    ingest(db, str(path))
+
+    assert count(db, 'owners') == 0
+    assert count(db, 'istio') == 2
+    assert db.execute("SELECT kind FROM snapshots").fetchall() == [('istio',)]
+
+def test_company_share_and_user_history(tmp_path):
+    db = connect(str(tmp_path / 'store.sqlite'))
+    ingest(db, write_dataset(tmp_path / 'owners_2024-01-01.csv', OWNERS_COLUMNS,
+                             [['Acme', 'alice', 'reviewer', 'sig-node', 'kubelet', 'url1'],
+                              ['Acme', 'carol', 'approver', 'sig-node', 'kubelet', 'url1'],
+                              ['Other', 'bob', 'approver', 'sig-node', 'kubelet', 'url1']]))
+    ingest(db, write_dataset(tmp_path / 'owners_2024-06-01.csv', OWNERS_COLUMNS,
+                             [['Acme', 'alice', 'approver', 'sig-node', 'kubelet', 'url1']]))
+
+    share = company_share(db, group='sig-node')
+    first = share[share.snapshot_date == '2024-01-01'].set_index('company')
+    assert first.loc['Acme', 'people'] == 2
+    assert first.loc['Other', 'share'] == pytest.approx(0.3333)
+
+    history, first_seen = user_history(db, 'Alice')
+    assert list(history.status) == ['reviewer', 'approver']
+    assert dict(zip(first_seen.status, first_seen.first_seen)) == {'reviewer': '2024-01-01', 'approver': '2024-06-01'}
@@ -0,0 +1,38 @@
+# Copyright (C) 2026 Dawn M. Foster
+# Licensed under GNU General Public License (GPL), version 3 or later: http://www.gnu.org/licenses/gpl.txt
+
+from team_datasets import extract_team_members
+
+TEAMS = {'Steering': {'members': ['s1', 's2']},
+         'Maintainers': {'members': ['m1'],
+                         'teams': {'Networking': {'members': ['n1'],
+                                                  'teams': {'Ambient': {'members': ['a1']}}},
+                                   'Security': {'members': ['sec1']}}},
+         'TOC': {'members': ['t1']}}
+
+def istio_owners_order(teams):
+    # The loops istio_owners.py used before it moved to team_datasets.py
+    rows = []
+    for team, details in teams.items():
+        rows.extend((username, team) for username in details['members'])
+    for team, details in teams['Maintainers']['teams'].items():
+        rows.extend((username, team) for username in details['members'])
+        for subteam, subdetails in (details.get('teams') or {}).items():
+            rows.extend((username, subteam) for username in subdetails['members'])
+    return rows
+
+def test_keeps_the_istio_owners_order():
+    assert extract_team_members(TEAMS) == istio_owners_order(TEAMS)
+
+def test_subteams_are_walked_depth_first():
+    teams = {'A': {'members': ['a'],
+                   'teams': {'B': {'members': ['b'], 'teams': {'C': {'members': ['c'], 'teams': {'D': {'members': ['d']}}}}},
+                             'E': {'members': ['e']}}}}
+
+    assert [team for username, team in extract_team_members(teams)] == ['A', 'B', 'C', 'D', 'E']
+
+def test_member_keys_and_empty_teams():
+    teams = {'WG': {'leads': ['lead'], 'members': [123], 'teams': None}, 'Empty': None}
+
+    assert extract_team_members(teams, ['leads', 'members']) == [('lead', 'WG'), ('123', 'WG')]
+    assert extract_team_members(None) == []
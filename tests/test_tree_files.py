@@ -0,0 +1,88 @@
+# Copyright (C) 2026 Dawn M. Foster
+# Licensed under GNU General Public License (GPL), version 3 or later: http://www.gnu.org/licenses/gpl.txt
+
+import subprocess
+
+import pytest
+
+import common_functions
+import github_client
+import http_cache
+from common_functions import git_blob_sha, list_clone_files, list_tree_files
+from github_client import TokenPool
+
+BASE_URL = 'https://raw.githubusercontent.com/testorg/repo/main/'
+
+class FakeResponse:
+    def __init__(self, status_code, json_data=None):
+        self.status_code = status_code
+        self.json_data = json_data
+
+    def json(self):
+        return self.json_data
+
+    def raise_for_status(self):
+        pass
+
+@pytest.fixture
+def trees_api(monkeypatch):
+    """Answers git trees requests with the response in responses[0]."""
+    responses = []
+    requested = []
+
+    def github_request(method, url, resource='core', **kwargs):
+        requested.append(url)
+        return responses[0]
+
+    monkeypatch.setattr(github_client, 'github_request', github_request)
+    monkeypatch.setattr(github_client, '_pool', TokenPool())
+
+    return responses, requested
+
+def test_tree_files_are_filtered_by_name(trees_api):
+    responses, requested = trees_api
+    responses.append(FakeResponse(200, {'truncated': False, 'tree': [
+        {'path': 'OWNERS', 'type': 'blob', 'sha': 'a1'},
+        {'path': 'docs/OWNERS', 'type': 'blob', 'sha': 'b2'},
+        {'path': 'docs/OWNERS_ALIASES', 'type': 'blob', 'sha': 'c3'},
+        {'path': 'OWNERS.d', 'type': 'tree', 'sha': 'd4'}]}))
+
+    assert list_tree_files('testorg', 'repo', 'main', 'OWNERS', 'token') == [[BASE_URL + 'OWNERS', 'a1'], [BASE_URL + 'docs/OWNERS', 'b2']]
+    assert requested == ['https://api.github.com/repos/testorg/repo/git/trees/main?recursive=1']
+
+def test_empty_repos_have_no_files(trees_api):
+    responses, requested = trees_api
+    responses.append(FakeResponse(409))
+
+    assert list_tree_files('testorg', 'repo', 'main', 'OWNERS', 'token') == []
+
+def test_truncated_trees_use_a_clone(trees_api, monkeypatch):
+    responses, requested = trees_api
+    responses.append(FakeResponse(200, {'truncated': True, 'tree': []}))
+    monkeypatch.setattr(common_functions, 'list_clone_files', lambda *args: [['url', 'sha']])
+
+    assert list_tree_files('testorg', 'repo', 'main', 'OWNERS', 'token') == [['url', 'sha']]
+
+def git(*args, cwd=None):
+    subprocess.run(['git'] + list(args), cwd=cwd, check=True, capture_output=True)
+
+def test_clone_files(tmp_path, monkeypatch):
+    source = tmp_path / 'source'
+    (source / 'sub dir').mkdir(parents=True)
+    (source / 'OWNERS').write_bytes(b'approvers:\n- alice\n')
+    (source / 'sub dir' / 'OWNERS').write_bytes(b'approvers:\n- bob\n')
+    (source / 'README.md').write_bytes(b'readme\n')
+    git('init', '--quiet', '--initial-branch', 'main', str(source))
+    git('add', '.', cwd=source)
+    git('-c', 'user.name=test', '-c', 'user.email=test@example.com', 'commit', '--quiet', '-m', 'files', cwd=source)
+
+    # An existing clone is updated with fetch, from the local source here
+    cache = tmp_path / 'cache'
+    clone_dir = cache / 'clones' / 'testorg' / 'repo.git'
+    git('clone', '--quiet', '--bare', 'file://' + str(source), str(clone_dir))
+    monkeypatch.setattr(http_cache, 'cache_dir', lambda: str(cache))
+
+    files = list_clone_files('testorg', 'repo', 'main', 'OWNERS')
+
+    assert sorted(files) == [[BASE_URL + 'OWNERS', git_blob_sha(b'approvers:\n- alice\n')],
+                             [BASE_URL + 'sub dir/OWNERS', git_blob_sha(b'approvers:\n- bob\n')]]
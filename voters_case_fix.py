@@ -10,6 +10,16 @@
  wasn't anyone with upper case letters in their GH login was
  ineligible to vote. They are in the process of fixing this in 
  Elekto.
+
+ Logins are checked in batches of up to 100 per GraphQL query, and
+ batches are sent in parallel within the GitHub rate limits. Voters
+ whose accounts can't be found (deleted or renamed) don't stop the run.
+
+ As output, a csv report of this format is created with every voter
+ whose login doesn't match exactly:
+ output/voters_case_fix_YYYY-MM-DD.csv
+ with the columns voter,github_login,status where status is either
+ case_mismatch or missing (the account was deleted or renamed).
 """
 
 def read_args():
@@ -24,33 +34,37 @@ def read_args():
     -------
     file_name : str
         This should be an Elekto yaml file stored locally with the path to that file
+    api_tokens : list
+        One or more GitHub API tokens
+    workers : int
+        Number of GraphQL batches sent at the same time
     """
-    import sys
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Find voters whose GitHub login case does not match.')
+    parser.add_argument('file_name', nargs='?', default=None, help='Local Elekto voters.yaml file')
+    parser.add_argument('--workers', type=int, default=4, help='Number of GraphQL batches sent at the same time')
+    args = parser.parse_args()
 
     # read filename from command line or prompt if no 
     # arguments were given.
-    try:
-        file_name = str(sys.argv[1])
-
-    except:
+    file_name = args.file_name
+    if file_name is None:
         print("Please enter the filename for voters.yaml.")
         file_name = input("Enter a file name: ")
 
-    api_token = input("Enter your GitHub Personal Access Token: ")
+    api_tokens = input("Enter your GitHub Personal Access Token(s), separated by spaces: ").split()
 
-    return file_name, api_token
+    return file_name, api_tokens, args.workers
 
-from github import Github
 import yaml
 import sys
+import csv
+from datetime import datetime
+from common_functions import query_github_users
+from github_client import get_pool
 
-file_name, api_token = read_args()
-
-try:
-    g = Github(api_token)
-except:
-    print("Cannot read gh_key file or does not contain a valid GitHub API token?")
-    sys.exit()
+file_name, api_tokens, workers = read_args()
 
 # Loads the yaml file and creates a list of voters
 try:
@@ -59,13 +73,35 @@ try:
     #voters = yaml.safe_load(file_name)
     with open(file_name, 'r') as file:
         voters = yaml.safe_load(file)
-        voter_list = voters['eligible_voters']
+        voter_list = [str(user) for user in voters['eligible_voters']]
 
 except:
     print("Cannot load or process the yaml file. Did you use the raw link?")
     sys.exit()
 
+try:
+    users = query_github_users(voter_list, 'login', api_tokens, workers=workers)
+except:
+    print("Cannot query the GitHub API. Is the GitHub API token valid?")
+    sys.exit()
+
+report_rows = []
 for user in voter_list:
-    login_case = g.get_user(user).login
-    if login_case != user:
+    if users[user] is None:
+        report_rows.append([user, '', 'missing'])
+        print("Not found:", user)
+    elif users[user]['login'] != user:
+        login_case = users[user]['login']
+        report_rows.append([user, login_case, 'case_mismatch'])
         print(login_case, user)
+
+today = datetime.today().strftime('%Y-%m-%d')
+outfile_name = 'output/voters_case_fix_' + today + '.csv'
+with open(outfile_name, 'w', newline='') as f:
+    csv_file = csv.writer(f)
+    csv_file.writerow(['voter', 'github_login', 'status'])
+    csv_file.writerows(report_rows)
+
+print("Checked", len(voter_list), "voters:", sum(1 for x in report_rows if x[2] == 'case_mismatch'), "case mismatches,", sum(1 for x in report_rows if x[2] == 'missing'), "missing")
+print("Report:", outfile_name)
+get_pool().report()